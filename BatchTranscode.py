@@ -0,0 +1,337 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Transcode saved sessions without a GUI, e.g. from cron or over ssh on a
+# machine without an X server.
+#
+#   main.py --batch session1.state.xml [session2.state.xml ...]
+#
+# Each session is loaded with Disc.fromXML(), the commands are built by the
+# same TranscodeCommandBuilder the main window uses, and all of the jobs are
+# run by one TranscodeQueue.  Progress is written to stdout.
+#
+# The queue is journaled like the main window's queue, to its own journal.  If
+# a batch run is interrupted (a crash, power failure or kill -9) the next batch
+# run resumes its unfinished jobs before the jobs of its own sessions.  A batch
+# started while another one is still running (e.g. by cron) leaves the running
+# batch's journal alone and runs its own jobs without a journal.
+#
+# Send SIGUSR1 to pause the queue and SIGUSR2 to resume it, e.g.
+#
+#   kill -USR1 <pid>
+# =============================================================================
+
+import datetime, os, os.path, signal, sys
+
+sys.path.insert(0, '../Helpers')
+sys.path.insert(0, '../DiscData')
+
+from PyQt5.QtCore import (
+    QCoreApplication,
+    QObject,
+    QTimer
+    )
+
+from Disc import Disc
+from ProcessPriority import ProcessPriority
+from PyHelpers import (
+    TimedeltaToString,
+    TemporaryFilesList
+    )
+from SingletonLog import SingletonLog
+from Titles import TitleVisibleSingleton
+from TranscodeCommandBuilder import TranscodeCommandBuilder
+from TranscodeJournal import TranscodeJournal
+from TranscodeQueue import (
+    TranscodeJob,
+    TranscodeQueue
+    )
+import XMLDocument
+
+class BatchTranscode(QObject):
+    """ Load one or more session files and transcode their selected titles.
+    """
+
+    STATE_FILES_DOCUMENT_ROOT = 'HEP'
+
+    # Python only sees signals (e.g. ctrl-c) when the interpreter runs, so
+    # wake it up every so often while Qt is waiting for the processes.
+    SIGNAL_POLL_MSECS = 500
+
+    def __init__(self, app, sessionFilenames):
+        super().__init__(app)
+
+        self.app = app
+        self.sessionFilenames = sessionFilenames
+
+        self.exitCode = 0
+        self.journal = None
+        self.queue = None
+        self.chaptersFilenames = TemporaryFilesList()
+
+        self.log = None
+        if (self.preferences.logging.commandsAndTimestamps):
+            self.log = SingletonLog()
+
+        self.__signalTimer = None
+
+    @property
+    def preferences(self):
+        return self.app.preferences
+
+    def loadSession(self, sessionFilename):
+        """ Return a new Disc object loaded from a session file.
+        """
+        disc = Disc(self.app)
+
+        doc = XMLDocument.Parse(sessionFilename)
+
+        if (doc.documentElement.nodeName != self.STATE_FILES_DOCUMENT_ROOT):
+            raise RuntimeError('The session state file does not seem to be an HEP session file!')
+
+        for childNode in doc.documentElement.childNodes:
+            if (childNode.localName == disc.XMLNAME):
+                disc.fromXML(childNode, None)
+
+        doc.unlink()
+
+        return disc
+
+    def readJournal(self):
+        """ Take ownership of the batch journal and return the jobs of an
+            interrupted batch run that still have to be run, or an empty list.
+            Their chapters files are removed when the queue finishes.
+        """
+        journal = TranscodeJournal(self.app.batchJournalFilename)
+        if (not journal.acquire()):
+            self.report('Another batch run is using the transcoding journal "{}", '
+                'this run can\'t be resumed'.format(journal.filename))
+            return []
+
+        self.journal = journal
+        if (not journal.exists):
+            return []
+
+        try:
+            jobs = journal.readForResume()
+        except Exception as exception:
+            self.reportError('Unable to read the transcoding journal "{}": {}'.format(
+                journal.filename, exception))
+            journal.remove()
+            return []
+
+        pendingJobs = []
+        for job in jobs:
+            if (job.chaptersFilename and os.path.exists(job.chaptersFilename)):
+                self.chaptersFilenames.append(job.chaptersFilename)
+
+            if (job.state == TranscodeJob.STATE_PENDING):
+                pendingJobs.append(job)
+            elif (job.state == TranscodeJob.STATE_FAILED):
+                self.reportError('Job "{}" of the interrupted run can\'t be resumed: {}'.format(
+                    job.outputFilename, job.errorString))
+                self.exitCode = 1
+
+        if (pendingJobs):
+            self.report('Resuming {} job(s) of the interrupted run'.format(len(pendingJobs)))
+
+        return pendingJobs
+
+    def report(self, text):
+        """ Write a line to stdout, and to the log if logging is turned on.
+        """
+        if (self.log):
+            self.log.writeline(text)
+
+        print(text)
+        sys.stdout.flush()
+
+    def reportError(self, text):
+        if (self.log):
+            self.log.writeline(text)
+
+        sys.stderr.write('{}\n'.format(text))
+        sys.stderr.flush()
+
+    def start(self):
+        """ Resume the jobs of an interrupted run, load the sessions, build
+            the commands and start the queue.  Returns False if there is
+            nothing to do.  That isn't an error if every output is unchanged.
+        """
+        resumedJobs = self.readJournal()
+        commands = []
+
+        for sessionFilename in self.sessionFilenames:
+            try:
+                disc = self.loadSession(sessionFilename)
+            except Exception as exception:
+                self.reportError('Unable to read session "{}": {}'.format(sessionFilename, exception))
+                self.exitCode = 1
+                continue
+
+            if (not self.validate(sessionFilename, disc)):
+                self.exitCode = 1
+                continue
+
+            TitleVisibleSingleton().set(self.preferences.autoTitle.minimumTitleSeconds,
+                disc.hideShortTitles)
+
+            builder = TranscodeCommandBuilder(self.preferences, disc)
+            titles = builder.selectedTitles()
+            if (not titles):
+                self.reportError('Session "{}" does not have any visible, selected titles.'.format(sessionFilename))
+                self.exitCode = 1
+                continue
+
+            sessionCommands, chaptersFilenames = builder.makeCommandLines(titles)
+            for chaptersFilename in chaptersFilenames:
+                self.chaptersFilenames.append(chaptersFilename)
+
+            if (self.preferences.transcoding.skipUnchangedOutputs):
+                sessionCommands, unchangedCommands = self.app.outputIndex.partition(sessionCommands)
+                for command in unchangedCommands:
+                    self.report('Skipped "{}", the output is unchanged'.format(command.outputFilename))
+
+            commands.extend(sessionCommands)
+
+            self.report('Session "{}": {} job(s)'.format(sessionFilename, len(sessionCommands)))
+
+        # A session given again replaces the resumed jobs for the same outputs.
+        outputFilenames = set(command.outputFilename for command in commands)
+        resumedJobs = [job for job in resumedJobs if (job.outputFilename not in outputFilenames)]
+        for jobNumber, job in enumerate(resumedJobs, 1):
+            job.jobNumber = jobNumber
+
+        if (not resumedJobs and not commands):
+            self.chaptersFilenames.unlink()
+            if (self.journal is not None):
+                self.journal.remove()
+                self.journal.release()
+            if (self.exitCode == 0):
+                self.report('Nothing to transcode.')
+            else:
+                self.reportError('Nothing to transcode.')
+            return False
+
+        self.queue = TranscodeQueue(resumedJobs + TranscodeQueue.newJobs(
+            self.preferences.executables.handBrakeCLI, commands, len(resumedJobs) + 1),
+            self.preferences.transcoding.maximumJobs,
+            self.journal,
+            self.app.outputIndex,
+            ProcessPriority.fromPreferences(self.preferences.transcoding), self)
+        self.queue.jobStarted.connect(self.onTranscoding_jobStarted)
+        self.queue.jobFinished.connect(self.onTranscoding_jobFinished)
+        self.queue.queueFinished.connect(self.onTranscoding_queueFinished)
+
+        signal.signal(signal.SIGINT, self.onSignal_stop)
+        signal.signal(signal.SIGTERM, self.onSignal_stop)
+        if (hasattr(signal, 'SIGUSR1')):
+            signal.signal(signal.SIGUSR1, self.onSignal_pause)
+            signal.signal(signal.SIGUSR2, self.onSignal_resume)
+        self.__signalTimer = QTimer(self)
+        self.__signalTimer.timeout.connect(lambda: None)
+        self.__signalTimer.start(self.SIGNAL_POLL_MSECS)
+
+        self.report('TRANSCODING')
+        self.report('Transcoding start @ {}'.format(datetime.datetime.now().strftime('%x %X')))
+        self.report('{} job(s), running up to {} at a time'.format(len(self.queue),
+            self.queue.maximumJobs))
+
+        # Start once the event loop is running, so that a queue that finishes
+        # immediately can still quit the application.
+        QTimer.singleShot(0, self.queue.start)
+
+        return True
+
+    def validate(self, sessionFilename, disc):
+        """ The batch version of MyMainWindow.validate().  There are no widgets
+            to check so check the disc data directly.
+        """
+        errors = []
+
+        if (not disc.source or not os.path.exists(disc.source)):
+            errors.append('the source "{}" does not exist'.format(disc.source))
+        if (not disc.destination or not os.path.isdir(disc.destination)):
+            errors.append('the destination "{}" does not exist'.format(disc.destination))
+        if (disc.preset not in self.preferences.presets.getNames()):
+            errors.append('the preset "{}" does not exist'.format(disc.preset))
+        else:
+            try:
+                self.preferences.presets.getByName(disc.preset).arguments
+            except ValueError as exception:
+                errors.append('the settings for preset "{}" can\'t be read: {}'.format(
+                    disc.preset, exception))
+
+        for error in errors:
+            self.reportError('Session "{}": {}.'.format(sessionFilename, error))
+
+        return (not errors)
+
+    def onSignal_pause(self, signalNumber, frame):
+        """ Pause the queue, e.g. to give the CPU back for a while.
+        """
+        if (self.queue is not None and not self.queue.isPaused):
+            self.queue.pause()
+            self.report('Transcoding paused @ {}'.format(datetime.datetime.now().strftime('%x %X')))
+
+    def onSignal_resume(self, signalNumber, frame):
+        if (self.queue is not None and self.queue.isPaused):
+            self.queue.resume()
+            self.report('Transcoding resumed @ {}'.format(datetime.datetime.now().strftime('%x %X')))
+
+    def onSignal_stop(self, signalNumber, frame):
+        """ Stop transcoding when the process is interrupted or terminated.
+        """
+        self.reportError('Transcoding canceled by signal {}'.format(signalNumber))
+        if (self.queue is not None):
+            self.queue.stop()
+
+    def onTranscoding_jobStarted(self, job):
+        self.report('Job {} start @ {}'.format(job.jobNumber, job.startTime.strftime('%x %X')))
+        self.report('    {}'.format(job.commandLine))
+
+    def onTranscoding_jobFinished(self, job):
+        if (job.exitCode):
+            self.reportError('WARNING!  Handbrake has finished with error code {}!'.format(job.exitCode))
+        elif (job.errorString and job.state == TranscodeJob.STATE_FAILED):
+            self.reportError('A process error has occured: {}'.format(job.errorString))
+
+        if (job.stopTime is None):
+            self.report('Job {} {}'.format(job.jobNumber, job.state.lower()))
+        else:
+            self.report('Job {} {} @ {}  >>>  Elapsed time {}'.format(job.jobNumber,
+                job.state.lower(), job.stopTime.strftime('%x %X'),
+                TimedeltaToString(job.elapsed)))
+
+    def onTranscoding_queueFinished(self):
+        self.report('Transcoding finished @ {}  >>>  Elapsed time {}'.format(
+            self.queue.stopTime.strftime('%x %X'), TimedeltaToString(self.queue.elapsed)))
+        self.report('{} done, {} failed, {} stopped  >>>  Total job time {}'.format(
+            self.queue.countJobs(TranscodeJob.STATE_DONE),
+            self.queue.countJobs(TranscodeJob.STATE_FAILED),
+            self.queue.countJobs(TranscodeJob.STATE_STOPPED),
+            TimedeltaToString(self.queue.totalJobTime)))
+
+        if (self.queue.countJobs(TranscodeJob.STATE_DONE) != len(self.queue)):
+            self.exitCode = 1
+
+        self.chaptersFilenames.unlink()
+        self.__signalTimer.stop()
+
+        QCoreApplication.instance().quit()
@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# HandBrakeCLI writes its progress to stdout as a stream of lines like:
+#
+#   Encoding: task 1 of 2, 12.34 % (45.67 fps, avg 43.21 fps, ETA 00h12m34s)
+#
+# Each line ends with a carriage return, not a newline.  The output arrives in
+# whatever chunks QProcess hands us so a line may be split across two reads.
+# The parser keeps only the unfinished tail of the last chunk, and never more
+# than MAXIMUM_BUFFER bytes of it.
+# =============================================================================
+
+import datetime, re
+
+class HandBrakeProgress(object):
+    """ The most recent progress reported by HandBrakeCLI.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __str__(self):
+        return 'HandBrakeProgress: task {} of {}, {:.2f} %, {:.2f} fps, avg {:.2f} fps, ETA {}'\
+            .format(self.task, self.taskCount, self.percent, self.fps,
+            self.averageFps, self.eta)
+
+    def clear(self):
+        """ Set all object members to their initial values.
+        """
+        self.task = 0
+        self.taskCount = 0
+        self.percent = 0.0
+        self.fps = 0.0
+        self.averageFps = 0.0
+        self.eta = None
+
+    @property
+    def fraction(self):
+        """ Return the fraction (0.0 to 1.0) of the whole job that is complete.
+            A job may have more than one task, e.g. two pass encoding.
+        """
+        if (not self.taskCount):
+            return 0.0
+
+        return min(1.0, ((self.task - 1) + (self.percent / 100.0)) / self.taskCount)
+
+    @property
+    def hasProgress(self):
+        return (self.taskCount > 0)
+
+class HandBrakeProgressParser(object):
+    """ Incrementally parse the HandBrakeCLI progress lines from stdout chunks.
+    """
+
+    PROGRESS_RE = re.compile(rb'Encoding: task (\d+) of (\d+), (\d+(?:\.\d+)?) %'
+        rb'(?: \((\d+(?:\.\d+)?) fps, avg (\d+(?:\.\d+)?) fps, ETA (\d+)h(\d+)m(\d+)s\))?')
+    LINE_END_RE = re.compile(rb'[\r\n]')
+
+    MAXIMUM_BUFFER = 1024
+
+    def __init__(self):
+        self.progress = HandBrakeProgress()
+        self.__buffer = b''
+
+    def clear(self):
+        self.progress.clear()
+        self.__buffer = b''
+
+    def feed(self, data):
+        """ Parse a chunk of output.  Returns True if the progress was updated.
+
+            Only the last complete progress line in the chunk matters, earlier
+            lines are out of date.
+        """
+        lines = self.LINE_END_RE.split(self.__buffer + bytes(data))
+
+        # The last entry is an unfinished line, or b'' if the chunk ended with
+        # a line end.  Keep it for the next call.
+        self.__buffer = lines.pop()[-self.MAXIMUM_BUFFER:]
+
+        for line in reversed(lines):
+            if (self.__parseLine(line)):
+                return True
+
+        return False
+
+    def flush(self):
+        """ Parse anything left in the buffer, e.g. when the process finishes.
+        """
+        line, self.__buffer = self.__buffer, b''
+
+        return self.__parseLine(line)
+
+    def __parseLine(self, line):
+        match = self.PROGRESS_RE.search(line)
+        if (match is None):
+            return False
+
+        task, taskCount, percent, fps, averageFps, hours, minutes, seconds = match.groups()
+
+        self.progress.task = int(task)
+        self.progress.taskCount = int(taskCount)
+        self.progress.percent = float(percent)
+
+        # The rate and ETA are missing until HandBrake has encoded a few frames.
+        if (fps is None):
+            self.progress.fps = 0.0
+            self.progress.averageFps = 0.0
+            self.progress.eta = None
+        else:
+            self.progress.fps = float(fps)
+            self.progress.averageFps = float(averageFps)
+            self.progress.eta = datetime.timedelta(hours=int(hours),
+                minutes=int(minutes), seconds=int(seconds))
+
+        return True
+
+if __name__ == '__main__':
+
+    parser = HandBrakeProgressParser()
+
+    chunks = [b'Encoding: task 1 of 2, 1.00 %\rEncoding: task 1 of 2, 12.',
+        b'34 % (45.67 fps, avg 43.21 fps, ETA 00h12m34s)\r',
+        b'Encoding: task 2 of 2, 50.00 % (85.00 fps, avg 80.00 fps, ETA 00h01m10s)',
+        b'\rMuxing: this may take awhile...\n']
+
+    for chunk in chunks:
+        print (parser.feed(chunk), parser.progress, '{:.4f}'.format(parser.progress.fraction))
+
+    print (parser.flush())
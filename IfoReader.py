@@ -0,0 +1,359 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Read the titles, chapters and audio/subtitle streams of a DVD straight from
+# VIDEO_TS.IFO and the VTS_xx_0.IFO files.  The IFO files are a few hundred KB
+# at most, so this takes milliseconds even over a network, where a HandBrake
+# scan of the whole disc takes minutes.
+#
+# The result is written in the format of a "HandBrakeCLI -t 0" scan, so the
+# same Disc.parse() fills the Disc, Titles and Chapters objects.  The IFO files
+# don't have everything HandBrake finds by decoding the video, so:
+#
+#   * autocrop is always 0/0/0/0,
+#   * the frame rate is the nominal 29.970 (NTSC) or 25.000 (PAL) rate,
+#   * the audio bit rates are 0 except for LPCM.
+#
+# The main window shows the IFO titles at once and runs the HandBrake scan in
+# the background to fill in the rest.
+#
+# The IFO layout is described at http://dvd.sourceforge.net/dvdinfo/ifo.html
+# =============================================================================
+
+import mmap, os, os.path, struct, sys, time
+
+class IfoError(Exception):
+    """ An IFO file is missing or can't be read.
+    """
+    pass
+
+def BcdTime(data, offset):
+    """ Return the number of seconds (as a float) in a 4 byte BCD dvd_time_t.
+    """
+    def bcd(value):
+        return ((value >> 4) * 10) + (value & 0x0F)
+
+    hours, minutes, seconds, frames = struct.unpack_from('>BBBB', data, offset)
+    frameRate = {1: 25.0, 3: 30000.0 / 1001.0}.get(frames >> 6)
+
+    total = (bcd(hours) * 3600) + (bcd(minutes) * 60) + bcd(seconds)
+    if (frameRate):
+        total += bcd(frames & 0x3F) / frameRate
+
+    return total
+
+def SecondsToDuration(seconds):
+    seconds = int(seconds)
+    return '{:02}:{:02}:{:02}'.format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+class IfoFile(object):
+    """ A memory-mapped IFO file.
+    """
+
+    SECTOR_SIZE = 2048
+
+    def __init__(self, filename, identifier):
+        self.filename = filename
+
+        try:
+            with open(filename, 'rb') as ifoFile:
+                self.data = mmap.mmap(ifoFile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exception:
+            raise IfoError('Unable to read "{}": {}'.format(filename, exception))
+
+        if (self.data[0:12] != identifier):
+            self.close()
+            raise IfoError('"{}" is not a {} file'.format(filename, identifier.decode('ascii')))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        self.data.close()
+
+    def sector(self, offset):
+        """ Return the byte offset of the table whose sector number is at
+            offset.
+        """
+        return struct.unpack_from('>I', self.data, offset)[0] * self.SECTOR_SIZE
+
+    def unpack(self, fmt, offset):
+        return struct.unpack_from(fmt, self.data, offset)
+
+class IfoTitle(object):
+    """ One title from the VIDEO_TS.IFO title table.
+    """
+
+    def __init__(self, titleNumber, chapterCount, vts, ttn):
+        self.titleNumber = titleNumber
+        self.chapterCount = chapterCount
+        self.vts = vts
+        self.ttn = ttn
+
+        self.seconds = 0.0
+        self.firstCell = 0
+        self.lastCell = 0
+        self.blocks = 0
+        self.chapters = []              # (first cell, last cell, blocks, seconds)
+        self.audioTracks = []           # HandBrake style descriptions
+        self.subtitleTracks = []
+        self.size = ''
+
+    def __str__(self):
+        return 'IfoTitle: {}, vts {}, ttn {}, {} chapter(s), {}'.format(self.titleNumber,
+            self.vts, self.ttn, len(self.chapters), SecondsToDuration(self.seconds))
+
+class IfoReader(object):
+    """ Read the DVD structure of a source folder from its IFO files.
+    """
+
+    # The titles a "-t 0" scan skips (HandBrakeCLI --min-duration default).
+    MINIMUM_DURATION = 10
+
+    AUDIO_CODINGS = {0: 'AC3', 2: 'MPEG1', 3: 'MPEG2', 4: 'LPCM', 6: 'DTS'}
+    LPCM_BITS = {0: 16, 1: 20, 2: 24}
+
+    # ISO 639-1 codes (used by the IFO files) to names and ISO 639-2 codes
+    # (used by HandBrake).
+    LANGUAGES = {
+        'ar': ('Arabic', 'ara'), 'cs': ('Czech', 'ces'), 'da': ('Dansk', 'dan'),
+        'de': ('Deutsch', 'deu'), 'el': ('Greek', 'ell'), 'en': ('English', 'eng'),
+        'es': ('Espanol', 'spa'), 'fi': ('Suomi', 'fin'), 'fr': ('Francais', 'fra'),
+        'he': ('Hebrew', 'heb'), 'hi': ('Hindi', 'hin'), 'hu': ('Magyar', 'hun'),
+        'is': ('Islenska', 'isl'), 'it': ('Italiano', 'ita'), 'ja': ('Japanese', 'jpn'),
+        'ko': ('Korean', 'kor'), 'nl': ('Nederlands', 'nld'), 'no': ('Norsk', 'nor'),
+        'pl': ('Polish', 'pol'), 'pt': ('Portugues', 'por'), 'ru': ('Russian', 'rus'),
+        'sv': ('Svenska', 'swe'), 'th': ('Thai', 'tha'), 'tr': ('Turkish', 'tur'),
+        'zh': ('Chinese', 'zho')
+        }
+
+    def __init__(self, source):
+        self.source = source
+        self.folder = source
+        if (os.path.basename(os.path.normpath(source)).upper() != 'VIDEO_TS'):
+            self.folder = os.path.join(source, 'VIDEO_TS')
+
+        self.titles = []
+
+    def read(self):
+        """ Read the titles.  Raises IfoError if the IFO files can't be read.
+        """
+        self.titles = []
+
+        with IfoFile(os.path.join(self.folder, 'VIDEO_TS.IFO'), b'DVDVIDEO-VMG') as vmg:
+            try:
+                table = vmg.sector(0xC4)            # TT_SRPT
+                titleCount = vmg.unpack('>H', table)[0]
+
+                for index in range(titleCount):
+                    playbackType, angles, chapterCount, parental, vts, ttn, vtsSector = \
+                        vmg.unpack('>BBHHBBI', table + 8 + (index * 12))
+                    self.titles.append(IfoTitle(index + 1, chapterCount, vts, ttn))
+            except struct.error as exception:
+                raise IfoError('Unable to read the title table from "{}": {}'.format(
+                    vmg.filename, exception))
+
+        for vts in sorted(set([title.vts for title in self.titles])):
+            filename = os.path.join(self.folder, 'VTS_{:02}_0.IFO'.format(vts))
+            with IfoFile(filename, b'DVDVIDEO-VTS') as vtsi:
+                for title in self.titles:
+                    if (title.vts != vts):
+                        continue
+
+                    try:
+                        self.__readTitle(vtsi, title)
+                    except (struct.error, IndexError) as exception:
+                        raise IfoError('Unable to read title {} from "{}": {}'.format(
+                            title.titleNumber, filename, exception))
+
+        return self.titles
+
+    def scanText(self):
+        """ Return the titles in the format of a "HandBrakeCLI -t 0" scan.
+        """
+        if (not self.titles):
+            self.read()
+
+        lines = ['scan: DVD has {} title(s)'.format(len(self.titles))]
+
+        for title in self.titles:
+            if (title.seconds < self.MINIMUM_DURATION):
+                continue
+
+            lines.append('+ title {}:'.format(title.titleNumber))
+            lines.append('  + vts {}, ttn {}, cells {}->{} ({} blocks)'.format(title.vts,
+                title.ttn, title.firstCell, title.lastCell, title.blocks))
+            lines.append('  + duration: {}'.format(SecondsToDuration(title.seconds)))
+            lines.append('  + size: {}'.format(title.size))
+            lines.append('  + autocrop: 0/0/0/0')
+
+            lines.append('  + chapters:')
+            for number, (firstCell, lastCell, blocks, seconds) in enumerate(title.chapters, 1):
+                lines.append('    + {}: cells {}->{}, {} blocks, duration {}'.format(number,
+                    firstCell, lastCell, blocks, SecondsToDuration(seconds)))
+
+            lines.append('  + audio tracks:')
+            for number, description in enumerate(title.audioTracks, 1):
+                lines.append('    + {}, {}'.format(number, description))
+
+            lines.append('  + subtitle tracks:')
+            for number, description in enumerate(title.subtitleTracks, 1):
+                lines.append('    + {}, {}'.format(number, description))
+
+        lines.append('HandBrake has exited.')
+
+        return '\n'.join(lines) + '\n'
+
+    def __language(self, code):
+        """ Return a tuple of the language name and ISO 639-2 code.
+        """
+        return self.LANGUAGES.get(code.lower(), ('Unknown', 'und'))
+
+    def __readTitle(self, vtsi, title):
+        """ Read the chapters, cells and streams of a title from its VTS IFO.
+        """
+        pttTable = vtsi.sector(0xC8)            # VTS_PTT_SRPT
+        pgcTable = vtsi.sector(0xCC)            # VTS_PGCIT
+
+        titleCount, reserved, lastByte = vtsi.unpack('>HHI', pttTable)
+        if (title.ttn < 1 or title.ttn > titleCount):
+            raise IfoError('Title {} has an invalid ttn ({})'.format(title.titleNumber, title.ttn))
+
+        start = vtsi.unpack('>I', pttTable + 8 + ((title.ttn - 1) * 4))[0]
+        if (title.ttn < titleCount):
+            end = vtsi.unpack('>I', pttTable + 8 + (title.ttn * 4))[0]
+        else:
+            end = lastByte + 1
+
+        firstPgc = None
+        for ptt in range(start, end, 4):
+            pgcNumber, programNumber = vtsi.unpack('>HH', pttTable + ptt)
+            pgc = pgcTable + vtsi.unpack('>I', pgcTable + 8 + ((pgcNumber - 1) * 8) + 4)[0]
+            if (firstPgc is None):
+                firstPgc = pgc
+
+            programCount, cellCount = vtsi.unpack('>BB', pgc + 2)
+            programMap, cellPlayback = vtsi.unpack('>HH', pgc + 0xE6)
+
+            firstCell = vtsi.unpack('>B', pgc + programMap + programNumber - 1)[0]
+            if (programNumber < programCount):
+                lastCell = vtsi.unpack('>B', pgc + programMap + programNumber)[0] - 1
+            else:
+                lastCell = cellCount
+
+            blocks = 0
+            seconds = 0.0
+            for cell in range(firstCell, lastCell + 1):
+                cellOffset = pgc + cellPlayback + ((cell - 1) * 24)
+                seconds += BcdTime(vtsi.data, cellOffset + 4)
+                firstSector = vtsi.unpack('>I', cellOffset + 8)[0]
+                lastSector = vtsi.unpack('>I', cellOffset + 20)[0]
+                blocks += (lastSector - firstSector + 1)
+
+            # HandBrake numbers the cells from 0.
+            title.chapters.append((firstCell - 1, lastCell - 1, blocks, seconds))
+
+        if (title.chapters):
+            title.firstCell = title.chapters[0][0]
+            title.lastCell = title.chapters[-1][1]
+            title.blocks = sum([chapter[2] for chapter in title.chapters])
+            title.seconds = sum([chapter[3] for chapter in title.chapters])
+
+        self.__readVideo(vtsi, title)
+        if (firstPgc is not None):
+            self.__readStreams(vtsi, title, firstPgc)
+
+    def __readStreams(self, vtsi, title, pgc):
+        """ Describe the audio and subtitle streams the title's program chain
+            enables, the way HandBrake does.
+        """
+        audioCount = vtsi.unpack('>H', 0x202)[0]
+        for stream in range(min(audioCount, 8)):
+            if (not (vtsi.unpack('>H', pgc + 0x0C + (stream * 2))[0] & 0x8000)):
+                continue
+
+            attributes = 0x204 + (stream * 8)
+            coding, details = vtsi.unpack('>BB', attributes)
+            name, iso = ('Unknown', 'und')
+            if (((coding >> 2) & 0x03) == 1):
+                name, iso = self.__language(vtsi.data[attributes + 2:attributes + 4].decode('ascii', 'replace'))
+
+            codec = self.AUDIO_CODINGS.get(coding >> 5, 'Unknown')
+            channels = (details & 0x07) + 1
+            sampleRate = 96000 if ((details >> 4) & 0x03) else 48000
+            layout = {1: '1.0 ch', 2: '2.0 ch', 6: '5.1 ch'}.get(channels, '{}.0 ch'.format(channels))
+
+            bitRate = 0
+            if (codec == 'LPCM'):
+                bitRate = sampleRate * channels * self.LPCM_BITS.get((details >> 6) & 0x03, 16)
+
+            title.audioTracks.append('{} ({}) ({}) (iso639-2: {}), {}Hz, {}bps'.format(
+                name, codec, layout, iso, sampleRate, bitRate))
+
+        subtitleCount = vtsi.unpack('>H', 0x254)[0]
+        for stream in range(min(subtitleCount, 32)):
+            if (not (vtsi.unpack('>I', pgc + 0x1C + (stream * 4))[0] & 0x80000000)):
+                continue
+
+            attributes = 0x256 + (stream * 6)
+            name, iso = ('Unknown', 'und')
+            if ((vtsi.unpack('>B', attributes)[0] & 0x03) == 1):
+                name, iso = self.__language(vtsi.data[attributes + 2:attributes + 4].decode('ascii', 'replace'))
+
+            title.subtitleTracks.append('{} (iso639-2: {}) (Bitmap)(VOBSUB)'.format(name, iso))
+
+    def __readVideo(self, vtsi, title):
+        """ Describe the video size the way HandBrake does.
+        """
+        first, second = vtsi.unpack('>BB', 0x200)
+
+        pal = bool((first >> 4) & 0x03)
+        wide = (((first >> 2) & 0x03) == 3)
+
+        height = 576 if (pal) else 480
+        width = {0: 720, 1: 704, 2: 352, 3: 352}.get((second >> 3) & 0x07, 720)
+        if (((second >> 3) & 0x07) == 3):
+            height //= 2
+
+        displayAspect = (16.0 / 9.0) if (wide) else (4.0 / 3.0)
+        if (pal):
+            pixelAspect = '64/45' if (wide) else '16/15'
+        else:
+            pixelAspect = '32/27' if (wide) else '8/9'
+
+        title.size = '{}x{}, pixel aspect: {}, display aspect: {:.2f}, {} fps'.format(
+            width, height, pixelAspect, displayAspect, '25.000' if (pal) else '29.970')
+
+if __name__ == '__main__':
+
+    # Print the scan text for a source folder and how long it took, e.g.
+    # "python3 IfoReader.py /media/dvd".
+
+    if (len(sys.argv) < 2):
+        sys.exit('Usage: IfoReader.py source')
+
+    started = time.perf_counter()
+    text = IfoReader(sys.argv[1]).scanText()
+    elapsed = time.perf_counter() - started
+
+    print (text)
+    print ('Read in {:.1f} ms'.format(elapsed * 1000.0))
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Load the title details of a session only when they are needed.
+#
+# A title in a session file is an element whose attributes are the summary
+# shown in the titles table (number, duration, aspect ratio, name, selected)
+# and whose child elements are the details: chapters, audio tracks, subtitle
+# tracks, chapter ranges and cropping.  A disc with hundreds of short titles
+# has thousands of detail elements, and almost none of them are ever looked
+# at.
+#
+# Before the session is loaded, strip() takes the child elements away from
+# every title element, so Disc.fromXML() only builds the summaries.  attach()
+# then pairs the full title elements with the loaded titles.  materialize()
+# builds the details of a title from its full element the first time the
+# title is shown or used; the summary the user may have changed in the
+# meantime (selected, name) is kept.  restore() puts the details of the
+# titles that were never materialized back into a session document before it
+# is saved, so they are saved unchanged.
+#
+# Titles and elements are paired on the whole summary: the attributes a title
+# writes with toXML() must be the attributes of exactly one element.  Pairing
+# on a single attribute could mistake the order number for the title number
+# once the titles were reordered.
+# =============================================================================
+
+import copy, sys
+
+sys.path.insert(0, '../DiscData')
+
+from Titles import Titles
+import XMLDocument
+
+class LazyTitleDetails(object):
+    """ The detail elements of the titles that haven't been built yet.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __contains__(self, title):
+        return id(title) in self.__details
+
+    def __len__(self):
+        return len(self.__details)
+
+    def clear(self):
+        self.__details = {}         # id(title): (title, full title element)
+        self.__stripped = []
+
+    def attach(self, titles):
+        """ Pair the stripped title elements with the titles built from them.
+            titles is the list of loaded titles.  Returns False if they can't
+            be paired; the session must then be loaded in full.
+        """
+        self.__details = {}
+        stripped, self.__stripped = self.__stripped, []
+        if (not stripped):
+            return True
+
+        elementsBySummary = {}
+        for element in stripped:
+            summary = self.__elementSummary(element)
+            if (summary in elementsBySummary):
+                return False
+            elementsBySummary[summary] = element
+
+        details = {}
+        for title in titles:
+            element = elementsBySummary.pop(self.__titleSummary(title), None)
+            if (element is None):
+                return False
+            details[id(title)] = (title, element)
+
+        if (elementsBySummary):
+            return False
+
+        self.__details = details
+
+        return True
+
+    def materialize(self, title):
+        """ Build the details of a title, if they haven't been built yet.
+        """
+        if (id(title) not in self.__details):
+            return
+
+        title, element = self.__details.pop(id(title))
+
+        # Start from the title as it is now, so changes to the summary are kept.
+        doc = XMLDocument.Document(Titles.XMLNAME)
+        title.toXML(doc, doc.documentElement)
+        summaryElement = doc.documentElement[0]
+
+        fullElement = doc.createElement(summaryElement.tag)
+        for name, value in summaryElement.items():
+            fullElement.setAttribute(name, value)
+        fullElement.extend(list(element))
+
+        title.fromXML(fullElement)
+
+    def materializeAll(self, titles=None):
+        """ Build the details of the titles, or of all the titles.
+        """
+        if (titles is None):
+            titles = [title for title, element in self.__details.values()]
+
+        for title in titles:
+            self.materialize(title)
+
+    def restore(self, discElement, titles):
+        """ Put the details of the titles that were never built back into a
+            saved disc element.  titles is the list of the disc's titles.
+        """
+        if (not self.__details):
+            return
+
+        # The saved elements were written by the titles, their summaries match.
+        titlesBySummary = {self.__titleSummary(title): title for title in titles
+            if (id(title) in self.__details)}
+        for titleElement in self.__titleElements(discElement):
+            title = titlesBySummary.get(self.__elementSummary(titleElement))
+            if (title is None):
+                continue
+
+            # Copies, the autosave thread writes the document.
+            del titleElement[:]
+            titleElement.extend(copy.deepcopy(list(self.__details[id(title)][1])))
+
+    def strip(self, discElement):
+        """ Take the detail elements away from the title elements of a disc
+            element read by XMLDocument.Parse().
+        """
+        self.clear()
+
+        for titlesElement in discElement.iter(Titles.XMLNAME):
+            for index, titleElement in enumerate(list(titlesElement)):
+                summaryElement = XMLDocument.Element(titleElement.tag, dict(titleElement.attrib))
+                summaryElement.tail = titleElement.tail
+                titlesElement[index] = summaryElement
+
+                self.__stripped.append(titleElement)
+
+    def __elementSummary(self, element):
+        return frozenset(element.items())
+
+    def __titleElements(self, discElement):
+        for titlesElement in discElement.iter(Titles.XMLNAME):
+            for titleElement in titlesElement:
+                yield titleElement
+
+    def __titleSummary(self, title):
+        """ Return the attributes the title writes to its element.
+        """
+        doc = XMLDocument.Document(Titles.XMLNAME)
+        title.toXML(doc, doc.documentElement)
+        summary = self.__elementSummary(doc.documentElement[0])
+        doc.unlink()
+
+        return summary
@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# An SQLite index of the discs found by the library scanner (see
+# LibraryScanner).  For each disc source folder the index has:
+#
+#   * The source fingerprint (see ScanCache.fingerprint()).  A disc whose
+#     fingerprint hasn't changed isn't scanned again.
+#   * The disc hash (the name of its hash session file) and volume label.
+#   * The titles, with their durations, audio tracks and subtitle tracks.
+#   * The error, if the disc couldn't be scanned.
+#
+# Each disc is committed as soon as it is scanned, so an interrupted library
+# scan picks up where it stopped.
+# =============================================================================
+
+import datetime, os, os.path, sqlite3
+from collections import namedtuple
+
+LibraryTitle = namedtuple('LibraryTitle', ['titleNumber', 'duration', 'seconds',
+    'audioTracks', 'subtitleTracks'])
+LibraryTitle.__doc__ = """ A title as stored in the index.  audioTracks and
+    subtitleTracks are lists of (track number, description) tuples.
+"""
+
+class LibraryIndex(object):
+    """ Read and write the library index.
+    """
+
+    TRACK_AUDIO = 'audio'
+    TRACK_SUBTITLE = 'subtitle'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS discs (
+            source TEXT PRIMARY KEY,
+            fingerprint TEXT,
+            hash TEXT,
+            volumeLabel TEXT,
+            scanned TEXT,
+            error TEXT);
+        CREATE INDEX IF NOT EXISTS discs_hash ON discs (hash);
+        CREATE TABLE IF NOT EXISTS titles (
+            source TEXT REFERENCES discs (source) ON DELETE CASCADE,
+            titleNumber INTEGER,
+            duration TEXT,
+            seconds INTEGER,
+            PRIMARY KEY (source, titleNumber));
+        CREATE INDEX IF NOT EXISTS titles_seconds ON titles (seconds);
+        CREATE TABLE IF NOT EXISTS tracks (
+            source TEXT,
+            titleNumber INTEGER,
+            kind TEXT,
+            trackNumber INTEGER,
+            description TEXT,
+            FOREIGN KEY (source, titleNumber) REFERENCES titles (source, titleNumber) ON DELETE CASCADE);
+        CREATE INDEX IF NOT EXISTS tracks_title ON tracks (source, titleNumber);
+        """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(self.SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM discs').fetchone()[0]
+
+    def __str__(self):
+        return 'LibraryIndex: "{}", {} disc(s)'.format(self.filename, len(self))
+
+    @classmethod
+    def key(cls, source):
+        return os.path.normcase(os.path.abspath(source))
+
+    def close(self):
+        self.connection.close()
+
+    def discs(self):
+        """ Return a list of (source, hash, volume label, scanned, error,
+            title count) tuples sorted by source.
+        """
+        return self.connection.execute(
+            'SELECT discs.source, hash, volumeLabel, scanned, error, COUNT(titleNumber) '
+            'FROM discs LEFT JOIN titles ON titles.source = discs.source '
+            'GROUP BY discs.source ORDER BY discs.source').fetchall()
+
+    def findHash(self, discHash):
+        """ Return a list of the sources with a disc hash.
+        """
+        return [row[0] for row in self.connection.execute(
+            'SELECT source FROM discs WHERE hash = ? ORDER BY source', (discHash,))]
+
+    def isCurrent(self, source, fingerprint):
+        """ Return True if the source was scanned, without errors, when it had
+            this fingerprint.
+        """
+        if (fingerprint is None):
+            return False
+
+        row = self.connection.execute('SELECT fingerprint, error FROM discs WHERE source = ?',
+            (self.key(source),)).fetchone()
+
+        return (row is not None and row[0] == fingerprint and not row[1])
+
+    def recordDisc(self, source, fingerprint, discHash, volumeLabel, titles):
+        """ Replace everything in the index about a source with a new scan.
+            titles is a list of LibraryTitle tuples.
+        """
+        source = self.key(source)
+
+        with self.connection:
+            self.connection.execute('DELETE FROM discs WHERE source = ?', (source,))
+            self.connection.execute('INSERT INTO discs VALUES (?, ?, ?, ?, ?, NULL)',
+                (source, fingerprint, discHash, volumeLabel, self.__now()))
+
+            for title in titles:
+                self.connection.execute('INSERT INTO titles VALUES (?, ?, ?, ?)',
+                    (source, title.titleNumber, title.duration, title.seconds))
+
+                self.connection.executemany('INSERT INTO tracks VALUES (?, ?, ?, ?, ?)',
+                    [(source, title.titleNumber, self.TRACK_AUDIO, trackNumber, description)
+                    for trackNumber, description in title.audioTracks] +
+                    [(source, title.titleNumber, self.TRACK_SUBTITLE, trackNumber, description)
+                    for trackNumber, description in title.subtitleTracks])
+
+    def recordError(self, source, fingerprint, error):
+        """ Record a source that couldn't be scanned.  It is scanned again
+            the next time.
+        """
+        source = self.key(source)
+
+        with self.connection:
+            self.connection.execute('DELETE FROM discs WHERE source = ?', (source,))
+            self.connection.execute('INSERT INTO discs VALUES (?, ?, NULL, NULL, ?, ?)',
+                (source, fingerprint, self.__now(), error))
+
+    def titles(self, minimumSeconds=0):
+        """ Return a list of (source, volume label, title number, duration,
+            audio track count, subtitle track count) tuples for the titles at
+            least minimumSeconds long.
+        """
+        return self.connection.execute(
+            'SELECT titles.source, volumeLabel, titles.titleNumber, duration, '
+            'COALESCE(SUM(kind = ?), 0), COALESCE(SUM(kind = ?), 0) '
+            'FROM titles JOIN discs ON discs.source = titles.source '
+            'LEFT JOIN tracks ON tracks.source = titles.source AND tracks.titleNumber = titles.titleNumber '
+            'WHERE seconds >= ? '
+            'GROUP BY titles.source, titles.titleNumber '
+            'ORDER BY titles.source, titles.titleNumber',
+            (self.TRACK_AUDIO, self.TRACK_SUBTITLE, minimumSeconds)).fetchall()
+
+    def tracks(self, source, titleNumber):
+        """ Return a list of (kind, track number, description) tuples for a
+            title.
+        """
+        return self.connection.execute(
+            'SELECT kind, trackNumber, description FROM tracks '
+            'WHERE source = ? AND titleNumber = ? ORDER BY kind, trackNumber',
+            (self.key(source), titleNumber)).fetchall()
+
+    def __now(self):
+        return datetime.datetime.now().isoformat(' ', 'seconds')
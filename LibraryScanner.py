@@ -0,0 +1,311 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Scan a whole library of ripped discs without a GUI.
+#
+#   main.py --library /mnt/nas/video [--library-jobs 4] [--library-rescan]
+#   main.py --library-list [MINUTES]
+#
+# Every folder below the library folders with a VIDEO_TS subfolder (the same
+# test as the Source field on the main window) is scanned with HandBrakeCLI,
+# running up to --library-jobs scans at a time.  The titles, tracks, disc
+# hash and volume label of each disc go into the library index (see
+# LibraryIndex).
+#
+# A disc that is in the index with the same source fingerprint isn't scanned
+# again, so an interrupted library scan can simply be run again.  The scans
+# are also stored in the scan cache, so opening a scanned disc on the main
+# window doesn't run HandBrakeCLI.
+# =============================================================================
+
+import datetime, os, os.path, signal, sys
+
+sys.path.insert(0, '../Helpers')
+sys.path.insert(0, '../DiscData')
+
+from PyQt5.QtCore import (
+    QCoreApplication,
+    QObject,
+    QTimer
+    )
+
+from Disc import Disc
+from Helpers import GetFolderVolumeLabel
+from LibraryIndex import (
+    LibraryIndex,
+    LibraryTitle
+    )
+from ScanCache import ScanCache
+from SessionFingerprints import SessionFingerprints
+from SingletonLog import SingletonLog
+from SourceScanner import SourceScanner
+
+def IsDiscSourceFolder(folder):
+    """ Return True if the folder has a VIDEO_TS subfolder.
+    """
+    return bool(folder) and os.path.isdir(os.path.join(folder, 'VIDEO_TS'))
+
+def FindDiscSourceFolders(folders):
+    """ Return a sorted list of the disc source folders in and below the
+        folders.  The folders below a disc source folder aren't searched.
+    """
+    sources = []
+
+    for folder in folders:
+        for dirpath, dirnames, filenames in os.walk(folder):
+            if (IsDiscSourceFolder(dirpath)):
+                sources.append(dirpath)
+                dirnames[:] = []
+            else:
+                dirnames.sort()
+
+    return sorted(set(sources))
+
+def DurationToSeconds(duration):
+    """ Return the number of seconds in a "HH:MM:SS" duration, or 0.
+    """
+    seconds = 0
+    try:
+        for part in str(duration).split(':'):
+            seconds = (seconds * 60) + int(part)
+    except ValueError:
+        return 0
+
+    return seconds
+
+class LibraryScanner(QObject):
+    """ Find and scan the discs in one or more library folders.
+    """
+
+    # Python only sees signals (e.g. ctrl-c) when the interpreter runs, so
+    # wake it up every so often while Qt is waiting for the processes.
+    SIGNAL_POLL_MSECS = 500
+
+    def __init__(self, app, folders, maximumJobs=1, rescan=False):
+        super().__init__(app)
+
+        self.app = app
+        self.folders = folders
+        self.maximumJobs = max(1, maximumJobs)
+        self.rescan = rescan
+
+        self.exitCode = 0
+        self.index = None
+        self.sources = []
+        self.scanned = 0
+        self.failed = 0
+        self.startTime = None
+
+        self.log = None
+        if (self.preferences.logging.commandsAndTimestamps):
+            self.log = SingletonLog()
+
+        self.__stopping = False
+        self.__workers = {}
+        self.__signalTimer = None
+
+    @property
+    def preferences(self):
+        return self.app.preferences
+
+    def report(self, text):
+        """ Write a line to stdout, and to the log if logging is turned on.
+        """
+        if (self.log):
+            self.log.writeline(text)
+
+        print(text)
+        sys.stdout.flush()
+
+    def reportError(self, text):
+        if (self.log):
+            self.log.writeline(text)
+
+        sys.stderr.write('{}\n'.format(text))
+        sys.stderr.flush()
+
+    def scanArguments(self, source):
+        return ['-t', '0', '-i', source]
+
+    def start(self):
+        """ Find the discs and start scanning the ones that aren't in the
+            index.  Returns False if there is nothing to do.
+        """
+        for folder in self.folders:
+            if (not os.path.isdir(folder)):
+                self.reportError('The library folder "{}" does not exist.'.format(folder))
+                self.exitCode = 1
+
+        self.index = LibraryIndex(self.app.libraryFilename)
+
+        program = self.preferences.executables.handBrakeCLI
+        sources = FindDiscSourceFolders(self.folders)
+        for source in sources:
+            fingerprint = ScanCache.fingerprint(source, program, self.scanArguments(source))
+            if (self.rescan or not self.index.isCurrent(source, fingerprint)):
+                self.sources.append((source, fingerprint))
+
+        self.report('{} disc(s) found, {} to scan'.format(len(sources), len(self.sources)))
+
+        if (not self.sources):
+            self.index.close()
+            return False
+
+        signal.signal(signal.SIGINT, self.onSignal_stop)
+        signal.signal(signal.SIGTERM, self.onSignal_stop)
+        self.__signalTimer = QTimer(self)
+        self.__signalTimer.timeout.connect(lambda: None)
+        self.__signalTimer.start(self.SIGNAL_POLL_MSECS)
+
+        self.startTime = datetime.datetime.now()
+        self.report('Library scan start @ {}, running up to {} scan(s) at a time'.format(
+            self.startTime.strftime('%x %X'), self.maximumJobs))
+
+        # Start once the event loop is running, so that a scan that finishes
+        # immediately can still quit the application.
+        QTimer.singleShot(0, self.__startScans)
+
+        return True
+
+    def onSignal_stop(self, signalNumber, frame):
+        """ Stop scanning when the process is interrupted or terminated.  The
+            discs already scanned stay in the index.
+        """
+        self.reportError('Library scan canceled by signal {}'.format(signalNumber))
+
+        self.__stopping = True
+        self.sources = []
+        for worker in list(self.__workers.values()):
+            worker.cancel()
+
+        self.__finish()
+
+    def __finish(self):
+        """ Quit once the last scan has ended.
+        """
+        if (self.__workers or self.sources):
+            return
+
+        self.report('Library scan finished @ {}, {} scanned, {} failed'.format(
+            datetime.datetime.now().strftime('%x %X'), self.scanned, self.failed))
+        if (self.failed or self.__stopping):
+            self.exitCode = 1
+
+        self.index.close()
+        self.__signalTimer.stop()
+
+        QCoreApplication.instance().quit()
+
+    def __onScanCanceled(self, worker, source):
+        self.__removeWorker(worker, source)
+        self.__finish()
+
+    def __onScanFailed(self, worker, source, fingerprint, message, out):
+        self.__removeWorker(worker, source)
+
+        self.reportError('Unable to scan "{}": {}'.format(source, message.replace('\n', ' ')))
+        self.index.recordError(source, fingerprint, message)
+        self.failed += 1
+
+        self.__startScans()
+
+    def __onScanFinished(self, worker, source, fingerprint, out):
+        self.__removeWorker(worker, source)
+
+        self.app.scanCache.put(fingerprint, out)
+        self.__recordScan(source, fingerprint, out)
+
+        self.__startScans()
+
+    def __recordScan(self, source, fingerprint, out):
+        """ Parse a scan and add the disc to the index.
+        """
+        try:
+            disc = Disc(self.app)
+            disc.source = source
+            disc.parse(out)
+
+            titles = []
+            for key in sorted(disc.titles.titlesByOrderNumber.keys()):
+                title = disc.titles.titlesByOrderNumber[key]
+                titles.append(LibraryTitle(title.titleNumber, title.duration,
+                    DurationToSeconds(title.duration),
+                    [(track.trackNumber, track.description) for track in title.audioTracks],
+                    [(track.trackNumber, track.description) for track in title.subtitleTracks]))
+
+            self.index.recordDisc(source, fingerprint, disc.titles.hash,
+                GetFolderVolumeLabel(source), titles)
+            self.app.sessionFingerprints.record(SessionFingerprints.fingerprint(source),
+                disc.titles.hash)
+        except Exception as exception:
+            self.reportError('Unable to read the scan of "{}": {}'.format(source, exception))
+            self.index.recordError(source, fingerprint, str(exception))
+            self.failed += 1
+            return
+
+        self.scanned += 1
+        self.report('{} title(s): "{}"'.format(len(titles), source))
+
+    def __removeWorker(self, worker, source):
+        del self.__workers[source]
+        worker.deleteLater()
+
+    def __startScans(self):
+        """ Start scans until maximumJobs are running.  A scan that is in the
+            scan cache is read from the cache instead.
+        """
+        while (self.sources and len(self.__workers) < self.maximumJobs):
+            source, fingerprint = self.sources.pop(0)
+
+            out = None
+            if (not self.rescan):
+                out = self.app.scanCache.get(fingerprint)
+
+            if (out is not None):
+                self.__recordScan(source, fingerprint, out)
+                continue
+
+            worker = SourceScanner(self)
+            worker.scanFinished.connect(lambda out, worker=worker, source=source, fingerprint=fingerprint:
+                self.__onScanFinished(worker, source, fingerprint, out))
+            worker.scanFailed.connect(lambda message, out, worker=worker, source=source, fingerprint=fingerprint:
+                self.__onScanFailed(worker, source, fingerprint, message, out))
+            worker.scanCanceled.connect(lambda worker=worker, source=source:
+                self.__onScanCanceled(worker, source))
+            self.__workers[source] = worker
+
+            worker.start(self.preferences.executables.handBrakeCLI, self.scanArguments(source))
+
+        self.__finish()
+
+def ListLibrary(libraryFilename, minimumMinutes=0):
+    """ Print the titles in the library index at least minimumMinutes long,
+        then the discs that couldn't be scanned.
+    """
+    index = LibraryIndex(libraryFilename)
+
+    for source, volumeLabel, titleNumber, duration, audioTracks, subtitleTracks in index.titles(int(minimumMinutes * 60)):
+        print('{}\t{}\t{}\t{}\t{} audio\t{} subtitle'.format(source, volumeLabel or '',
+            titleNumber, duration, audioTracks, subtitleTracks))
+
+    for source, discHash, volumeLabel, scanned, error, titleCount in index.discs():
+        if (error):
+            sys.stderr.write('{}\tscan failed {}: {}\n'.format(source, scanned, error.replace('\n', ' ')))
+
+    index.close()
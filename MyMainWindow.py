@@ -16,13 +16,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import datetime, os, os.path, pathlib, subprocess, sys, tempfile, xml.dom, xml.dom.minidom as minidom
+import datetime, os, os.path, pathlib, subprocess, sys, tempfile, time
 
 # import time
-from collections import (
-    deque,
-    namedtuple
-)
+from collections import namedtuple
 
 sys.path.insert(0, '../Helpers')
 sys.path.insert(0, '../DiscData')
@@ -35,23 +32,23 @@ from PyQt5.QtCore import (
     QFileInfo,
     QProcess,
     QSettings,
-    QThread
+    QThread,
+    QTimer
     )
 from PyQt5.QtWidgets import (
     QAbstractItemView,
     QAction,
     QApplication,
-    QCheckBox,
     QFileDialog,
-    QHBoxLayout,
     QHeaderView,
     QInputDialog,
     QLabel,
     QMainWindow,
     QMenu,
     QMessageBox,
-    QTableWidgetItem,
-    QWidget
+    QProgressBar,
+    QPushButton,
+    QTableWidgetItem
     )
 
 from mainwindowui import Ui_MainWindow
@@ -63,8 +60,7 @@ from PyQt5WidgetDataConnectors import (
     QLineEditDataConnector,
     QPlainTextEditDataConnector,
     QRadioButtonGroupDataConnector,
-    QSpinBoxDataConnector,
-    QTableWidgetItemDataConnector
+    QSpinBoxDataConnector
     )
 
 from PyQt5OverrideCursor import QWaitCursor
@@ -110,9 +106,41 @@ from Titles import (
     Titles,
     TitleVisibleSingleton
     )
+from ProcessPriority import ProcessPriority
+from ScanCache import ScanCache
+from SessionAutosave import SessionAutosave
+from SessionFingerprints import SessionFingerprints
+from SessionIndex import (
+    ReadSessionSummary,
+    SessionIndex,
+    SessionSummary
+    )
+from SourceScanner import ParallelSourceScanner
+from TranscodeCommandBuilder import (
+    TranscodeCommandBuilder,
+    TranscodeCommandCache
+    )
+from TranscodeJournal import TranscodeJournal
+from TranscodeQueue import (
+    ArgumentsToString,
+    TranscodeCommand,
+    TranscodeJob,
+    TranscodeQueue
+    )
 from Exceptions import UserDoNotContinueException
 
 from Helpers import GetFolderVolumeLabel
+from LazyTitles import LazyTitleDetails
+from TitlesTableModel import (
+    TitlesTableModel,
+    VisibleTitlesProxyModel
+    )
+from IfoReader import (
+    IfoError,
+    IfoReader
+    )
+from LibraryScanner import IsDiscSourceFolder
+import XMLDocument
 from PyHelpers import (
     NormalizeFileName,
     TimedeltaToString,
@@ -156,11 +184,8 @@ class Disc_Source_Validator(QLineEdit_FolderExists_Validator):
             and (not self._widget.isEnabled())):
             return True
 
-        folder = os.path.join(self._widget.text(), 'VIDEO_TS')
-        if (folder):
-            path = pathlib.Path(folder)
-            if (path.is_dir()):
-                return True
+        if (IsDiscSourceFolder(self._widget.text())):
+            return True
 
         if (self._flags & self.FLAG_HIGHLIGHT_WIDGETS_WITH_ERRORS):
             self.setHighlight()
@@ -186,11 +211,13 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
     MAX_RECENT_FILES = 10
 
-    TABLE_DISC_TITLES_SELECT_COLUMN       = 0
-    TABLE_DISC_TITLES_TITLE_NUMBER_COLUMN = 1
-    TABLE_DISC_TITLES_DURATION_COLUMN     = 2
-    TABLE_DISC_TITLES_ASPECT_COLUMN       = 3
-    TABLE_DISC_TITLES_TITLE_NAME_COLUMN   = 4
+    SCANNED_TITLES_INTERVAL = 250       # Milliseconds between scanned title updates, at least
+
+    TABLE_DISC_TITLES_SELECT_COLUMN       = TitlesTableModel.SELECT_COLUMN
+    TABLE_DISC_TITLES_TITLE_NUMBER_COLUMN = TitlesTableModel.TITLE_NUMBER_COLUMN
+    TABLE_DISC_TITLES_DURATION_COLUMN     = TitlesTableModel.DURATION_COLUMN
+    TABLE_DISC_TITLES_ASPECT_COLUMN       = TitlesTableModel.ASPECT_COLUMN
+    TABLE_DISC_TITLES_TITLE_NAME_COLUMN   = TitlesTableModel.TITLE_NAME_COLUMN
 
     TABLE_DISCTITLE_TITLE_HEADER_COLUMN = 0
     TABLE_DISCTITLE_TITLE_DATA_COLUMN   = 1
@@ -222,6 +249,14 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     TABLE_DISCTITLE_SUBTITLES_TRACKNUMBER_COLUMN = 0
     TABLE_DISCTITLE_SUBTITLES_DESCRIPTION_COLUMN = 1
 
+    TABLE_MAKEITSO_JOBS_JOB_NUMBER_COLUMN = 0
+    TABLE_MAKEITSO_JOBS_DISC_COLUMN       = 1
+    TABLE_MAKEITSO_JOBS_STATE_COLUMN      = 2
+    TABLE_MAKEITSO_JOBS_PROGRESS_COLUMN   = 3
+    TABLE_MAKEITSO_JOBS_START_COLUMN      = 4
+    TABLE_MAKEITSO_JOBS_ELAPSED_COLUMN    = 5
+    TABLE_MAKEITSO_JOBS_COMMAND_COLUMN    = 6
+
     STATE_FILES_SELECTION_FILTER = 'State files (*.state.xml);;All files (*, *.*)'
     STATE_FILES_DOCUMENT_ROOT    = 'HEP'
 
@@ -237,12 +272,55 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.label_SampleFilename = QLabel()
         self.statusBar.addWidget(self.label_SampleFilename)
 
+        self.progressBar_SourceScan = QProgressBar()
+        self.progressBar_SourceScan.setMaximum(1000)
+        self.progressBar_SourceScan.setMaximumWidth(200)
+        self.progressBar_SourceScan.setVisible(False)
+        self.statusBar.addPermanentWidget(self.progressBar_SourceScan)
+        self.pushButton_SourceScan_Cancel = QPushButton('Cancel Scan')
+        self.pushButton_SourceScan_Cancel.setToolTip('Stop reading the source.')
+        self.pushButton_SourceScan_Cancel.setVisible(False)
+        self.statusBar.addPermanentWidget(self.pushButton_SourceScan_Cancel)
+
+        self.sourceScanner = ParallelSourceScanner(self)
+        self.sourceScanner.scanProgress.connect(self.onSourceScan_Progress)
+        self.sourceScanner.scanFinished.connect(self.onSourceScan_Finished)
+        self.sourceScanner.scanFailed.connect(self.onSourceScan_Failed)
+        self.sourceScanner.scanCanceled.connect(self.onSourceScan_Canceled)
+        self.sourceScanner.titlesScanned.connect(self.onSourceScan_TitlesScanned)
+        self.pushButton_SourceScan_Cancel.clicked.connect(self.sourceScanner.cancel)
+        self.sourceScanFingerprint = None
+        self.sourceDiscFingerprint = None
+        self.__declinedHashSession = None
+        self.__ifoTitlesShown = False
+
+        # Title details not built yet by a session loaded on demand.
+        self.__lazyTitleDetails = LazyTitleDetails()
+
+        self.sessionAutosave = SessionAutosave(self, self.preferences, self.autosaveSnapshot)
+        self.sessionAutosave.sessionSaved.connect(self.onSessionAutosave_Saved)
+        self.sessionAutosave.sessionSaveFailed.connect(self.onSessionAutosave_Failed)
+        QApplication.instance().installEventFilter(self.sessionAutosave)
+
+        # The titles are shown while the source is scanned.  Titles that
+        # arrive close together are shown together.  Every update parses all
+        # the titles scanned so far, so the updates are spread out as the
+        # parse gets slower (see __showScannedTitles()).
+        self.__scannedTitles = None
+        self.__shownScannedTitles = None
+        self.__scannedTitlesTimer = QTimer(self)
+        self.__scannedTitlesTimer.setSingleShot(True)
+        self.__scannedTitlesTimer.setInterval(self.SCANNED_TITLES_INTERVAL)
+        self.__scannedTitlesTimer.timeout.connect(self.__showScannedTitles)
+
         # self.__tabIcon_Highlight = QIcon('images/draw_ellipse_16.png')
         self.__tabIcon_Clear = QIcon()
         self.__tabIcon_Highlight = QIcon('images/diamond_16.png')
 
         self.__widgetDataConnectors = WidgetDataConnectors()
-        self.__titleSelection_widgetDataConnectors = WidgetDataConnectors()
+        self.__titlesTableModel = TitlesTableModel(self)
+        self.__visibleTitlesModel = VisibleTitlesProxyModel(self)
+        self.__visibleTitlesModel.setSourceModel(self.__titlesTableModel)
 
         self.__disc_audioTrackWidgets = AudioTrackWidgetsList(self)
         self.__disc_subtitleTrackWidgets = SubtitleTrackWidgetsList(self)
@@ -258,6 +336,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         # File menu actions
         # ======================================================================
         self.actionBrowse_for_Video.triggered.connect(self.onAction_Disc_Source_Browse)
+        self.actionRescan_Video.triggered.connect(self.onAction_Disc_Source_Rescan)
         self.actionBrowse_for_Destination.triggered.connect(self.onAction_Disc_Destination_Browse)
         self.actionSave_Hash_Session.triggered.connect(self.onAction_Disc_Save_HashSession)
         self.actionSave_Session.triggered.connect(self.onAction_Disc_Save_Session)
@@ -266,6 +345,8 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.actionDelete_Hash_Session.triggered.connect(self.onAction_Disc_Delete_Hash_Session)
         self.actionOpen_Session.triggered.connect(self.onAction_Disc_Open_Session)
         self.actionOpen_Hash_Session.triggered.connect(self.onAction_Disc_Open_HashSession)
+        self.actionFind_Session.triggered.connect(self.onAction_Disc_Find_Session)
+        self.actionRecent_Disc_Sessions.triggered.connect(self.onAction_Disc_Recent_Sessions)
         self.actionPreferences.triggered.connect(self.onAction_EditPreferences)
         self.actionQuit.triggered.connect(QApplication.instance().quit)
 
@@ -275,6 +356,9 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.action_LogFile_Open.triggered.connect(self.onAction_LogFile_Open)
         self.action_RecentFileList_Clear.triggered.connect(self.onAction_RecentFileList_Clear)
         self.action_RecentFileList_RemoveMissingFiles.triggered.connect(self.onAction_RecentFileList_RemoveMissingFiles)
+        self.action_ScanCache_Clear.triggered.connect(self.onAction_ScanCache_Clear)
+        self.action_SessionIndex_Update.triggered.connect(self.onAction_SessionIndex_Update)
+        self.action_OutputIndex_RemoveMissing.triggered.connect(self.onAction_OutputIndex_RemoveMissing)
 
         # Help menu actions
         # ======================================================================
@@ -313,6 +397,15 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     def closeEvent(self, event):
         """ Save the window geometry and state before closing.
         """
+        if (self.transcodingQueue is not None and not self.transcodingQueue.isFinished):
+            result = QMessageBox.question(self, 'Stop Transcoding?',
+                ('Transcoding is still running.  The running jobs will be '
+                'stopped and can be resumed the next time QtHEP is started.  '
+                'Do you want to exit anyway?'))
+            if (result != QMessageBox.Yes):
+                event.ignore()
+                return
+
         if (self.disc.source):
             if (self.validate()):
                 self.onAction_Disc_Save_Session()
@@ -324,6 +417,18 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
                     event.ignore()
                     return
 
+        # Keep the latest changes even if the session couldn't be saved above.
+        if (self.disc.source):
+            self.sessionAutosave.flush()
+        else:
+            self.sessionAutosave.cancel()
+
+        self.sourceScanner.cancel()
+
+        # The journal needs the chapters files to resume a running queue.
+        if (self.transcodingQueue is None):
+            self.transcodeCommandCache.clear()
+
         settings = QSettings()
 
         settings.setValue('geometry', self.saveGeometry())
@@ -337,7 +442,11 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         """
         enableWidgets = self.hasSelectedTitle
 
-        self.stackedWidget_MakeItSo.setEnabled(enableWidgets)
+        # Only the buttons that need a title, the running queue must always be
+        # stoppable.
+        self.pushButton_MakeItSo_Run.setEnabled(enableWidgets)
+        self.pushButton_MakeItSo_Preview.setEnabled(enableWidgets)
+        self.pushButton_MakeItSo_AddToQueue.setEnabled(enableWidgets)
 
     def enableWidgets_HasTitle(self):
         """ Enable/disable widgets throughout the main window if the disc has
@@ -356,8 +465,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         for idx in range(self.tabWidget_DiscTitle.count()):
             self.tabWidget_DiscTitle.widget(idx).setEnabled(enableWidgets)
 
-        self.stackedWidget_MakeItSo.setEnabled(self.hasSelectedTitle)
-
     def enableDiscWidgets(self, enableWidgets):
         """ Enable/disable widgets throughout the main window.  Used to prevent
             changes while transcoding is running.
@@ -374,15 +481,11 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.frame_DiscTitle_List.setEnabled(enableWidgets)
 
         if (enableWidgets):
-            self.tableWidget_Disc_Titles.setEditTriggers(QAbstractItemView.DoubleClicked
+            self.tableView_Disc_Titles.setEditTriggers(QAbstractItemView.DoubleClicked
                 | QAbstractItemView.SelectedClicked | QAbstractItemView.EditKeyPressed)
         else:
-            self.tableWidget_Disc_Titles.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            checkBox = self.tableWidget_Disc_Titles.cellWidget(row,
-                self.TABLE_DISC_TITLES_SELECT_COLUMN).findChild(QCheckBox,
-                'checkBox_DiscTitle_SelectTitle')
-            checkBox.setEnabled(enableWidgets)
+            self.tableView_Disc_Titles.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.__titlesTableModel.setEditable(enableWidgets)
 
         # Disable the individual tabs instead of the entire tab widget so the
         # user can still flip through the tabs.
@@ -390,14 +493,20 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             self.tabWidget_DiscTitle.widget(idx).setEnabled(enableWidgets)
 
     def getTitleRow(self, title):
-        """ Return the row in the tableWidget_Disc_Titles for the title.
+        """ Return the row in the tableView_Disc_Titles for the title, or
+            None if the title is hidden.
         """
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            rowTitle = self.tableWidget_Disc_Titles.item(row, 0).data(Qt.UserRole)
-            if (title.titleNumber == rowTitle.titleNumber):
-                return row
+        row = self.__visibleTitlesModel.row(title)
+        if (row < 0):
+            return None
 
-        return None
+        return row
+
+    def setCurrentTitleRow(self, row, column=TABLE_DISC_TITLES_TITLE_NUMBER_COLUMN):
+        """ Make a row of the tableView_Disc_Titles the current, selected row.
+        """
+        self.tableView_Disc_Titles.setCurrentIndex(
+            self.__visibleTitlesModel.index(row, column))
 
     def __init_Disc_AudioTracks(self):
         """ For the disc audio track widgets:
@@ -718,12 +827,14 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         """
         # The table displaying the list of disc titles.
         # ======================================================================
-        self.__standardTableWidgetInitialization(self.tableWidget_Disc_Titles,
-            ['Select', 'Title #', 'Duration', 'Aspect', 'Title Name'])
+        self.tableView_Disc_Titles.setModel(self.__visibleTitlesModel)
+        self.__standardTableWidgetInitialization(self.tableView_Disc_Titles)
+        self.tableView_Disc_Titles.resizeColumnsToContents()
+        self.tableView_Disc_Titles.horizontalHeader().setStretchLastSection(True)
 
-        self.tableWidget_Disc_Titles.itemSelectionChanged.connect(self.onDisc_Titles_ItemSelectionChanged)
-        self.tableWidget_Disc_Titles.itemChanged.connect(self.onDisc_Titles_ItemChanged)
-        # self.tableWidget_Disc_Titles.currentItemChanged.connect(self.onDisc_Titles_CurrentItemChanged)
+        self.tableView_Disc_Titles.selectionModel().selectionChanged.connect(self.onDisc_Titles_ItemSelectionChanged)
+        self.__titlesTableModel.titleChecked.connect(self.onDisc_Titles_Checked)
+        self.__titlesTableModel.titleRenamed.connect(self.onDisc_Titles_Renamed)
 
         self.toolButton_DiscTitle_MoveBottom.clicked.connect(self.onButton_DiscTitle_MoveBottom)
         self.toolButton_DiscTitle_MoveDown.clicked.connect(self.onButton_DiscTitle_MoveDown)
@@ -892,13 +1003,21 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.pushButton_MakeItSo_Preview.clicked.connect(self.onButton_MakeItSo_Preview)
         self.pushButton_MakeItSo_Run.clicked.connect(self.onButton_MakeItSo_Run)
         self.pushButton_MakeItSo_Stop.clicked.connect(self.onButton_MakeItSo_Stop)
+        self.pushButton_MakeItSo_StopJob.clicked.connect(self.onButton_MakeItSo_StopJob)
+        self.pushButton_MakeItSo_Pause.clicked.connect(self.onButton_MakeItSo_Pause)
+        self.pushButton_MakeItSo_PauseJob.clicked.connect(self.onButton_MakeItSo_PauseJob)
+        self.pushButton_MakeItSo_AddToQueue.clicked.connect(self.onButton_MakeItSo_Run)
+
+        self.__standardTableWidgetInitialization(self.tableWidget_MakeItSo_Jobs,
+            ['Job #', 'Disc', 'State', 'Progress', 'Start', 'Elapsed', 'Command'])
+        self.tableWidget_MakeItSo_Jobs.itemSelectionChanged.connect(self.onMakeItSo_Jobs_ItemSelectionChanged)
 
-        self.transcodingStartTime = None
-        self.transcodingWaitCursor = None
-        self.transcodingCommandsDeque = None
+        self.transcodingQueue = None
         self.transcodingChaptersFilenames = None
         self.transcodingLog = None
-        self.transcodingProcess = None
+
+        # Shared by Preview and Run so an unchanged disc is only built once.
+        self.transcodeCommandCache = TranscodeCommandCache()
 
     @property
     def disc(self):
@@ -911,18 +1030,20 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         """
         return "{}.state.xml".format(self.disc.titles.hash)
 
+    def getHashSessionPath(self, discHash):
+        """ Return the full name of the hash session file for a disc hash.
+        """
+        filename = "{}.state.xml".format(discHash)
+        if (self.preferences.discSession.autoDiscSessions):
+            filename = self.preferences.discSession.getFullFilename(filename)
+
+        return filename
+
     @property
     def hasSelectedTitle(self):
         """ Return True/False if at least one title is selected.
         """
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            checkBox = self.tableWidget_Disc_Titles.cellWidget(row,
-                self.TABLE_DISC_TITLES_SELECT_COLUMN).findChild(QCheckBox,
-                'checkBox_DiscTitle_SelectTitle')
-            if (checkBox.isChecked()):
-                return True
-
-        return False
+        return self.__titlesTableModel.hasSelectedTitle
 
     @property
     def preferences(self):
@@ -1032,6 +1153,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
                 return
 
             os.unlink(filename)
+            QApplication.instance().sessionIndex.remove(filename)
             self.statusBar.showMessage('Session state file "{}" deleted.'.format(filename), 15000)
         else:
             QMessageBox.information(self, 'File Not Found',
@@ -1073,6 +1195,26 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         self.__loadSession(filename)
 
+    def onAction_Disc_Find_Session(self):
+        """ Find the saved sessions with the disc title, volume label or
+            source and open one of them.
+        """
+        text, ok = QInputDialog.getText(self, 'Find Session',
+            'Disc title, volume label or source contains')
+        if (not ok or not text.strip()):
+            return
+
+        self.__syncSessionIndex(False)
+        self.__openIndexedSession('Find Session',
+            QApplication.instance().sessionIndex.find(text.strip()))
+
+    def onAction_Disc_Recent_Sessions(self):
+        """ Open one of the most recently saved sessions.
+        """
+        self.__syncSessionIndex(False)
+        self.__openIndexedSession('Recent Disc Sessions',
+            QApplication.instance().sessionIndex.recent())
+
     def onAction_Disc_Open_HashSession(self):
         """ Select a session file and open it.
         """
@@ -1104,7 +1246,9 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         if (self.preferences.discSession.autoDiscSessions):
             filename = self.preferences.discSession.getFullFilename(filename)
 
-        self.__saveSession(filename)
+        if (self.__saveSession(filename)):
+            QApplication.instance().sessionFingerprints.record(
+                SessionFingerprints.fingerprint(self.disc.source), self.disc.titles.hash)
 
     def onAction_Disc_Save_Session(self):
         """ Create an xml file using the current file name.  The file will
@@ -1149,23 +1293,19 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.disc.clear()
         self.disc.source = sourceFolder
 
-        if (not self.__readSource()):
-            return
+        self.__readSource()
 
-        filename = self.hashSessionFilename
-        if (self.preferences.discSession.autoDiscSessions):
-            filename = self.preferences.discSession.getFullFilename(filename)
-
-        if (os.path.exists(filename)):
-            result = QMessageBox.question(self, 'Load Automatic Session?',
-                'An automatic session file exist for this video.  Do you want to load it?')
-            if (result == QMessageBox.Yes):
-                self.__loadSession(filename)
-                return
+    def onAction_Disc_Source_Rescan(self):
+        """ Re-read the disc with Handbrake, even if the scan is in the scan
+            cache.  Then parse the disc information.
+        """
+        if (not self.validator_Disc_Source.isValid()):
+            return
 
-        self.__onNewSource()
+        self.disc.clear()
+        self.disc.source = self.lineEdit_Disc_Source.text()
 
-        self.transferToWindow()
+        self.__readSource(True)
 
     def onAction_EditPreferences(self):
         """Edit the application preferences."""
@@ -1218,6 +1358,29 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.statusBar.showMessage('Recent file list updated.', 15000)
         QApplication.beep()
 
+    def onAction_SessionIndex_Update(self):
+        """ Index the new and changed automatic session files and remove the
+            sessions that no longer exist.
+        """
+        self.__syncSessionIndex(True)
+
+    def onAction_OutputIndex_RemoveMissing(self):
+        """ Remove the outputs that no longer exist from the output index.
+        """
+        outputIndex = QApplication.instance().outputIndex
+        with QWaitCursor():
+            removed = outputIndex.removeMissing()
+
+        self.statusBar.showMessage('Output index: {} missing output(s) removed, {} in the index.'.format(
+            removed, len(outputIndex)), 15000)
+
+    def onAction_ScanCache_Clear(self):
+        """ Delete all the cached source scans.
+        """
+        QApplication.instance().scanCache.clear()
+        self.statusBar.showMessage('Scan cache cleared.', 15000)
+        QApplication.beep()
+
     def onButton_Disc_AudioTracks_Find(self):
         """ Find the audio track and mixdown settings for the first visible,
             selected title.  Then set the disc audio track states and update the
@@ -1225,8 +1388,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
             Use the default title is nothing matches.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
-
         matchingTitles = self.disc.titles.matchingTitles(Titles.FLAG_SELECTED
             | Titles.FLAG_VISIBLE)
 
@@ -1234,6 +1395,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             matchingTitle = matchingTitles.matchingTitles[0]
         else:
             matchingTitle = matchingTitles.defaultTitle
+        self.__lazyTitleDetails.materialize(matchingTitle)
 
         self.disc.audioTrackStates.autoset_From_AudioTracks(
             matchingTitle.audioTracks,
@@ -1250,8 +1412,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
             Use the default title is nothing matches.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
-
         matchingTitles = self.disc.titles.matchingTitles(Titles.FLAG_SELECTED
             | Titles.FLAG_VISIBLE)
 
@@ -1259,6 +1419,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             matchingTitle = matchingTitles.matchingTitles[0]
         else:
             matchingTitle = matchingTitles.defaultTitle
+        self.__lazyTitleDetails.materialize(matchingTitle)
 
         self.disc.audioTrackStates.autoset_From_AudioTracks(
             matchingTitle.audioTracks,
@@ -1278,8 +1439,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
             Use the default title is nothing matches.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
-
         matchingTitles = self.disc.titles.matchingTitles(Titles.FLAG_SELECTED
             | Titles.FLAG_VISIBLE)
 
@@ -1287,6 +1446,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             matchingTitle = matchingTitles.matchingTitles[0]
         else:
             matchingTitle = matchingTitles.defaultTitle
+        self.__lazyTitleDetails.materialize(matchingTitle)
 
         self.disc.customCrop.copy(matchingTitle.autoCrop)
         self.disc.customCrop.processChoice = self.disc.customCrop.PROCESS_CUSTOM
@@ -1326,24 +1486,9 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             return
 
         self.disc.clear()
-        if (not self.__readSource()):
-            return
-
-        filename = self.hashSessionFilename
-        if (self.preferences.discSession.autoDiscSessions):
-            filename = self.preferences.discSession.getFullFilename(filename)
-
-        if (os.path.exists(filename)):
-            result = QMessageBox.question(self, 'Load Automatic Session?',
-                'An automatic session file exist for this video.  Do you want to load it?')
-            if (result == QMessageBox.Yes):
-                self.__loadSession(filename)
-                return
-
-        self.__onNewSource()
         self.disc.source = self.lineEdit_Disc_Source.text()
 
-        self.transferToWindow()
+        self.__readSource()
 
     def onButton_Disc_SourceDiskLabel_Edit(self):
         """ Get the disk label from the user.
@@ -1382,8 +1527,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
             Use the default title is nothing matches.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
-
         matchingTitles = self.disc.titles.matchingTitles(Titles.FLAG_SELECTED
             | Titles.FLAG_VISIBLE)
 
@@ -1391,6 +1534,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             matchingTitle = matchingTitles.matchingTitles[0]
         else:
             matchingTitle = matchingTitles.defaultTitle
+        self.__lazyTitleDetails.materialize(matchingTitle)
 
         self.disc.subtitleTrackStates.autoset_From_SubtitleTracks(
             matchingTitle.subtitleTracks,
@@ -1611,11 +1755,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     def onButton_DiscTitle_ClearSelections(self):
         """ Clear the selected attribute for all of the selected titles.
         """
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            checkBox = self.tableWidget_Disc_Titles.cellWidget(row,
-                self.TABLE_DISC_TITLES_SELECT_COLUMN).findChild(QCheckBox,
-                'checkBox_DiscTitle_SelectTitle')
-            checkBox.setChecked(False)
+        self.__titlesTableModel.clearSelections()
 
         self.statusBar.showMessage('Title selections cleared.', 15000)
         QApplication.beep()
@@ -1727,7 +1867,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         # We don't need to worry about the "visible row" problem because the
         # row we're moving is visible and it's below all the other rows.
 
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
         self.__titleDetailsFromWidgets()
 
         title = self.activeTitle()
@@ -1736,17 +1875,14 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         self.disc.titles.moveBottom(title)
         self.__transferToDiscTables()
-        self.tableWidget_Disc_Titles.setCurrentItem(
-            self.tableWidget_Disc_Titles.item(
-            self.tableWidget_Disc_Titles.rowCount() - 1,
-            self.TABLE_DISC_TITLES_SELECT_COLUMN))
+        self.setCurrentTitleRow(self.__visibleTitlesModel.rowCount() - 1,
+            self.TABLE_DISC_TITLES_SELECT_COLUMN)
 
         self.onDisc_Titles_EnableWidgets()
 
     def onButton_DiscTitle_MoveDown(self):
         """ Move the selected title down one entry in the list.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
         self.__titleDetailsFromWidgets()
 
         title = self.activeTitle()
@@ -1757,9 +1893,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.__transferToDiscTables()
 
         row = self.getTitleRow(title)
-        self.tableWidget_Disc_Titles.setCurrentItem(
-            self.tableWidget_Disc_Titles.item(row,
-            self.TABLE_DISC_TITLES_SELECT_COLUMN))
+        self.setCurrentTitleRow(row, self.TABLE_DISC_TITLES_SELECT_COLUMN)
 
         self.onDisc_Titles_EnableWidgets()
 
@@ -1769,7 +1903,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         # We don't need to worry about the "visible row" problem because the
         # row we're moving is visible and it's above all the other rows.
 
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
         self.__titleDetailsFromWidgets()
 
         title = self.activeTitle()
@@ -1778,16 +1911,13 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         self.disc.titles.moveTop(title)
         self.__transferToDiscTables()
-        self.tableWidget_Disc_Titles.setCurrentItem(
-            self.tableWidget_Disc_Titles.item(0,
-            self.TABLE_DISC_TITLES_SELECT_COLUMN))
+        self.setCurrentTitleRow(0, self.TABLE_DISC_TITLES_SELECT_COLUMN)
 
         self.onDisc_Titles_EnableWidgets()
 
     def onButton_DiscTitle_MoveUp(self):
         """ Move the selected title up one entry in the list.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
         self.__titleDetailsFromWidgets()
 
         title = self.activeTitle()
@@ -1798,24 +1928,19 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.__transferToDiscTables()
 
         row = self.getTitleRow(title)
-        self.tableWidget_Disc_Titles.setCurrentItem(
-            self.tableWidget_Disc_Titles.item(row,
-            self.TABLE_DISC_TITLES_SELECT_COLUMN))
+        self.setCurrentTitleRow(row, self.TABLE_DISC_TITLES_SELECT_COLUMN)
 
         self.onDisc_Titles_EnableWidgets()
 
     def onButton_DiscTitle_RestoreNaturalOrder(self):
         """ Restore the natural order of the title list.
         """
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
         self.__titleDetailsFromWidgets()
 
         self.disc.titles.setNaturalTitleOrder()
         self.__transferToDiscTables()
 
-        self.tableWidget_Disc_Titles.setCurrentItem(
-            self.tableWidget_Disc_Titles.item(0,
-            self.TABLE_DISC_TITLES_SELECT_COLUMN))
+        self.setCurrentTitleRow(0, self.TABLE_DISC_TITLES_SELECT_COLUMN)
 
         self.onDisc_Titles_EnableWidgets()
 
@@ -1850,380 +1975,430 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.statusBar.showMessage('Title subtitle track states found and set.', 15000)
         QApplication.beep()
 
-    def MakeCommandLineForTitle(self, title, episodeNumber, chapterRangeEpisode=None):
-        """ Returns a tuple of the command line, the output file name (with path)
-            and the filename of the chapter titles (may be None).
+    def onButton_MakeItSo_Run(self):
+        """ Start transcoding the selected titles, or add them to the queue if
+            transcoding is already running.
 
-            The output file name is used to check if the file exists.
+            * Update the disc data from the widgets.
+            * Validate the data.
+            * Find the titles to transcode.
+            * Generate the transcoding commands and chapter files.  This is a
+              snapshot of the disc; the disc can be changed, or another disc
+              loaded, as soon as the jobs are queued.
+            * Start transcoding with a TranscodeQueue.  The queue runs up to
+              preferences.transcoding.maximumJobs at the same time and keeps
+              a journal so it can be resumed after a crash.
         """
+        self.transferFromWindow()
 
-        # applicationState = wx.GetApp().applicationState        # Used a lot.
-        # settings = wx.GetApp().settings
-        preset = self.preferences.presets.getByName(self.disc.preset)
+        if (not self.validate()):
+            return
 
-        # Build the file name
-        # ===================
-        audioTags = []
-        if (title.audioTrackStates.isCustom):
-            audioTags = title.audioTrackStates.getMixdownTags(self.preferences.mixdowns)
-        else:
-            audioTags = self.disc.audioTrackStates.getMixdownTags(self.preferences.mixdowns)
+        matchingTitles = self.disc.titles.matchingTitles(
+            Titles.FLAG_SELECTED | Titles.FLAG_VISIBLE)
 
-        chapterRangeEpisodeTitle = ''
-        if (chapterRangeEpisode is not None):
-            chapterRangeEpisodeTitle = chapterRangeEpisode.title
+        if (not len(matchingTitles.matchingTitles)):
+            QMessageBox.warning(self, 'Titles Error',
+                ('Error!  This video does not have any visible, selected titles.'
+                '  Please select something and try again.'))
+            return
 
-        filename = self.preferences.filenameTemplates.buildFilename(
-            self.disc.filenameTemplate,
-            self.disc.title,
-            preset.tag,
-            audioTags,
-            '{0:0{1}d}'.format(episodeNumber, self.disc.episodeNumberPrecision),
-            title.title,
-            chapterRangeEpisodeTitle
-            )
+        commands, chaptersFilenames = TranscodeCommandBuilder(self.preferences,
+            self.disc, self.transcodeCommandCache).makeCommandLines(matchingTitles.matchingTitles)
 
-        # Assemble the commands
-        # =====================
-        commands = []
-        outputFilename = os.path.join(self.disc.destination, filename)
+        if (self.preferences.transcoding.skipUnchangedOutputs):
+            commands, unchangedCommands = QApplication.instance().outputIndex.partition(commands)
+            for command in unchangedCommands:
+                self.resultsHtml.appendParagraph('Skipped "{}", the output is unchanged'.format(
+                    command.outputFilename), 'c2')
 
-        commands.append('-i "{}"'.format(self.disc.source))
-        commands.append('-o "{}"'.format(outputFilename))
+            if (not commands):
+                chaptersFilenames.unlink()
+                self.statusBar.showMessage('Nothing to transcode, every output is unchanged.', 15000)
+                return
 
-        commands.append('-t {0:d}'.format(title.titleNumber))
+        firstJobNumber = 1
+        if (self.transcodingQueue is not None):
+            firstJobNumber = len(self.transcodingQueue) + 1
 
-        # Build the audio commands
-        # ------------------------
-        trackMixdowns = []
+        jobs = TranscodeQueue.newJobs(self.preferences.executables.handBrakeCLI,
+            commands, firstJobNumber, self.disc.title)
+        # jobs = TranscodeQueue.newJobs('./TestFiles/countdown',
+        #     [TranscodeCommand(['-c', '20'], None, None, ''), TranscodeCommand(['-c', '15'], None, None, ''),
+        #     TranscodeCommand(['-c', '4'], None, None, '')], firstJobNumber, self.disc.title)
 
-        tracks = []
-        encoders = []
-        mixdowns = []
-        sampleRates = []
-        bitrates = []
-        dynamicRangeCompressions = []
-        gains = []
+        if (self.transcodingQueue is None):
+            self.__transcode_start(jobs, chaptersFilenames)
+        else:
+            self.__transcode_add(jobs, chaptersFilenames)
 
-        trackNames = []
+    def __transcode_add(self, jobs, chaptersFilenames):
+        """ Add jobs for another disc to the running transcoding queue.
+        """
+        self.transcodingChaptersFilenames.append(chaptersFilenames)
 
-        if (title.audioTrackStates.isCustom):
-            for audioTrackState in title.audioTrackStates:
-                if (not audioTrackState.track):
-                    continue
+        self.resultsHtml.appendParagraph('{} job(s) added to the queue for "{}"'.format(
+            len(jobs), self.disc.title), 'c1', self.transcodingLog)
 
-                mixdown = self.preferences.mixdowns.getByName(audioTrackState.primaryMixdown)
-                if (mixdown is not None):
-                    trackMixdowns.append((audioTrackState.track, mixdown))
+        self.transcodingQueue.addJobs(jobs)
 
-                mixdown = self.preferences.mixdowns.getByName(audioTrackState.secondaryMixdown)
-                if (mixdown is not None):
-                    trackMixdowns.append((audioTrackState.track, mixdown))
-        else:
-            for audioTrackState in self.disc.audioTrackStates:
-                if (not audioTrackState.track):
-                    continue
-
-                mixdown = self.preferences.mixdowns.getByName(audioTrackState.primaryMixdown)
-                if (mixdown is not None):
-                    trackMixdowns.append((audioTrackState.track, mixdown))
-
-                mixdown = self.preferences.mixdowns.getByName(audioTrackState.secondaryMixdown)
-                if (mixdown is not None):
-                    trackMixdowns.append((audioTrackState.track, mixdown))
-
-        for track, mixdown in trackMixdowns:
-            tracks.append(str(track))
-            encoders.append(mixdown.encoder)
-            mixdowns.append(mixdown.mixdown)
-            sampleRates.append(mixdown.sampleRate)
-            bitrates.append(mixdown.bitrate)
-            dynamicRangeCompressions.append(mixdown.dynamicRangeCompression)
-            gains.append(mixdown.gain)
-
-
-        if (len(tracks) > 0):
-            commands.append('-a {}'.format(','.join(tracks)))
-            commands.append('-E {}'.format(','.join(encoders)))
-            commands.append('-6 {}'.format(','.join(mixdowns)))
-            commands.append('-R {}'.format(','.join(sampleRates)))
-            commands.append('-B {}'.format(','.join(bitrates)))
-            commands.append('-D {}'.format(','.join(dynamicRangeCompressions)))
-            commands.append('--gain {}'.format(','.join(gains)))
-
-        # Build the subititle commands
-        # ----------------------------
-        tracks = []
-        forced = []
-        burn = None
-        default = None
-
-        if (title.subtitleTrackStates.isCustom):
-            subtitleTrackStates = title.subtitleTrackStates
-        else:
-            subtitleTrackStates = self.disc.subtitleTrackStates
-
-        index = 0
-        for subtitleTrackState in subtitleTrackStates:
-            found = False
-            if (subtitleTrackState.track):         # a.k.a. user selected
-                tracks.append(subtitleTrackState.track)
-                found = True
-
-            if (found == True):
-                index += 1
-                if (subtitleTrackState.forced):
-                    forced.append(str(index))
-                if (subtitleTrackState.burn):
-                    burn = str(index)
-                if (subtitleTrackState.default):
-                    default = str(index)
-
-        if (len(tracks) > 0):
-            commands.append('-s {}'.format(','.join(tracks)))
-
-            if (len(forced) > 0):
-                commands.append('--subtitle-forced={}'.format(','.join(forced)))
-            if (burn is not None):
-                commands.append('--subtitle-burned={}'.format(burn))
-            if (default is not None):
-                commands.append('--subtitle-default={}'.format(default))
-
-        # nodvdnav processing
-        # ----------------------
-
-        if (self.disc.nodvdnav):
-            commands.append('--no-dvdnav')
-
-        # custom cropping processing
-        # --------------------------
-        cropping = None
-
-        # Custom cropping can be done at the title level or at the application level.
-        if (title.customCrop.isCustom):
-            cropping = title.customCrop
-        elif (title.customCrop.isDefault and self.disc.customCrop.isCustom):
-            cropping = self.disc.customCrop
-
-        if (cropping is not None):
-            commands.append('--crop {}:{}:{}:{}'.format(
-                cropping.top, cropping.bottom,
-                cropping.left, cropping.right))
-
-        # Chapter processing
-        # ------------------
-        chaptersFilename = None
-        if (title.chapters.processChoice == Chapters.PROCESS_MARKERS):
-            commands.append('-m')
-        elif (title.chapters.processChoice == Chapters.PROCESS_NAMES):
-            chaptersFile, chaptersFilename = tempfile.mkstemp(suffix='.chapters.csv', prefix='wxHEP_')
-
-            for chapter in title.chapters:
-                if (self.preferences.options.numberChapterNames):
-                    line = '{},{}: {}\r\n'.format(chapter.chapterNumber,
-                        chapter.chapterNumber + title.chapters.firstChapterNumber - 1,
-                        chapter.title)
-                else:
-                    line = '{},{}\r\n'.format(chapter.chapterNumber, chapter.title)
+        self.makeItSo_JobsToTable()
+        self.makeItSo_ProgressToWidgets()
 
-                os.write(chaptersFile, line.encode(encoding='utf-8'))
+        self.statusBar.showMessage('{} job(s) added to the transcoding queue.'.format(len(jobs)), 15000)
 
-            os.close(chaptersFile)
-            commands.append('--markers="{}"'.format(chaptersFilename))
+    def __transcode_start(self, jobs, chaptersFilenames, resumed=False, journal=None):
+        """ Create the transcoding queue for a list of jobs and start it.
 
-        if (title.chapterRanges.processChoice == ChapterRanges.PROCESS_RANGE):
-            if (title.chapterRanges.firstChapter == title.chapterRanges.lastChapter):
-                commands.append('-c {}'.format(title.chapterRanges.firstChapter))
-            else:
-                commands.append('-c {}-{}'.format(title.chapterRanges.firstChapter, title.chapterRanges.lastChapter))
-        elif (title.chapterRanges.processChoice == title.chapterRanges.PROCESS_EPISODES and chapterRangeEpisode is not None):
-            commands.append('-c {}-{}'.format(chapterRangeEpisode.firstChapter, chapterRangeEpisode.lastChapter))
+            * Tell the user what we're doing.
+            * Start the queue.
 
-        # Last but not least, the preset settings
-        # ---------------------------------------
-        commands.append(preset.settings)
+            The disc widgets are left enabled so the next disc can be prepared
+            and added to the queue while this one is transcoding.
 
-        return (' '.join(commands), outputFilename, chaptersFilename)
+            journal is the journal a resumed queue was read from, already
+            owned by this instance.  If another instance owns the journal the
+            queue runs without one.
+        """
+        if (journal is None):
+            journal = TranscodeJournal(QApplication.instance().journalFilename)
+            if (not journal.acquire()):
+                journal = None
+
+        self.transcodingQueue = TranscodeQueue(jobs,
+            self.preferences.transcoding.maximumJobs,
+            journal,
+            QApplication.instance().outputIndex,
+            ProcessPriority.fromPreferences(self.preferences.transcoding), self)
+        self.transcodingQueue.jobStarted.connect(self.onTranscoding_jobStarted)
+        self.transcodingQueue.jobProgress.connect(self.onTranscoding_jobProgress)
+        self.transcodingQueue.jobPausedChanged.connect(self.onTranscoding_jobPausedChanged)
+        self.transcodingQueue.jobFinished.connect(self.onTranscoding_jobFinished)
+        self.transcodingQueue.queueFinished.connect(self.onTranscoding_queueFinished)
+
+        self.transcodingChaptersFilenames = [chaptersFilenames]
+        self.transcodingLog = None
+        if (self.preferences.logging.commandsAndTimestamps):
+            self.transcodingLog = SingletonLog()
 
-    def MakeCommandLines(self, titles):
-        """ Returns a tupple:
+        self.makeItSo_JobsToTable()
+        self.makeItSo_ProgressToWidgets()
 
-            * A list of command lines for the selected, visible titles.  The
-              list will be empty if nothing is found.
-            * A list chapter filenames that are created for titles with custom
-              chapters names.  The list will be empty is nothing is found.
-              The list is used to delete the files after all transcoding is
-              complete.
+        self.statusBar.showMessage('Transcoding...')
+        if (resumed):
+            self.resultsHtml.appendParagraph('TRANSCODING (RESUMED)', 'c0', self.transcodingLog)
+        else:
+            self.resultsHtml.appendParagraph('TRANSCODING', 'c0', self.transcodingLog)
 
-            The method will check the output filename for the video.  It will
-            ask the user about overwriting existing files.
+        self.resultsHtml.appendParagraph('Transcoding start @ {}'.format(
+            datetime.datetime.now().strftime('%x %X')), 'c1',
+            self.transcodingLog)
+        self.resultsHtml.appendParagraph('{} job(s), running up to {} at a time'.format(
+            len(self.transcodingQueue), self.transcodingQueue.maximumJobs), 'c1',
+            self.transcodingLog)
+        if (journal is None):
+            self.resultsHtml.appendParagraph(('The transcoding journal is in use by another '
+                'instance, this queue can\'t be resumed after a crash'), 'c1',
+                self.transcodingLog)
 
-            The method will always clean up any temporary files, such as chapter
-            name files, before throwing any exceptions.
+        for job in self.transcodingQueue.jobs:
+            if (job.state == TranscodeJob.STATE_DONE):
+                self.resultsHtml.appendParagraph('Job {} skipped, "{}" is already complete'.format(
+                    job.jobNumber, job.outputFilename), 'c2', self.transcodingLog)
+            elif (job.state == TranscodeJob.STATE_FAILED):
+                self.resultsHtml.appendParagraph('Job {} skipped: {}'.format(
+                    job.jobNumber, job.errorString), 'c2', self.transcodingLog)
 
-            WARNING: This method rasies a UserDoNotContinueException if the user
-            responds with "NO" when asked 'Do you want to overwrite the
-            existing file?'
+        self.stackedWidget_MakeItSo.setCurrentIndex(1)
+        self.tabWidget.setCurrentWidget(self.tab_MakeItSo)
+
+        self.transcodingQueue.start()
+
+    def offerToResumeTranscoding(self):
+        """ Called at startup.  If a transcoding journal was left behind by a
+            crash, ask the user if the unfinished jobs should be run.  The
+            journal of a queue another instance is running is left alone.
         """
-        commandLines = []
-        outputFilenames = []
-        chaptersFilenames = TemporaryFilesList()
-        episodeNumber = self.disc.firstEpisodeNumber
-
-        for title in titles:
-            if (title.chapterRanges.processChoice == ChapterRanges.PROCESS_EPISODES):
-                for chapterRange in title.chapterRanges:
-                    commandLine, outputFilename, chaptersFilename = self.MakeCommandLineForTitle(title, episodeNumber, chapterRange)
-                    commandLines.append(commandLine)
-                    outputFilenames.append(outputFilename)
-                    if (chaptersFilename is not None):
-                        chaptersFilenames.append(chaptersFilename)
-                    episodeNumber += 1
-            else:
-                commandLine, outputFilename, chaptersFilename = self.MakeCommandLineForTitle(title, episodeNumber)
-                commandLines.append(commandLine)
-                outputFilenames.append(outputFilename)
-                if (chaptersFilename is not None):
-                    chaptersFilenames.append(chaptersFilename)
-                episodeNumber += 1
-
-        # for outputFilename in outputFilenames:
-        #     if (os.path.exists(outputFilename)):
-        #
-        #         result = wx.MessageBox("Warning! File '{} already exists.  Do you want to continue?".format(os.path.basename(outputFilename)),
-        #             "File Already Exists", wx.YES_NO)
-        #
-        #         if (result == wx.NO):
-        #             return
+        journal = TranscodeJournal(QApplication.instance().journalFilename)
+        if (not journal.exists or not journal.acquire()):
+            return
 
-        return (commandLines, chaptersFilenames)
+        try:
+            jobs = journal.readForResume()
+        except Exception as exception:
+            QMessageBox.warning(self, 'Transcoding Journal Error',
+                'Unable to read the transcoding journal "{}".\n\n{}'.format(
+                journal.filename, exception))
+            journal.remove()
+            journal.release()
+            return
 
-    def onButton_MakeItSo_Run(self):
-        """ Start transcoding the selected titles.
+        pendingJobs = [job for job in jobs if (job.state == TranscodeJob.STATE_PENDING)]
+        chaptersFilenames = TemporaryFilesList()
+        for job in jobs:
+            if (job.chaptersFilename and os.path.exists(job.chaptersFilename)):
+                chaptersFilenames.append(job.chaptersFilename)
+
+        if (pendingJobs):
+            result = QMessageBox.question(self, 'Resume Transcoding?',
+                ('Transcoding did not finish the last time QtHEP was run.  {} of '
+                '{} job(s) still need to be run.  Do you want to resume '
+                'transcoding?').format(len(pendingJobs), len(jobs)))
+            if (result == QMessageBox.Yes):
+                self.__transcode_start(jobs, chaptersFilenames, resumed=True, journal=journal)
+                return
 
-            * Update the disc data from the widgets.
-            * Validate the data.
-            * Find the titles to transcode.
-            * Generate the transcoding commands and chapter files.
-            * Tell the user what we're doing.
-            * Disable the controls; No changes while transcoding.
-            * Start transcoding with a call to __transcode_nextTitle().
+        chaptersFilenames.unlink()
+        journal.remove()
+        journal.release()
+
+    def onButton_MakeItSo_Pause(self):
+        """ Pause the whole transcoding queue, or resume it if it is paused.
         """
-        self.transferFromWindow()
+        if (self.transcodingQueue.isPaused):
+            self.transcodingQueue.resume()
+            self.resultsHtml.appendParagraph('Transcoding resumed @ {}'.format(
+                datetime.datetime.now().strftime('%x %X')), 'c1', self.transcodingLog)
+            self.statusBar.showMessage('Transcoding...')
+        else:
+            self.transcodingQueue.pause()
+            self.resultsHtml.appendParagraph('Transcoding paused @ {}'.format(
+                datetime.datetime.now().strftime('%x %X')), 'c1', self.transcodingLog)
+            self.statusBar.showMessage('Transcoding paused.')
 
-        if (not self.validate()):
+        self.makeItSo_PauseToWidgets()
+        self.makeItSo_ProgressToWidgets()
+
+    def onButton_MakeItSo_PauseJob(self):
+        """ Pause the job selected in the jobs table, or resume it if it is
+            paused.  The other jobs keep running.
+        """
+        job = self.makeItSo_SelectedJob()
+        if (job is None):
             return
 
-        matchingTitles = self.disc.titles.matchingTitles(
-            Titles.FLAG_SELECTED | Titles.FLAG_VISIBLE)
+        if (job.isPaused):
+            if (self.transcodingQueue.resumeJob(job)):
+                self.resultsHtml.appendParagraph('Job {} resumed by user'.format(job.jobNumber),
+                    'c2', self.transcodingLog)
+        elif (self.transcodingQueue.pauseJob(job)):
+            self.resultsHtml.appendParagraph('Job {} paused by user'.format(job.jobNumber),
+                'c2', self.transcodingLog)
 
-        if (not len(matchingTitles.matchingTitles)):
-            QMessageBox.warning(self, 'Titles Error',
-                ('Error!  This video does not have any visible, selected titles.'
-                '  Please select something and try again.'))
+    def onButton_MakeItSo_Stop(self):
+        """ Stop transcoding because the user has cancelled it.
+        """
+        self.resultsHtml.appendParagraph('Transcoding canceled by user', 'c0', self.transcodingLog)
+        self.transcodingQueue.stop()
+        # onTranscoding_queueFinished() is called by the queue after the last job is stopped.
+
+    def onButton_MakeItSo_StopJob(self):
+        """ Stop the job selected in the jobs table.  The other jobs keep
+            running.
+        """
+        job = self.makeItSo_SelectedJob()
+        if (job is None or not job.isActive):
             return
 
-        commandLines, chaptersFilenames = self.MakeCommandLines(matchingTitles.matchingTitles)
+        self.resultsHtml.appendParagraph('Job {} canceled by user'.format(job.jobNumber),
+            'c2', self.transcodingLog)
+        self.transcodingQueue.stopJob(job)
+
+    def onMakeItSo_Jobs_ItemSelectionChanged(self):
+        """ Enable the "Stop Job" button when the selected job can be stopped.
+        """
+        job = self.makeItSo_SelectedJob()
+        self.pushButton_MakeItSo_StopJob.setEnabled(job is not None and job.isActive)
 
-        self.transcodingStartTime = datetime.datetime.now()
-        self.transcodingWaitCursor = QWaitCursor()
-        self.transcodingCommandsDeque = deque(commandLines)
-        # self.transcodingCommandsDeque = deque(['./TestFiles/countdown -c 20', './TestFiles/countdown -c 15', './TestFiles/countdown -c 4'])
+        self.makeItSo_PauseToWidgets()
 
-        self.transcodingChaptersFilenames = chaptersFilenames
-        self.transcodingLog = None
-        if (self.preferences.logging.commandsAndTimestamps):
-            self.transcodingLog = SingletonLog()
+    def makeItSo_PauseToWidgets(self):
+        """ Update the text and enabled state of the pause buttons.
+        """
+        queue = self.transcodingQueue
+        job = self.makeItSo_SelectedJob()
 
-        self.statusBar.showMessage('Transcoding...')
-        self.resultsHtml.appendParagraph('TRANSCODING', 'c0', self.transcodingLog)
+        self.pushButton_MakeItSo_Pause.setEnabled(queue is not None and queue.canPause)
+        if (queue is not None and queue.isPaused):
+            self.pushButton_MakeItSo_Pause.setText('Resume')
+        else:
+            self.pushButton_MakeItSo_Pause.setText('Pause')
 
-        self.resultsHtml.appendParagraph('Transcoding start @ {}'.format(
-            self.transcodingStartTime.strftime('%x %X')), 'c1',
-            self.transcodingLog)
+        self.pushButton_MakeItSo_PauseJob.setEnabled(job is not None and job.isStarted
+            and queue.canPause)
+        if (job is not None and job.isPaused):
+            self.pushButton_MakeItSo_PauseJob.setText('Resume Job')
+        else:
+            self.pushButton_MakeItSo_PauseJob.setText('Pause Job')
 
-        self.enableDiscWidgets(False)
-        self.stackedWidget_MakeItSo.setCurrentIndex(1)
+    def makeItSo_JobToTable(self, job):
+        """ Update the jobs table row for a transcoding job.
+        """
+        row = job.jobNumber - 1
 
-        self.__transcode_nextTitle()
+        if (job.startTime is None):
+            startTime = ''
+        else:
+            startTime = job.startTime.strftime('%X')
 
-    def onButton_MakeItSo_Stop(self):
-        """ Stop transcoding because the user has cancelled it.
+        if (job.stopTime is None):
+            elapsed = ''
+        else:
+            elapsed = TimedeltaToString(job.elapsed)
+
+        if (job.isStarted and job.progress.hasProgress):
+            progress = '{:.1f} %  {:.1f} fps'.format(job.fraction * 100.0,
+                job.progress.averageFps)
+            if (job.remaining is not None):
+                progress += '  ETA {}'.format(TimedeltaToString(job.remaining))
+        elif (job.state == TranscodeJob.STATE_DONE):
+            progress = '100.0 %'
+        else:
+            progress = ''
+
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_JOB_NUMBER_COLUMN, job.jobNumber, data=job,
+            readOnly=True)
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_DISC_COLUMN, job.description,
+            textAlignment=None, readOnly=True)
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_STATE_COLUMN, job.state, readOnly=True)
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_PROGRESS_COLUMN, progress, readOnly=True)
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_START_COLUMN, startTime, readOnly=True)
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_ELAPSED_COLUMN, elapsed, readOnly=True)
+        AddItemToTableWidgetCell(self.tableWidget_MakeItSo_Jobs, row,
+            self.TABLE_MAKEITSO_JOBS_COMMAND_COLUMN, job.command,
+            textAlignment=None, readOnly=True)
+
+    def makeItSo_JobsToTable(self):
+        """ Load the jobs table from the transcoding queue.
         """
-        self.resultsHtml.appendParagraph('Transcoding canceled by user', 'c0', self.transcodingLog)
-        self.transcodingCommandsDeque.clear()
-        self.transcodingProcess.kill()
-        # __transcode_complete() is called by onTranscoding_errorOccurred() which is triggered by kill()
+        self.tableWidget_MakeItSo_Jobs.clearContents()
+        self.tableWidget_MakeItSo_Jobs.setRowCount(len(self.transcodingQueue))
 
-    def __transcode_nextTitle(self):
-        """ Start the next transcoding command on the stack.
+        for job in self.transcodingQueue.jobs:
+            self.makeItSo_JobToTable(job)
 
-            * Create an new transcoding process and connect the signals.
-            * Pop the next transcoding command from the stack and generate the command line.
-            * Tell the user what we're doing.
-            * Start the process.
+        self.tableWidget_MakeItSo_Jobs.resizeColumnsToContents()
+        self.onMakeItSo_Jobs_ItemSelectionChanged()
+
+    def makeItSo_ProgressToWidgets(self):
+        """ Update the queue progress bar and the queue ETA.
+        """
+        self.progressBar_MakeItSo_Progress.setValue(int(self.transcodingQueue.fraction
+            * self.progressBar_MakeItSo_Progress.maximum()))
+
+        eta = self.transcodingQueue.eta
+        if (self.transcodingQueue.isPaused):
+            self.label_MakeItSo_ETA.setText('ETA: paused')
+        elif (eta is None):
+            self.label_MakeItSo_ETA.setText('ETA: estimating...')
+        else:
+            finishTime = datetime.datetime.now() + eta
+            self.label_MakeItSo_ETA.setText('ETA: {}  (finish @ {})'.format(
+                TimedeltaToString(eta), finishTime.strftime('%x %X')))
+
+    def makeItSo_SelectedJob(self):
+        """ Return the job selected in the jobs table or None.
         """
+        if (self.transcodingQueue is None):
+            return None
 
-        self.transcodingProcess = QProcess(QApplication.instance())
-        self.transcodingProcess.errorOccurred.connect(self.onTranscoding_errorOccurred)
-        self.transcodingProcess.finished.connect(self.onTranscoding_finished)
-        self.transcodingProcess.readyReadStandardError.connect(self.onTranscoding_readyReadStandardError)
-        self.transcodingProcess.readyReadStandardOutput.connect(self.onTranscoding_readyReadStandardOutput)
+        selectedItems = self.tableWidget_MakeItSo_Jobs.selectedItems()
+        if (not selectedItems):
+            return None
 
-        command = self.transcodingCommandsDeque.popleft()
-        commandLine = '{} {}'.format(self.preferences.executables.handBrakeCLI,
-            command)
+        return self.tableWidget_MakeItSo_Jobs.item(selectedItems[0].row(),
+            self.TABLE_MAKEITSO_JOBS_JOB_NUMBER_COLUMN).data(Qt.UserRole)
 
-        self.trancodingTitleStartTime = datetime.datetime.now()
-        self.resultsHtml.appendParagraph('Title start @ {}'.format(
-            self.trancodingTitleStartTime.strftime('%x %X')), 'c2',
-            self.transcodingLog)
-        self.resultsHtml.appendParagraph(commandLine, 'c3', self.transcodingLog)
+    def onTranscoding_jobStarted(self, job):
+        """ This method is called by the transcoding queue when a HandBrakeCLI
+            process is started.
+        """
+        self.resultsHtml.appendParagraph('Job {} start @ {}'.format(job.jobNumber,
+            job.startTime.strftime('%x %X')), 'c2', self.transcodingLog)
+        self.resultsHtml.appendParagraph(job.commandLine, 'c3', self.transcodingLog)
 
-        self.transcodingProcess.start(commandLine)
+        self.makeItSo_JobToTable(job)
+        self.onMakeItSo_Jobs_ItemSelectionChanged()
 
-    def __transcode_complete(self):
-        """ This method is called by the transcoding QProcess when HandBrakeCLI
-            finishes transcoding a title.
+    def onTranscoding_jobPausedChanged(self, job):
+        """ This method is called by the transcoding queue when a job is
+            paused or resumed.
+        """
+        self.makeItSo_JobToTable(job)
+        self.makeItSo_ProgressToWidgets()
+        self.makeItSo_PauseToWidgets()
 
-            * Tell the user transcoding has finished.
-            * Start the next transcoding job, if one exists.
+    def onTranscoding_jobProgress(self, job):
+        """ This method is called by the transcoding queue when HandBrakeCLI
+            reports progress for a job.
+        """
+        self.makeItSo_JobToTable(job)
+        self.makeItSo_ProgressToWidgets()
 
-            If we're done:
-            * Enable the controls.
-            * Tell the user we're done.
-            * Clear the transcoding attributes.
+    def onTranscoding_jobFinished(self, job):
+        """ This method is called by the transcoding queue when a job is
+            finished, failed, or stopped.
         """
+        if (job.error is not None and job.state != TranscodeJob.STATE_STOPPED):
+            self.resultsHtml.appendParagraph('A process error has occured: {}'.format(
+                TranslateProcessError(job.error)), 'c3', self.transcodingLog)
+        if (job.exitCode):
+            self.resultsHtml.appendParagraph(('WARNING!  Handbrake has '
+                'finished with error code {}!').format(job.exitCode), 'c0',
+                self.transcodingLog)
 
-        titleStopTime = datetime.datetime.now()
-        self.resultsHtml.appendParagraph(('Title finished @ {}'
-            '&ensp;&ensp;&#10148;&#10148;&#10148;&ensp;&ensp;'
-            'Elapsed time {}').format(titleStopTime.strftime('%x %X'),
-            TimedeltaToString(titleStopTime - self.trancodingTitleStartTime)),
-            'c2', self.transcodingLog)
+        if (job.stopTime is None):
+            self.resultsHtml.appendParagraph('Job {} {}'.format(job.jobNumber,
+                job.state.lower()), 'c2', self.transcodingLog)
+        else:
+            self.resultsHtml.appendParagraph(('Job {} {} @ {}'
+                '&ensp;&ensp;&#10148;&#10148;&#10148;&ensp;&ensp;'
+                'Elapsed time {}').format(job.jobNumber, job.state.lower(),
+                job.stopTime.strftime('%x %X'), TimedeltaToString(job.elapsed)),
+                'c2', self.transcodingLog)
 
-        if (self.transcodingCommandsDeque and len(self.transcodingCommandsDeque)):
-            self.__transcode_nextTitle()
-            return
+        self.makeItSo_JobToTable(job)
+        self.makeItSo_ProgressToWidgets()
+        self.onMakeItSo_Jobs_ItemSelectionChanged()
+
+    def onTranscoding_queueFinished(self):
+        """ This method is called by the transcoding queue when the last job
+            has finished.
 
+            * Tell the user we're done, with the total times.
+            * Clear the transcoding attributes.
+        """
         self.stackedWidget_MakeItSo.setCurrentIndex(0)
-        self.enableDiscWidgets(True)
 
-        stopTime = datetime.datetime.now()
         self.resultsHtml.appendParagraph(('Transcoding finished @ {}'
             '&ensp;&ensp;&#10148;&#10148;&#10148;&ensp;&ensp;'
-            'Elapsed time {}').format(stopTime.strftime('%x %X'),
-            TimedeltaToString(stopTime - self.transcodingStartTime)), 'c1',
+            'Elapsed time {}').format(self.transcodingQueue.stopTime.strftime('%x %X'),
+            TimedeltaToString(self.transcodingQueue.elapsed)), 'c1',
+            self.transcodingLog)
+        self.resultsHtml.appendParagraph(('{} done, {} failed, {} stopped'
+            '&ensp;&ensp;&#10148;&#10148;&#10148;&ensp;&ensp;'
+            'Total job time {}').format(
+            self.transcodingQueue.countJobs(TranscodeJob.STATE_DONE),
+            self.transcodingQueue.countJobs(TranscodeJob.STATE_FAILED),
+            self.transcodingQueue.countJobs(TranscodeJob.STATE_STOPPED),
+            TimedeltaToString(self.transcodingQueue.totalJobTime)), 'c1',
             self.transcodingLog)
 
-        self.transcodingStartTime = None
-        del self.transcodingWaitCursor
-        self.transcodingWaitCursor = None
-        self.transcodingCommandsDeque = None
-        self.transcodingChaptersFilenames.unlink()
+        for chaptersFilenames in self.transcodingChaptersFilenames:
+            chaptersFilenames.unlink()
+        self.transcodeCommandCache.purge()
         self.transcodingChaptersFilenames = None
         self.transcodingLog = None
-        self.transcodingProcess = None
+        self.transcodingQueue.deleteLater()
+        self.transcodingQueue = None
+
+        self.onMakeItSo_Jobs_ItemSelectionChanged()
 
         self.resultsHtml.appendParagraph('&nbsp;', 'c1')
         QApplication.beep()
@@ -2259,14 +2434,19 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             self.resultsHtml.appendParagraph('Encoding starting @ {}'.format(
                 startTime.strftime('%x %X')), 'c1', log)
 
-            commandLines, chaptersFilenames = self.MakeCommandLines(matchingTitles.matchingTitles)
-            for commandLine in commandLines:
+            commands, chaptersFilenames = TranscodeCommandBuilder(self.preferences,
+                self.disc, self.transcodeCommandCache).makeCommandLines(matchingTitles.matchingTitles)
+            if (self.transcodingQueue is None):
+                self.transcodeCommandCache.purge()
+
+            for command in commands:
 
                 titleStartTime = datetime.datetime.now()
                 self.resultsHtml.appendParagraph('Title starting @ {}'.format(
                     titleStartTime.strftime('%x %X')), 'c2', log)
 
-                self.resultsHtml.appendParagraph('{} {}'.format(self.preferences.executables.handBrakeCLI, commandLine), 'c3', log)
+                self.resultsHtml.appendParagraph(ArgumentsToString(
+                    [self.preferences.executables.handBrakeCLI] + command.arguments), 'c3', log)
                 # if (runCLI):
                 #     app.RunHbcli(commandLine, False)
                 # else:
@@ -2292,45 +2472,6 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         self.statusBar.showMessage('Preview complete.', 15000)
 
-    def onTranscoding_errorOccurred(self, error):
-        """ This method is called by the transcoding process when the
-            HandBrakeCLI crashes or is cancelled by the user.
-        """
-        self.resultsHtml.appendParagraph('A process error has occured: {}'.format(
-            TranslateProcessError(error)), 'c3', self.transcodingLog)
-
-        self.__transcode_complete()
-
-    def onTranscoding_finished(self, exitCode, exitStatus):
-        """ This method is called by the transcoding process when the
-            HandBrakeCLI completes without crashing or being killed.
-        """
-        if (exitCode):
-            self.resultsHtml.appendParagraph(('WARNING!  Handbrake has '
-                'finished with error code {}!').format(exitCode), 'c0',
-                self.transcodingLog)
-
-        if (exitStatus == QProcess.NormalExit):
-            self.__transcode_complete()
-
-    def onTranscoding_readyReadStandardError(self):
-        """ This method is called by the transcoding process when the
-            HandBrakeCLI writes to the standard error output.
-
-            Echo the output from the HandBrakeCLI to the console stderr.
-        """
-        sys.stderr.buffer.write(self.transcodingProcess.readAllStandardError())
-        sys.stderr.flush()
-
-    def onTranscoding_readyReadStandardOutput(self):
-        """ This method is called by the transcoding process when the
-            HandBrakeCLI writes to the standard output.
-
-            Echo the output from the HandBrakeCLI to the console stdout.
-        """
-        sys.stdout.buffer.write(self.transcodingProcess.readAllStandardOutput())
-        sys.stdout.flush()
-
     def discTitle_AudioTrackStatesToWidgets(self, title):
         """ Transfer the title data to the title audio track state widgets on
             the Audio Tracks tab.
@@ -2505,16 +2646,10 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     #         chapters radio button.
     #     """
 
-    def onDisc_Titles_ItemChanged(self, item):
-        """ Triggered when the data of item is changed.
+    def onDisc_Titles_Renamed(self, title):
+        """ Triggered when the user changes the name of a title.
         """
-        if (item.column() != self.TABLE_DISC_TITLES_TITLE_NAME_COLUMN):
-            return
-
-        checkBox = self.tableWidget_Disc_Titles.cellWidget(item.row(),
-            self.TABLE_DISC_TITLES_SELECT_COLUMN).findChild(QCheckBox,
-            'checkBox_DiscTitle_SelectTitle')
-        if (not checkBox.isChecked()):
+        if (not title.selected):
             return
 
         self.onUpdateSampleFilename()
@@ -2529,10 +2664,11 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     #     if (previousItem):
     #         print ('previous', previousItem.row())
 
-    def onDisc_Titles_Checked(self, checked=False):
+    def onDisc_Titles_Checked(self, title=None):
         """ Triggered when a title checkbox is clicked.
         """
         self.enableWidgets_HasSelectedTitle()
+        self.onUpdateSampleFilename()
 
     def onDisc_Titles_ItemSelectionChanged(self):
         """ Triggered when a new title is selected.
@@ -2540,11 +2676,11 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.__titleDetailsFromWidgets()
         self.onDisc_Titles_EnableWidgets()
 
-        currentItem = self.tableWidget_Disc_Titles.currentItem()
-        if (currentItem is None):       # This will be None if we're here because the selected row was deleted.
+        currentIndex = self.tableView_Disc_Titles.currentIndex()
+        if (not currentIndex.isValid()):        # This will be invalid if we're here because the selected row was deleted.
             return
 
-        title = self.tableWidget_Disc_Titles.item(currentItem.row(), 0).data(Qt.UserRole)
+        title = currentIndex.data(Qt.UserRole)
         self.__titleDetailsToWidgets(title)
 
     def onUpdateSampleFilename(self, parameter=None):
@@ -2560,6 +2696,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         titleText, title = self.firstSelectedVisibleTitleInTitlesWidget()
         if (not titleText):
             return
+        self.__lazyTitleDetails.materialize(title)
 
         episodeTitle = ''
         if (title.chapterRanges.processChoice == ChapterRanges.PROCESS_EPISODES
@@ -2612,21 +2749,11 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         """ Return the row and title for the first, selected, visible title in
             the titles tableWidget.  Return None if nothing meets the requirements.
         """
-        firstVisibleRow = None
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            title = self.tableWidget_Disc_Titles.item(row, 0).data(Qt.UserRole)
-            if (not title.visible):
-                continue
-
-            checkBox = self.tableWidget_Disc_Titles.cellWidget(row,
-                self.TABLE_DISC_TITLES_SELECT_COLUMN).findChild(QCheckBox,
-                'checkBox_DiscTitle_SelectTitle')
-            if (not checkBox.isChecked()):
-                continue
-
-            return (self.tableWidget_Disc_Titles.item(row, self.TABLE_DISC_TITLES_TITLE_NAME_COLUMN).text(), title)
+        title = self.__titlesTableModel.firstSelectedVisibleTitle
+        if (title is None):
+            return (None, None)
 
-        return (None, None)
+        return (title.title, title)
 
     def disc_Titles_GetVerticalHeadersVisible(self):
         """ Returns a named tupple:
@@ -2634,20 +2761,13 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
                 Visual index of last visible row
                 Visual index of current row
         """
+        # Hidden titles aren't rows of the view, every row is visible.
         firstVisibleIndex = sys.maxsize
-        lastVisibleIndex = -1
-
-        for idx in range(self.tableWidget_Disc_Titles.verticalHeader().count()):
-            if (self.tableWidget_Disc_Titles.verticalHeader().isSectionHidden(idx)):
-                continue
+        lastVisibleIndex = self.__visibleTitlesModel.rowCount() - 1
+        if (lastVisibleIndex >= 0):
+            firstVisibleIndex = 0
 
-            visualIndex = self.tableWidget_Disc_Titles.verticalHeader().visualIndex(idx)
-
-            firstVisibleIndex = min(firstVisibleIndex, visualIndex)
-            lastVisibleIndex = max(lastVisibleIndex, visualIndex)
-
-        row = self.tableWidget_Disc_Titles.currentRow()
-        currentRowVisualIndex = self.tableWidget_Disc_Titles.verticalHeader().visualIndex(row)
+        currentRowVisualIndex = self.tableView_Disc_Titles.currentIndex().row()
 
         return VerticalHeadersVisible(firstVisibleIndex, lastVisibleIndex, currentRowVisualIndex)
 
@@ -2665,6 +2785,8 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     def __titleDetailsToWidgets(self, title):
         """ Update the title detail widgets from the title.
         """
+        self.__lazyTitleDetails.materialize(title)
+
         # Update the title details table.
         # ======================================================================
         self.tableWidget_DiscTitle_Title.item(0, 0).setData(Qt.UserRole, title)
@@ -2938,12 +3060,21 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         self.onUpdateSampleFilename()
 
-    def __loadSession(self, sessionFilename):
-        """ Load the session information from a saved session file.
+    def __loadSession(self, sessionFilename, source=None):
+        """ Load the session information from a saved session file.  If the
+            source is given it replaces the source saved in the session, e.g.
+            when the disc has been copied to another folder.
         """
+        # A running scan would replace the session's titles when it finishes.
+        # Clear the scanned titles first, so the canceled scan doesn't clear
+        # the session when it ends.
+        if (self.sourceScanner.isRunning):
+            self.__clearScannedTitles()
+            self.sourceScanner.cancel()
+
         self.widgetValidators.clearHighlights()
 
-        doc = minidom.parse(sessionFilename)
+        doc = XMLDocument.Parse(sessionFilename)
 
         if (doc.documentElement.nodeName != self.STATE_FILES_DOCUMENT_ROOT):
             raise RuntimeError('The session state file does not seem to be an HEP session file!')
@@ -2952,9 +3083,23 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         if (self.preferences.discSession.keepDestination):
             destinationOverride = self.lineEdit_Disc_Destination.text().strip()
 
+        self.__lazyTitleDetails.clear()
+
         for childNode in doc.documentElement.childNodes:
             if (childNode.localName == self.disc.XMLNAME):
-                self.disc.fromXML(childNode, destinationOverride)
+                # Build only the title summaries, the details are built when
+                # they are needed.  If the titles and their elements can't be
+                # paired up, load the whole session after all.
+                if (self.preferences.discSession.loadTitleDetailsOnDemand):
+                    self.__lazyTitleDetails.strip(childNode)
+                    self.disc.fromXML(childNode, destinationOverride)
+                    if (not self.__lazyTitleDetails.attach(list(self.disc.titles.titlesByOrderNumber.values()))):
+                        self.disc.fromXML(self.__readDiscElement(sessionFilename), destinationOverride)
+                else:
+                    self.disc.fromXML(childNode, destinationOverride)
+
+                if (source):
+                    self.disc.source = source
 
             # elif (childNode.localName == AppState.ApplicationState.XMLName()):
             #     self.applicationState.fromXML(childNode)
@@ -2984,58 +3129,389 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         self.statusBar.showMessage('Session loaded from "{}".'.format(sessionFilename), 15000)
         QApplication.beep()
 
-    def __readSource(self):
-        """ Read the disc with Handbrake from the source with HandBrake, then
-            parse the disc information.
+    def __readDiscElement(self, sessionFilename):
+        """ Return the disc element of a session file.
+        """
+        doc = XMLDocument.Parse(sessionFilename)
+        for childNode in doc.documentElement.childNodes:
+            if (childNode.localName == self.disc.XMLNAME):
+                return childNode
+
+        return None
 
-            Returns True if the source was successfully read.
+    def __readSource(self, forceRescan=False):
+        """ Start reading the disc with HandBrake.  The scan runs in the
+            background, onSourceScan_Finished() parses the disc information.
+
+            If the source hasn't changed since it was last scanned the scan
+            is read from the scan cache instead, unless forceRescan is True.
+
+            If the disc fingerprint shows that the disc has a hash session,
+            the user can load the session without scanning the disc at all.
         """
         self.widgetValidators.clearHighlights()
 
-        with QWaitCursor():
-            parameters = ['-t', '0']
+        self.sourceDiscFingerprint = SessionFingerprints.fingerprint(self.lineEdit_Disc_Source.text())
+        self.__declinedHashSession = None
+
+        if (not forceRescan):
+            discHash = QApplication.instance().sessionFingerprints.get(self.sourceDiscFingerprint)
+            if (discHash):
+                filename = self.getHashSessionPath(discHash)
+                if (os.path.exists(filename)):
+                    result = QMessageBox.question(self, 'Load Automatic Session?',
+                        'An automatic session file exist for this video.  Do you want to load it?')
+                    if (result == QMessageBox.Yes):
+                        self.__loadSession(filename, self.lineEdit_Disc_Source.text())
+                        return
+
+                    self.__declinedHashSession = filename
+
+        parameters = ['-t', '0']
+
+        if (self.checkBox_Disc_NoDVDNAV.isChecked()):
+            parameters.append('--no-dvdnav')
+
+        parameters.append('-i')
+        parameters.append(self.lineEdit_Disc_Source.text())
+
+        self.__scannedTitles = None
+        self.__shownScannedTitles = None
+        self.__scannedTitlesTimer.setInterval(self.SCANNED_TITLES_INTERVAL)
+        self.sourceScanFingerprint = None
+        if (self.preferences.newSource.useScanCache):
+            self.sourceScanFingerprint = ScanCache.fingerprint(self.lineEdit_Disc_Source.text(),
+                self.preferences.executables.handBrakeCLI, parameters)
+
+        if (not forceRescan):
+            out = QApplication.instance().scanCache.get(self.sourceScanFingerprint)
+            if (out is not None):
+                self.__parseSource(out, 'Source folder "{}" was read from the scan cache.'.format(self.disc.source))
+                return
 
-            if (self.checkBox_Disc_NoDVDNAV.isChecked()):
-                parameters.append('--no-dvdnav')
+        # The old titles are gone, the new ones are shown as they are scanned.
+        self.__transferToDiscTables()
 
-            parameters.append('-i')
-            parameters.append(self.lineEdit_Disc_Source.text())
+        self.sourceScanner.maximumJobs = self.preferences.newSource.scanJobs
+        self.sourceScanner.start(self.preferences.executables.handBrakeCLI, parameters)
 
-            process = QProcess(QApplication.instance())
-            process.start(self.preferences.executables.handBrakeCLI, parameters)
-            # process.start(self.preferences.executables.handBrakeCLI, ['-t', '0', '-i', self.lineEdit_Disc_Source.text()])
+        self.enableWidgets_SourceScan(True)
+        self.statusBar.showMessage('Reading source "{}"...'.format(self.lineEdit_Disc_Source.text()))
 
-            if (not process.waitForStarted()):
-                QMessageBox.critical(self, 'Run Error',
-                    'An error has occurred while running HandBrake.\nHandBrakeCLI did not start.')
-                return False
+        # Show the titles from the IFO files while HandBrake scans the disc.
+        # The HandBrake titles replace them when the scan is finished.
+        self.__ifoTitlesShown = False
+        if (self.preferences.newSource.readIfoFiles):
+            try:
+                self.__scannedTitles = IfoReader(self.lineEdit_Disc_Source.text()).scanText()
+            except IfoError as exception:
+                sys.stderr.write('{}\n'.format(exception))
+            else:
+                self.__showScannedTitles()
+                self.__ifoTitlesShown = True
 
-            if (not process.waitForFinished()):
-                QMessageBox.critical(self, 'Run Error',
-                    'An error has occurred while running HandBrake.\nHandBrakeCLI did not finish.')
-                return False
+    def enableWidgets_SourceScan(self, scanning):
+        """ Show the scan progress and the cancel button while a source is
+            being read.  A second scan can't be started until the first one
+            is finished.
+        """
+        self.progressBar_SourceScan.setValue(0)
+        self.progressBar_SourceScan.setVisible(scanning)
+        self.pushButton_SourceScan_Cancel.setVisible(scanning)
+
+        self.actionBrowse_for_Video.setEnabled(not scanning)
+        self.actionRescan_Video.setEnabled(not scanning)
+        self.pushButton_Disc_Source_Browse.setEnabled(not scanning)
+        self.toolButton_Disc_Source_Read.setEnabled(not scanning)
+
+        # The scan replaces the titles when it's finished, so a session can't
+        # be loaded while it's running.
+        self.actionOpen_Session.setEnabled(not scanning)
+        self.actionOpen_Hash_Session.setEnabled(not scanning)
+        self.actionFind_Session.setEnabled(not scanning)
+        self.actionRecent_Disc_Sessions.setEnabled(not scanning)
+        self.menuOpen_Recent.setEnabled(not scanning)
+
+    def onSourceScan_Canceled(self):
+        self.enableWidgets_SourceScan(False)
+        self.__clearScannedTitles()
+        self.statusBar.showMessage('Reading source "{}" was canceled.'.format(self.disc.source), 15000)
+
+    def onSourceScan_Failed(self, message, out):
+        """ Called when HandBrake didn't start, crashed or returned an error.
+        """
+        self.enableWidgets_SourceScan(False)
+        self.__clearScannedTitles()
+        self.__logSourceScan(out)
 
-            # Don't know why but HandBrake returns the results on StandardError not StandardOutput (linux)
-            out = bytearray(process.readAllStandardError()).decode('ISO-8859-1')
+        QMessageBox.critical(self, 'Run Error',
+            'An error has occurred while running HandBrake.\n{}\n{}'.format(message, out))
+        self.statusBar.clearMessage()
 
-            if (self.preferences.logging.analysis):
-                log = SingletonLog()
-                log.writeline('{} {}'.format(self.preferences.executables.handBrakeCLI, ' '.join(parameters)))
-                log.write(out)
+    def onSourceScan_Finished(self, out):
+        """ Store the scan results in the scan cache, then parse them.
+        """
+        self.enableWidgets_SourceScan(False)
+        self.__logSourceScan(out)
 
-            if (process.exitCode() != 0):
-                QMessageBox.critical(self, 'Run Error',
-                    ('An error has occurred while running HandBrake.\n'
-                    'Exit code = {}\n{}').format(process.exitCode(), out))
-                return False
+        scanCache = QApplication.instance().scanCache
+        scanCache.maximumBytes = self.preferences.newSource.scanCacheMaximumMB * 1024 * 1024
+        scanCache.put(self.sourceScanFingerprint, out)
 
-            self.disc.parse(out)
+        self.__parseSource(out, 'Source folder "{}" was read.'.format(self.disc.source))
 
-            self.statusBar.showMessage('Source folder "{}" was read.'.format(self.lineEdit_Disc_Source.text()), 15000)
-            return True
+    def __parseSource(self, out, message):
+        """ Parse the scan results, then load the automatic session file or set
+            up the new source.  Titles selected or named while the source
+            was being scanned keep their selection and name.
+        """
+        titleSelections = None
+        if (self.__scannedTitles is not None):
+            titleSelections = self.__getTitleSelections()
+            self.__scannedTitles = None
+            self.__shownScannedTitles = None
+            self.__scannedTitlesTimer.stop()
+
+        self.__lazyTitleDetails.clear()
+        self.disc.parse(out)
+
+        QApplication.instance().sessionFingerprints.record(self.sourceDiscFingerprint,
+            self.disc.titles.hash)
+
+        self.statusBar.showMessage(message, 15000)
+
+        filename = self.getHashSessionPath(self.disc.titles.hash)
+        if (os.path.exists(filename) and filename != self.__declinedHashSession):
+            result = QMessageBox.question(self, 'Load Automatic Session?',
+                'An automatic session file exist for this video.  Do you want to load it?')
+            if (result == QMessageBox.Yes):
+                self.__loadSession(filename)
+                return
+
+        self.__onNewSource()
+
+        self.transferToWindow()
+
+        if (titleSelections is not None):
+            self.__setTitleSelections(titleSelections)
+
+    def onSourceScan_Progress(self, progress):
+        self.progressBar_SourceScan.setValue(int(progress.fraction
+            * self.progressBar_SourceScan.maximum()))
+        self.statusBar.showMessage('Reading source "{}", title {} of {}...'.format(
+            self.disc.source, progress.title, progress.titleCount))
+
+    def onSourceScan_TitlesScanned(self, out):
+        """ Show the titles scanned so far, unless the titles from the IFO
+            files are shown.  Those are complete, HandBrake's are not.
+        """
+        if (self.__ifoTitlesShown):
+            return
+
+        self.__scannedTitles = out
+        if (not self.__scannedTitlesTimer.isActive()):
+            self.__scannedTitlesTimer.start()
+
+    def __clearScannedTitles(self):
+        """ Remove the titles shown while a scan that didn't finish was
+            running.
+        """
+        self.__scannedTitlesTimer.stop()
+        self.__ifoTitlesShown = False
+        if (self.__scannedTitles is None):
+            return
+
+        self.__scannedTitles = None
+        self.__shownScannedTitles = None
+
+        source = self.disc.source
+        self.disc.clear()
+        self.disc.source = source
+
+        self.__transferToDiscTables()
+        self.enableWidgets_HasTitle()
+        self.enableWidgets_HasSelectedTitle()
+
+    def __getTitleSelections(self):
+        """ Return a tuple of a dictionary of (selected, name) tuples by title
+            number, and the number of the current title (or None).
+        """
+        selections = {}
+        for title in self.disc.titles.titlesByOrderNumber.values():
+            selections[title.titleNumber] = (title.selected, title.title)
+
+        currentTitleNumber = None
+        currentIndex = self.tableView_Disc_Titles.currentIndex()
+        if (currentIndex.isValid()):
+            currentTitleNumber = currentIndex.data(Qt.UserRole).titleNumber
+
+        return (selections, currentTitleNumber)
+
+    def __setTitleSelections(self, titleSelections):
+        """ Select and name the titles in the titles table the way they were
+            when __getTitleSelections() was called.  Titles that weren't
+            selected or named are left alone.
+        """
+        selections, currentTitleNumber = titleSelections
+
+        for title in self.__titlesTableModel.titles:
+            selected, name = selections.get(title.titleNumber, (False, ''))
+
+            if (selected):
+                title.selected = True
+            if (name):
+                title.title = name
+
+            row = self.getTitleRow(title)
+            if (title.titleNumber == currentTitleNumber and row is not None):
+                self.setCurrentTitleRow(row)
+
+        self.__titlesTableModel.refresh()
+
+        self.enableWidgets_HasSelectedTitle()
+        self.onUpdateSampleFilename()
+
+    def __showScannedTitles(self):
+        """ Show the titles scanned so far so the user can start selecting
+            titles before the scan is finished.
+        """
+        if (self.__scannedTitles is None or not self.sourceScanner.isRunning):
+            return
+
+        # No title was completed since the last update.
+        if (self.__scannedTitles == self.__shownScannedTitles):
+            return
+
+        started = time.monotonic()
+
+        titleSelections = self.__getTitleSelections()
+
+        self.__lazyTitleDetails.clear()
+        self.disc.parse(self.__scannedTitles)
+        self.__transferToDiscTables()
+        self.__shownScannedTitles = self.__scannedTitles
+
+        self.enableWidgets_HasTitle()
+        self.__setTitleSelections(titleSelections)
+
+        # Wait at least four times as long as the update took before the next
+        # one, so a disc with hundreds of titles spends most of the scan
+        # scanning instead of parsing the same titles again.
+        self.__scannedTitlesTimer.setInterval(max(self.SCANNED_TITLES_INTERVAL,
+            int((time.monotonic() - started) * 4000)))
+
+    def __logSourceScan(self, out):
+        if (self.preferences.logging.analysis):
+            log = SingletonLog()
+            log.writeline(ArgumentsToString([self.sourceScanner.program] + self.sourceScanner.arguments))
+            log.write(out)
+
+    def autosaveSnapshot(self):
+        """ Return the (filename, XMLDocument) to autosave, or None if there
+            is nothing to save.  The session goes to the automatic disc
+            session file if they are turned on, otherwise to the temporary
+            session file.  Unlike __saveSession() the window isn't validated.
+        """
+        if (__TESTING_DO_NOT_SAVE_SESSION__ or not self.disc.source
+            or not len(self.disc.titles) or self.sourceScanner.isRunning):
+            return None
+
+        self.transferFromWindow()
+
+        if (self.preferences.discSession.autoDiscSessions):
+            filename = self.getHashSessionPath(self.disc.titles.hash)
+        else:
+            filename = QApplication.instance().temporarySessionFilename
+
+        return (filename, self.__sessionDocument())
+
+    def __sessionDocument(self):
+        """ Return the session as an XMLDocument.  The details of the titles
+            that were never built are saved as they were loaded.
+        """
+        doc = XMLDocument.Document(self.STATE_FILES_DOCUMENT_ROOT)
+        self.disc.toXML(doc, doc.documentElement)
+
+        if (len(self.__lazyTitleDetails)):
+            titles = list(self.disc.titles.titlesByOrderNumber.values())
+            for childNode in doc.documentElement.childNodes:
+                if (childNode.localName == self.disc.XMLNAME):
+                    self.__lazyTitleDetails.restore(childNode, titles)
+
+        return doc
+
+    def onSessionAutosave_Failed(self, filename, message):
+        self.statusBar.showMessage('Unable to autosave the session to "{}": {}'.format(filename, message), 15000)
+
+    def onSessionAutosave_Saved(self, filename):
+        self.__indexSession(filename)
+        self.statusBar.showMessage('Session autosaved to "{}".'.format(filename), 3000)
+
+    def __indexSession(self, sessionFilename):
+        """ Record the current disc in the session index.  The temporary
+            session file is overwritten by every disc, so it isn't indexed.
+        """
+        if (SessionIndex.key(sessionFilename) == SessionIndex.key(QApplication.instance().temporarySessionFilename)):
+            return
+
+        try:
+            QApplication.instance().sessionIndex.record(SessionSummary(sessionFilename,
+                self.disc.titles.hash, self.disc.title, self.disc.sourceLabel,
+                self.disc.source, len(self.disc.titles), None))
+        except Exception as exception:
+            sys.stderr.write('Unable to index the session "{}": {}\n'.format(sessionFilename, exception))
+
+    def __openIndexedSession(self, caption, sessions):
+        """ Let the user pick one of the sessions and open it.
+        """
+        if (not sessions):
+            QMessageBox.information(self, caption, 'No sessions were found.')
+            return
+
+        items = ['{}  |  {}  |  {}  |  {}'.format(session.saved, session.discTitle or '(no title)',
+            session.volumeLabel or '(no label)', session.filename) for session in sessions]
+        item, ok = QInputDialog.getItem(self, caption, 'Saved  |  title  |  volume label  |  file',
+            items, 0, False)
+        if (not ok):
+            return
+
+        filename = sessions[items.index(item)].filename
+        if (not os.path.exists(filename)):
+            QApplication.instance().sessionIndex.remove(filename)
+            QMessageBox.critical(self, 'File Not Found',
+                'File "{}" was not found.'.format(filename))
+            return
+
+        self.__loadSession(filename)
+
+    def __syncSessionIndex(self, always):
+        """ Bring the session index up to date with the automatic session
+            folder.  Unless always is True this is only done when the index
+            was missing and has to be rebuilt.
+        """
+        index = QApplication.instance().sessionIndex
+        if (not always and not index.isNew):
+            return
+
+        updated = removed = 0
+        with QWaitCursor():
+            if (self.preferences.discSession.autoDiscSessions):
+                try:
+                    updated, removed = index.sync(self.preferences.discSession.autoDiscSessionsFolder,
+                        lambda filename: ReadSessionSummary(QApplication.instance(), filename),
+                        self.preferences.discSession.autoDiscSessionsPrefix)
+                except OSError as exception:
+                    QMessageBox.warning(self, 'Session Index',
+                        'Unable to read the automatic session folder: {}'.format(exception))
+            removed += index.removeOrphans()
+            index.markBuilt()
+
+        self.statusBar.showMessage('Session index: {} session(s) indexed, {} removed, {} in the index.'.format(
+            updated, removed, len(index)), 15000)
 
     def __saveSession(self, sessionFilename):
         """ Save the disc information and the disc state data to an xml file.
+            Returns False if the window has validation errors.
         """
         self.transferFromWindow()
 
@@ -3047,19 +3523,13 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
 
 
-        dom = minidom.getDOMImplementation()
-
-        doc = dom.createDocument(None, self.STATE_FILES_DOCUMENT_ROOT, None)
-        parentElement = doc.documentElement
-
-        self.disc.toXML(doc, parentElement)
+        doc = self.__sessionDocument()
 
         if (__TESTING_DO_NOT_SAVE_SESSION__):
             self.statusBar.showMessage('TESTING!!! Session was not saved to "{}".'.format(sessionFilename), 15000)
         else:
-            xmlFile = open(sessionFilename, "w")
-            doc.writexml(xmlFile, "", "\t", "\n")
-            xmlFile.close()
+            doc.write(sessionFilename)
+            self.__indexSession(sessionFilename)
 
             self.statusBar.showMessage('Session saved to "{}".'.format(sessionFilename), 15000)
             QApplication.beep()
@@ -3069,21 +3539,17 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         self.setCurrentFile(sessionFilename)
 
+        return True
+
     def onSignal_toggled_Disc_HideShortTitles(self, checked):
         """ Show/hide short titles.
         """
         TitleVisibleSingleton().hideShortTitles = checked
         self.disc.titles.refreshVisible()
 
-        firstVisibleRow = None
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            title = self.tableWidget_Disc_Titles.item(row, 0).data(Qt.UserRole)
-            self.tableWidget_Disc_Titles.setRowHidden(row, not title.visible)
-
-            if (firstVisibleRow is None and title.visible):
-                firstVisibleRow = row
-                self.tableWidget_Disc_Titles.setCurrentCell(row,
-                    self.TABLE_DISC_TITLES_TITLE_NUMBER_COLUMN)
+        self.__visibleTitlesModel.refresh()
+        if (self.__visibleTitlesModel.rowCount()):
+            self.setCurrentTitleRow(0)
 
         self.onDisc_Titles_EnableWidgets()
 
@@ -3092,72 +3558,15 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
         """
 
         self.__widgetDataConnectors.transferFromWidgets(groupFlags)
-        self.__titleSelection_widgetDataConnectors.transferFromWidgets()
         self.__titleDetailsFromWidgets()
 
     def __transferToDiscTables(self):
-        """ Copy the data from the disc titles to the disc titles table widget.
+        """ Show the disc titles in the disc titles table.
         """
+        self.__titlesTableModel.setTitles(self.disc.titles)
 
-        # Transfer the disc titles to the disc titles table.
-        # ======================================================================
-        self.tableWidget_Disc_Titles.setRowCount(0)     # remove all existing rows
-        self.tableWidget_Disc_Titles.setRowCount(len(self.disc.titles))     # add a row for each title
-
-        titleKeys = sorted(self.disc.titles.titlesByOrderNumber.keys())
-        row = 0
-        self.__titleSelection_widgetDataConnectors.clear()
-        for key in titleKeys:
-            title = self.disc.titles.titlesByOrderNumber[key]
-
-            item = QTableWidgetItem()
-            # item.setCheckState(BoolToQtChecked(title.selected))
-
-            widget = QWidget()
-            checkBox = QCheckBox()
-            checkBox.setObjectName('checkBox_DiscTitle_SelectTitle')
-            checkBox.setChecked(title.selected)
-            checkBox.clicked.connect(self.onDisc_Titles_Checked)
-            checkBox.clicked.connect(self.onUpdateSampleFilename)
-            layout = QHBoxLayout(widget)
-            layout.addWidget(checkBox, alignment=Qt.AlignCenter)
-            layout.setContentsMargins(0,0,0,0);
-            widget.setLayout(layout)
-            self.tableWidget_Disc_Titles.setCellWidget(row,
-                self.TABLE_DISC_TITLES_SELECT_COLUMN, widget)
-
-            self.__titleSelection_widgetDataConnectors.append(QCheckBoxDataConnector(
-                checkBox, title, 'selected', 0))
-
-            # Add an item behind the checkbox.  It's need to generate item change signals.
-            AddItemToTableWidgetCell(self.tableWidget_Disc_Titles, row,
-                self.TABLE_DISC_TITLES_SELECT_COLUMN,
-                None, data=title, readOnly=True)
-            AddItemToTableWidgetCell(self.tableWidget_Disc_Titles, row,
-                self.TABLE_DISC_TITLES_TITLE_NUMBER_COLUMN,
-                title.titleNumber, readOnly=True)
-            AddItemToTableWidgetCell(self.tableWidget_Disc_Titles, row,
-                self.TABLE_DISC_TITLES_DURATION_COLUMN,
-                title.duration, readOnly=True)
-            AddItemToTableWidgetCell(self.tableWidget_Disc_Titles, row,
-                self.TABLE_DISC_TITLES_ASPECT_COLUMN,
-                title.displayAspectRatio, readOnly=True)
-            item = AddItemToTableWidgetCell(self.tableWidget_Disc_Titles, row,
-                self.TABLE_DISC_TITLES_TITLE_NAME_COLUMN,
-                title.title, textAlignment=None)
-
-            self.__titleSelection_widgetDataConnectors.append(QTableWidgetItemDataConnector(
-                item, title, 'title', 0))
-
-            self.tableWidget_Disc_Titles.setRowHidden(row, not title.visible)
-
-            row += 1
-
-        for row in range(self.tableWidget_Disc_Titles.rowCount()):
-            if (not self.tableWidget_Disc_Titles.isRowHidden(row)):
-                self.tableWidget_Disc_Titles.setCurrentCell(row,
-                    self.TABLE_DISC_TITLES_TITLE_NUMBER_COLUMN)
-                break
+        if (self.__visibleTitlesModel.rowCount()):
+            self.setCurrentTitleRow(0)
 
     def transferToWindow(self, groupFlags=0):
         """ Copy the data from the preferences object to the dialog widgets.
@@ -3174,6 +3583,10 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             Data must be transfered from widgets to data objects first.
         """
 
+        # Validation and transcoding use the details of the selected titles.
+        self.__lazyTitleDetails.materializeAll(self.disc.titles.matchingTitles(
+            Titles.FLAG_SELECTED | Titles.FLAG_VISIBLE).matchingTitles)
+
         notValid = False
 
         try:
@@ -3192,13 +3605,13 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
             notValid |= (not self.validate_DiscTitles_SubtitleTrackStates())
 
             notValid |= (not self.validate_Disc_FilenameTemplate())
+            notValid |= (not self.validate_Disc_Preset())
 
         except UserDoNotContinueException:
             return False
 
         return (not notValid)
 
-    # TODO auto save sessions.
     # TODO Validate - only loop through the title list once during validation.
     # TODO need a way to highlight/clear fields/widgets.  Clearing the error is the hard part.
     # TODO resolve data transfer, enable/disable conflict between data/widget connectors and widget collection classes.
@@ -3207,9 +3620,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
     # TODO Refactor - Create a filename template class?
     # TODO add button (buttons?) in preferences dialog to reset stuff to their defaults.
     # TODO Route preview through makeItSo
-    # TODO Enhancement - Pause running transcode
     # TODO Enhancement - on process kill, delete partial file
-    # TODO set runtime priority for HandBrakeCLI
 
     def validate_Disc_AudioTrackStates(self):
         """ Check the disc level audio track states for the following:
@@ -3332,6 +3743,24 @@ class MyMainWindow(QMainWindow, Ui_MainWindow, QRecentFiles):
 
         return True
 
+    def validate_Disc_Preset(self):
+        """ Check that the settings of the selected preset can be split into
+            HandBrakeCLI arguments, e.g. there are no unmatched quotes.
+
+            Display an error message if an error is found.  Return True/False
+            if errors are found.
+        """
+        try:
+            self.preferences.presets.getByName(self.disc.preset).arguments
+        except ValueError as exception:
+            QMessageBox.warning(self, 'Preset Error',
+                ('Error!  The settings for preset "{}" can\'t be read: {}.'
+                '  Please fix the preset and try again.').format(
+                self.disc.preset, exception))
+            return False
+
+        return True
+
     def validate_Disc_SubtitleTrackStates(self):
         """ Check the disc level subtitle track states for the following:
 
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# =============================================================================
+# A record of the output files that have been transcoded successfully.  Each
+# output file is stored with the fingerprint of the command that made it (see
+# TranscodeCommandBuilder.makeFingerprint()) and the size and modification
+# time the file had when the job finished.
+#
+# A command is skipped if its output file is in the index with the same
+# fingerprint and the file hasn't changed since it was written.  A changed
+# preset, source, chapter name, etc. changes the fingerprint and the file is
+# transcoded again.  So does a missing, truncated or touched output file.
+#
+# The index is an SQLite database shared by the GUI and the batch runs, which
+# may be transcoding at the same time.  Every job is a row of its own, so no
+# run overwrites the outputs recorded by another, and each run sees the
+# outputs the others recorded.
+#
+# Recording an output doesn't look at the other outputs, which are often on a
+# network share.  The outputs that no longer exist are only removed when the
+# user asks for it (Tools menu, see removeMissing()).
+# =============================================================================
+
+import os, os.path, sqlite3
+
+class OutputIndexEntry(object):
+    """ The fingerprint, size and modification time of one output file.
+    """
+
+    def __init__(self, fingerprint, size, mtime):
+        self.fingerprint = fingerprint
+        self.size = size
+        self.mtime = mtime
+
+    def __str__(self):
+        return 'OutputIndexEntry: {}, {} bytes, mtime {}'.format(self.fingerprint,
+            self.size, self.mtime)
+
+class OutputIndex(object):
+    """ Read and write the index of transcoded output files.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outputs (
+            filename TEXT PRIMARY KEY,
+            fingerprint TEXT,
+            size INTEGER,
+            mtime INTEGER);
+        """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(self.SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM outputs').fetchone()[0]
+
+    def __str__(self):
+        return 'OutputIndex: "{}", {} output(s)'.format(self.filename, len(self))
+
+    @classmethod
+    def key(cls, outputFilename):
+        return os.path.normcase(os.path.abspath(outputFilename))
+
+    def close(self):
+        self.connection.close()
+
+    def entry(self, outputFilename):
+        """ Return the OutputIndexEntry of an output file, or None.
+        """
+        row = self.connection.execute('SELECT fingerprint, size, mtime FROM outputs WHERE filename = ?',
+            (self.key(outputFilename),)).fetchone()
+        if (row is None):
+            return None
+
+        return OutputIndexEntry(*row)
+
+    def isUnchanged(self, outputFilename, fingerprint):
+        """ Return True if the output file was made by a command with the same
+            fingerprint and hasn't changed since.
+        """
+        if (not outputFilename or not fingerprint):
+            return False
+
+        entry = self.entry(outputFilename)
+        if (entry is None or entry.fingerprint != fingerprint):
+            return False
+
+        try:
+            stat = os.stat(outputFilename)
+        except OSError:
+            return False
+
+        return (stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime)
+
+    def partition(self, commands):
+        """ Split a list of TranscodeCommand tuples into a tuple of two lists:
+            the commands that have to be run and the commands whose output is
+            unchanged.
+        """
+        changed = []
+        unchanged = []
+
+        for command in commands:
+            if (self.isUnchanged(command.outputFilename, command.fingerprint)):
+                unchanged.append(command)
+            else:
+                changed.append(command)
+
+        return (changed, unchanged)
+
+    def record(self, outputFilename, fingerprint):
+        """ Record a successfully transcoded output file.  Nothing is recorded
+            if the output file doesn't exist.
+        """
+        try:
+            stat = os.stat(outputFilename)
+        except OSError:
+            return
+
+        try:
+            with self.connection:
+                self.connection.execute('INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?)',
+                    (self.key(outputFilename), fingerprint, stat.st_size, stat.st_mtime_ns))
+        except sqlite3.Error as exception:
+            raise OSError(str(exception))
+
+    def removeMissing(self):
+        """ Remove the output files that no longer exist.  Outputs whose
+            folder is missing are kept, the folder may be on a share that
+            isn't mounted.  Returns the number removed.
+        """
+        missing = [(filename,) for filename, in self.connection.execute('SELECT filename FROM outputs')
+            if (not os.path.exists(filename) and os.path.isdir(os.path.dirname(filename)))]
+
+        with self.connection:
+            self.connection.executemany('DELETE FROM outputs WHERE filename = ?', missing)
+
+        return len(missing)
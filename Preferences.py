@@ -16,13 +16,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import os, os.path, sys, xml.dom, xml.dom.minidom as minidom
+import io, os, os.path, pickle, shlex, sys
 
 from collections import MutableSequence
 
 sys.path.insert(0, '../Helpers')
 
+import XMLDocument
 import XMLHelpers
+from ProcessPriority import ProcessPriority
 from SingletonLog import SingletonLog
 
 class Executables(object):
@@ -79,6 +81,79 @@ class Executables(object):
 
         return element
 
+class Transcoding(object):
+    """ Stores the information about how transcoding jobs are run.
+    """
+    XMLNAME = 'Transcoding'
+
+    DEFAULT_MAXIMUM_JOBS = 1
+    DEFAULT_SKIP_UNCHANGED_OUTPUTS = True
+    DEFAULT_NICE_LEVEL = 10
+    DEFAULT_IO_CLASS = ProcessPriority.IO_CLASS_NONE
+    DEFAULT_CPU_AFFINITY = False
+    DEFAULT_CPU_LIST = ''
+
+    MINIMUM_JOBS = 1
+    MAXIMUM_JOBS = 64
+
+    MINIMUM_NICE_LEVEL = 0
+    MAXIMUM_NICE_LEVEL = 19
+
+    def __init__(self, parent):
+        self.__parent = parent
+        self.clear()
+
+    def __str__(self):
+        return ('{}: maximum jobs={}, skip unchanged outputs={}, nice level={}, '
+            'I/O class="{}", CPU affinity={}, CPU list="{}"\n').format(self.XMLNAME,
+            self.maximumJobs, self.skipUnchangedOutputs, self.niceLevel,
+            self.ioClass, self.cpuAffinity, self.cpuList)
+
+    def clear(self):
+        """ Set all object members to their initial values.
+        """
+        self.maximumJobs = self.DEFAULT_MAXIMUM_JOBS
+        self.skipUnchangedOutputs = self.DEFAULT_SKIP_UNCHANGED_OUTPUTS
+        self.niceLevel = self.DEFAULT_NICE_LEVEL
+        self.ioClass = self.DEFAULT_IO_CLASS
+        self.cpuAffinity = self.DEFAULT_CPU_AFFINITY
+        self.cpuList = self.DEFAULT_CPU_LIST
+
+    @property
+    def parent(self):
+        return self.__parent
+
+    def fromXML(self, element):
+        """ Initialize the object from an XML element.
+        """
+        self.clear()
+
+        self.maximumJobs = XMLHelpers.GetXMLAttributeAsInt(element, 'MaximumJobs', self.DEFAULT_MAXIMUM_JOBS)
+        self.maximumJobs = min(max(self.maximumJobs, self.MINIMUM_JOBS), self.MAXIMUM_JOBS)
+        self.skipUnchangedOutputs = XMLHelpers.GetXMLAttributeAsBool(element, 'SkipUnchangedOutputs', self.DEFAULT_SKIP_UNCHANGED_OUTPUTS)
+        self.niceLevel = XMLHelpers.GetXMLAttributeAsInt(element, 'NiceLevel', self.DEFAULT_NICE_LEVEL)
+        self.niceLevel = min(max(self.niceLevel, self.MINIMUM_NICE_LEVEL), self.MAXIMUM_NICE_LEVEL)
+        self.ioClass = XMLHelpers.GetXMLAttribute(element, 'IOClass', self.DEFAULT_IO_CLASS)
+        if (self.ioClass not in ProcessPriority.IO_CLASSES):
+            self.ioClass = self.DEFAULT_IO_CLASS
+        self.cpuAffinity = XMLHelpers.GetXMLAttributeAsBool(element, 'CPUAffinity', self.DEFAULT_CPU_AFFINITY)
+        self.cpuList = XMLHelpers.GetXMLAttribute(element, 'CPUList', self.DEFAULT_CPU_LIST)
+
+    def toXML(self, doc, parentElement):
+        """ Write the object to an XML file.
+        """
+        element = doc.createElement(self.XMLNAME)
+        parentElement.appendChild(element)
+
+        element.setAttribute('MaximumJobs', str(self.maximumJobs))
+        element.setAttribute('SkipUnchangedOutputs', XMLHelpers.BoolToString(self.skipUnchangedOutputs))
+        element.setAttribute('NiceLevel', str(self.niceLevel))
+        element.setAttribute('IOClass', self.ioClass)
+        element.setAttribute('CPUAffinity', XMLHelpers.BoolToString(self.cpuAffinity))
+        element.setAttribute('CPUList', self.cpuList.strip())
+
+        return element
+
 class Logging(object):
     """ Stores users information about log settings.
     """
@@ -87,14 +162,18 @@ class Logging(object):
     DEFAULT_ANALYSIS = False
     DEFAULT_COMMANDS_AND_TIMESTAMPS = False
     DEFAULT_FILENAME = ''
+    DEFAULT_RESULTS_MAXIMUM_PARAGRAPHS = 5000
+    MINIMUM_RESULTS_MAXIMUM_PARAGRAPHS = 100
+    MAXIMUM_RESULTS_MAXIMUM_PARAGRAPHS = 100000
 
     def __init__(self, parent):
         self.__parent = parent
         self.clear()
 
     def __str__(self):
-        return '{}: log source analysis={}, log command and timestamps={}, log file="{}"\n'\
-            .format(self.XMLNAME, self.analysis, self.commandsAndTimestamps, self.filename)
+        return '{}: log source analysis={}, log command and timestamps={}, log file="{}", ' \
+            'results maximum paragraphs={}\n'.format(self.XMLNAME, self.analysis,
+            self.commandsAndTimestamps, self.filename, self.resultsMaximumParagraphs)
 
     def clear(self):
         """ Set all object members to their initial values.
@@ -102,6 +181,7 @@ class Logging(object):
         self.analysis = self.DEFAULT_ANALYSIS
         self.commandsAndTimestamps = self.DEFAULT_COMMANDS_AND_TIMESTAMPS
         self.filename = self.DEFAULT_FILENAME
+        self.resultsMaximumParagraphs = self.DEFAULT_RESULTS_MAXIMUM_PARAGRAPHS
 
     @property
     def parent(self):
@@ -115,6 +195,8 @@ class Logging(object):
         self.analysis = XMLHelpers.GetXMLAttributeAsBool(element, 'Analysis', self.DEFAULT_ANALYSIS)
         self.commandsAndTimestamps = XMLHelpers.GetXMLAttributeAsBool(element, 'CommandsAndTimestamps', self.DEFAULT_COMMANDS_AND_TIMESTAMPS)
         self.filename = XMLHelpers.GetXMLAttribute(element, 'Filename', self.DEFAULT_FILENAME)
+        self.resultsMaximumParagraphs = XMLHelpers.GetXMLAttributeAsInt(element, 'ResultsMaximumParagraphs', self.DEFAULT_RESULTS_MAXIMUM_PARAGRAPHS)
+        self.resultsMaximumParagraphs = min(max(self.resultsMaximumParagraphs, self.MINIMUM_RESULTS_MAXIMUM_PARAGRAPHS), self.MAXIMUM_RESULTS_MAXIMUM_PARAGRAPHS)
 
     def initializeLog(self):
         """ Open the log file, if the options require one.
@@ -137,6 +219,7 @@ class Logging(object):
         element.setAttribute('Analysis', XMLHelpers.BoolToString(self.analysis))
         element.setAttribute('CommandsAndTimestamps', XMLHelpers.BoolToString(self.commandsAndTimestamps))
         element.setAttribute('Filename', self.filename.strip())
+        element.setAttribute('ResultsMaximumParagraphs', str(self.resultsMaximumParagraphs))
 
         return element
 
@@ -341,14 +424,25 @@ class NewSource(object):
     DEFAULT_FIRST_PRESET = True
     DEFAULT_USE_DEFAULT_DESTINATION = True
     DEFAULT_DEFAULT_DESTINATION = ''
+    DEFAULT_USE_SCAN_CACHE = True
+    DEFAULT_SCAN_CACHE_MAXIMUM_MB = 64
+    DEFAULT_SCAN_JOBS = 1
+    DEFAULT_READ_IFO_FILES = True
+
+    MINIMUM_SCAN_CACHE_MB = 1
+    MAXIMUM_SCAN_CACHE_MB = 4096
+
+    MINIMUM_SCAN_JOBS = 1
+    MAXIMUM_SCAN_JOBS = 16
 
     def __init__(self, parent):
         self.__parent = parent
         self.clear()
 
     def __str__(self):
-        return '{}: firstMask={}, firstPreset={}\n'\
-            .format(self.XMLNAME, str(self.firstMask), str(self.firstPreset))
+        return '{}: firstMask={}, firstPreset={}, useScanCache={}, scanCacheMaximumMB={}, scanJobs={}, readIfoFiles={}\n'\
+            .format(self.XMLNAME, str(self.firstMask), str(self.firstPreset),
+            str(self.useScanCache), self.scanCacheMaximumMB, self.scanJobs, str(self.readIfoFiles))
 
     def clear(self):
         """ Set all object members to their initial values.
@@ -359,6 +453,11 @@ class NewSource(object):
         self.useDefaultDestination = self.DEFAULT_USE_DEFAULT_DESTINATION
         self.defaultDestination = self.DEFAULT_DEFAULT_DESTINATION
 
+        self.useScanCache = self.DEFAULT_USE_SCAN_CACHE
+        self.scanCacheMaximumMB = self.DEFAULT_SCAN_CACHE_MAXIMUM_MB
+        self.scanJobs = self.DEFAULT_SCAN_JOBS
+        self.readIfoFiles = self.DEFAULT_READ_IFO_FILES
+
     @property
     def parent(self):
         return self.__parent
@@ -372,6 +471,13 @@ class NewSource(object):
         self.useDefaultDestination = XMLHelpers.GetXMLAttributeAsBool(newSourceElement, 'UseDefaultDestination', self.DEFAULT_USE_DEFAULT_DESTINATION)
         self.defaultDestination = XMLHelpers.GetXMLAttribute(newSourceElement, 'DefaultDestination', self.DEFAULT_DEFAULT_DESTINATION)
 
+        self.useScanCache = XMLHelpers.GetXMLAttributeAsBool(newSourceElement, 'UseScanCache', self.DEFAULT_USE_SCAN_CACHE)
+        self.scanCacheMaximumMB = XMLHelpers.GetXMLAttributeAsInt(newSourceElement, 'ScanCacheMaximumMB', self.DEFAULT_SCAN_CACHE_MAXIMUM_MB)
+        self.scanCacheMaximumMB = min(max(self.scanCacheMaximumMB, self.MINIMUM_SCAN_CACHE_MB), self.MAXIMUM_SCAN_CACHE_MB)
+        self.scanJobs = XMLHelpers.GetXMLAttributeAsInt(newSourceElement, 'ScanJobs', self.DEFAULT_SCAN_JOBS)
+        self.scanJobs = min(max(self.scanJobs, self.MINIMUM_SCAN_JOBS), self.MAXIMUM_SCAN_JOBS)
+        self.readIfoFiles = XMLHelpers.GetXMLAttributeAsBool(newSourceElement, 'ReadIFOFiles', self.DEFAULT_READ_IFO_FILES)
+
     def toXML(self, doc, parentElement):
         """ Write the object to an XML file.
         """
@@ -384,6 +490,11 @@ class NewSource(object):
         element.setAttribute('UseDefaultDestination', XMLHelpers.BoolToString(self.useDefaultDestination))
         element.setAttribute('DefaultDestination', self.defaultDestination)
 
+        element.setAttribute('UseScanCache', XMLHelpers.BoolToString(self.useScanCache))
+        element.setAttribute('ScanCacheMaximumMB', str(self.scanCacheMaximumMB))
+        element.setAttribute('ScanJobs', str(self.scanJobs))
+        element.setAttribute('ReadIFOFiles', XMLHelpers.BoolToString(self.readIfoFiles))
+
         return element
 
 class FilenameReplacement(object):
@@ -763,10 +874,37 @@ class Preset(object):
         self.tag = self.DEFAULT_TAG
         self.settings = self.DEFAULT_SETTINGS
 
+    def clearArguments(self):
+        """ Discard the cached arguments.  They are tokenised again the next
+            time they are used.
+        """
+        self.__arguments = None
+
+    @property
+    def arguments(self):
+        """ Returns the settings as a list of arguments, split the same way a
+            shell would split them.  The list is cached until the settings
+            change.  Raises ValueError if the settings can't be split, e.g.
+            an unmatched quote.
+        """
+        if (self.__arguments is None):
+            self.__arguments = shlex.split(self.settings)
+
+        return list(self.__arguments)
+
     @property
     def parent(self):
         return self.__parent
 
+    @property
+    def settings(self):
+        return self.__settings
+
+    @settings.setter
+    def settings(self, settings):
+        self.__settings = settings
+        self.clearArguments()
+
     @property
     def simpleSettings(self):
         """ Returns the settings attribute with new lines (\n), carriage returns (\r),
@@ -1143,15 +1281,22 @@ class DiscSession(object):
     DEFAULT_KEEP_POSITION = False
     DEFAULT_KEEP_SIZE = False
     DEFAULT_KEEP_DESTINATION = False
+    DEFAULT_LOAD_TITLE_DETAILS_ON_DEMAND = True
+
+    DEFAULT_AUTOSAVE = True
+    DEFAULT_AUTOSAVE_SECONDS = 5
+    MINIMUM_AUTOSAVE_SECONDS = 1
+    MAXIMUM_AUTOSAVE_SECONDS = 300
 
     def __init__(self, parent):
         self.__parent = parent
         self.clear()
 
     def __str__(self):
-        return '{}: auto disc sessions={}, disc sessions folder="{}", disc sessins prefix="{}"\n  keep position={}, keep size={}, keep destination={}\n'\
+        return '{}: auto disc sessions={}, disc sessions folder="{}", disc sessins prefix="{}"\n  keep position={}, keep size={}, keep destination={}\n  load title details on demand={}, autosave={}, autosave seconds={}\n'\
             .format(self.XMLNAME, self.autoDiscSessions, self.autoDiscSessionsFolder,
-            self.autoDiscSessionsPrefix, self.keepPosition, self.keepSize, self.keepDestination)
+            self.autoDiscSessionsPrefix, self.keepPosition, self.keepSize, self.keepDestination,
+            self.loadTitleDetailsOnDemand, self.autosave, self.autosaveSeconds)
 
     def clear(self):
         """ Set all object members to their initial values.
@@ -1163,6 +1308,10 @@ class DiscSession(object):
         self.keepPosition = self.DEFAULT_KEEP_POSITION
         self.keepSize = self.DEFAULT_KEEP_SIZE
         self.keepDestination = self.DEFAULT_KEEP_DESTINATION
+        self.loadTitleDetailsOnDemand = self.DEFAULT_LOAD_TITLE_DETAILS_ON_DEMAND
+
+        self.autosave = self.DEFAULT_AUTOSAVE
+        self.autosaveSeconds = self.DEFAULT_AUTOSAVE_SECONDS
 
     @property
     def parent(self):
@@ -1189,6 +1338,11 @@ class DiscSession(object):
         self.keepPosition = XMLHelpers.GetXMLAttributeAsBool(element, 'KeepPosition', self.DEFAULT_KEEP_POSITION)
         self.keepSize = XMLHelpers.GetXMLAttributeAsBool(element, 'KeepSize', self.DEFAULT_KEEP_SIZE)
         self.keepDestination = XMLHelpers.GetXMLAttributeAsBool(element, 'KeepDestination', self.DEFAULT_KEEP_DESTINATION)
+        self.loadTitleDetailsOnDemand = XMLHelpers.GetXMLAttributeAsBool(element, 'LoadTitleDetailsOnDemand', self.DEFAULT_LOAD_TITLE_DETAILS_ON_DEMAND)
+
+        self.autosave = XMLHelpers.GetXMLAttributeAsBool(element, 'Autosave', self.DEFAULT_AUTOSAVE)
+        self.autosaveSeconds = XMLHelpers.GetXMLAttributeAsInt(element, 'AutosaveSeconds', self.DEFAULT_AUTOSAVE_SECONDS)
+        self.autosaveSeconds = min(max(self.autosaveSeconds, self.MINIMUM_AUTOSAVE_SECONDS), self.MAXIMUM_AUTOSAVE_SECONDS)
 
     def toXML(self, doc, parentElement):
         """ Write the object to an XML file.
@@ -1203,6 +1357,10 @@ class DiscSession(object):
         element.setAttribute('KeepPosition', XMLHelpers.BoolToString(self.keepPosition))
         element.setAttribute('KeepSize', XMLHelpers.BoolToString(self.keepSize))
         element.setAttribute('KeepDestination', XMLHelpers.BoolToString(self.keepDestination))
+        element.setAttribute('LoadTitleDetailsOnDemand', XMLHelpers.BoolToString(self.loadTitleDetailsOnDemand))
+
+        element.setAttribute('Autosave', XMLHelpers.BoolToString(self.autosave))
+        element.setAttribute('AutosaveSeconds', str(self.autosaveSeconds))
 
         return element
 
@@ -1211,9 +1369,22 @@ class Preferences(object):
     """
     XMLNAME = 'Preferences'        # For this class, and only this class, this is not actually used by fromXML(), toXML()
 
+    ENCODING = 'utf-8'
+
+    # Change this when a change to the classes in this file isn't picked up
+    # by the modification time of the file.
+    CACHE_VERSION = 1
+
+    # The parts of the settings, in the order they are written.
+    PARTS = ['executables', 'transcoding', 'logging', 'options', 'newSource',
+        'filenameTemplates', 'filenameReplacement',
+        'autoCrop', 'autoTitle', 'autoAudioTracks', 'autoSubtitle', 'autoMixdown',
+        'presets', 'mixdowns', 'discSession']
+
     def __init__(self):
 
         self.executables = Executables(self)
+        self.transcoding = Transcoding(self)
         self.logging = Logging(self)
         self.options = Options(self)
         self.newSource = NewSource(self)
@@ -1232,9 +1403,12 @@ class Preferences(object):
 
         self.discSession = DiscSession(self)
 
+        self.__savedParts = {}
+        self.__fileStamp = None
+
     def __str__(self):
-        return '{}:\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n'\
-            .format(self.XMLNAME, self.executables, self.logging, self.options, self.newSource,
+        return '{}:\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n  {}\n'\
+            .format(self.XMLNAME, self.executables, self.transcoding, self.logging, self.options, self.newSource,
             self.filenameTemplates, self.filenameReplacement, self.autoCrop, self.autoTitle,
             self.autoAudioTracks, self.autoSubtitle, self.autoMixdown, self.presets,
             self.mixdowns, self.discSession)
@@ -1243,6 +1417,7 @@ class Preferences(object):
         """ Set all object members to their initial values.
         """
         self.executables.clear()
+        self.transcoding.clear()
         self.logging.clear()
         self.options.clear()
         self.newSource.clear()
@@ -1266,7 +1441,7 @@ class Preferences(object):
         """
         self.clear()
 
-        doc = minidom.parse(filename)
+        doc = XMLDocument.Parse(filename)
         # The node name changed as part of the QT conversion.
         if (doc.documentElement.nodeName not in ['QtHEP', 'wxHEP']):
             raise RuntimeError(('Can''t read file "{}" because the "QtHEP" '
@@ -1276,6 +1451,9 @@ class Preferences(object):
             if (childNode.localName == Executables.XMLNAME):
                 self.executables.fromXML(childNode)
                 continue
+            if (childNode.localName == Transcoding.XMLNAME):
+                self.transcoding.fromXML(childNode)
+                continue
             if (childNode.localName == Logging.XMLNAME):
                 self.logging.fromXML(childNode)
                 continue
@@ -1328,38 +1506,149 @@ class Preferences(object):
         if (not len(self.mixdowns)):
             self.mixdowns.setDefaults()
 
-    def toXML(self, filename):
-        """ Write the settings to an XML file.
+        self.markClean(filename)
+
+    def toXML(self, filename, otherPreferences=None, keepParts=()):
+        """ Write the settings to an XML file, atomically: the file is written
+            to a temporary file first, flushed to the disk and then renamed
+            over the old file.  Several instances share the file, so a reader
+            always sees a whole file.
+
+            The parts named in keepParts are written from otherPreferences
+            instead of this object (see save()).
         """
-        dom = minidom.getDOMImplementation()
-        doc = dom.createDocument(None, 'QtHEP', None)
+        doc = XMLDocument.Document('QtHEP')
         parentElement = doc.documentElement
 
-        self.executables.toXML(doc, parentElement)
-        self.logging.toXML(doc, parentElement)
-        self.options.toXML(doc, parentElement)
-        self.newSource.toXML(doc, parentElement)
+        for name in self.PARTS:
+            source = self
+            if (otherPreferences is not None and name in keepParts):
+                source = otherPreferences
+            getattr(source, name).toXML(doc, parentElement)
+
+        tempFilename = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tempFilename, 'w', encoding=self.ENCODING) as xmlFile:
+            doc.writexml(xmlFile, '', '\t', '\n', encoding=self.ENCODING)
+            xmlFile.flush()
+            os.fsync(xmlFile.fileno())
+        os.replace(tempFilename, filename)
+
+        doc.unlink()
+
+        if (otherPreferences is not None):
+            # Take the parts written from otherPreferences too, or they would
+            # be marked clean with this object's old values and overwrite the
+            # other instance's changes at the next save.
+            self.fromXML(filename)
+        else:
+            self.markClean(filename)
+        self.writeCache(filename)
+
+    def save(self, filename):
+        """ Write the settings if they changed since they were read or last
+            saved.  Returns False if there was nothing to save.
+
+            If another instance saved the file in the meantime, its changes
+            to the parts this instance didn't change are kept.
+        """
+        dirtyParts = self.dirtyParts
+        if (not dirtyParts and os.path.exists(filename)):
+            return False
+
+        otherPreferences = None
+        if (os.path.exists(filename) and self.__fileStamp != self.fileStamp(filename)):
+            try:
+                otherPreferences = Preferences()
+                otherPreferences.fromXML(filename)
+            except Exception as exception:
+                sys.stderr.write('Unable to read the preferences "{}": {}\n'.format(filename, exception))
+                otherPreferences = None
 
-        self.filenameTemplates.toXML(doc, parentElement)
-        self.filenameReplacement.toXML(doc, parentElement)
+        self.toXML(filename, otherPreferences,
+            [name for name in self.PARTS if (name not in dirtyParts)])
 
-        self.autoCrop.toXML(doc, parentElement)
-        self.autoTitle.toXML(doc, parentElement)
-        self.autoAudioTracks.toXML(doc, parentElement)
-        self.autoSubtitle.toXML(doc, parentElement)
-        self.autoMixdown.toXML(doc, parentElement)
+        return True
 
-        self.presets.toXML(doc, parentElement)
-        self.mixdowns.toXML(doc, parentElement)
+    @classmethod
+    def cacheFilename(cls, filename):
+        return '{}.cache'.format(filename)
+
+    @classmethod
+    def codeStamp(cls):
+        """ The cache is only valid for the version of this file that wrote
+            it, since the classes may have changed.
+        """
+        status = os.stat(__file__)
+        return (cls.CACHE_VERSION, status.st_mtime_ns, status.st_size)
+
+    @classmethod
+    def fileStamp(cls, filename):
+        status = os.stat(filename)
+        return (status.st_mtime_ns, status.st_size)
+
+    @classmethod
+    def read(cls, filename):
+        """ Return the settings in an XML file.  They are read from the cache
+            if the file hasn't changed since the cache was written.
+        """
+        try:
+            with open(cls.cacheFilename(filename), 'rb') as cacheFile:
+                fileStamp, codeStamp, preferences = pickle.load(cacheFile)
+            if (fileStamp == cls.fileStamp(filename) and codeStamp == cls.codeStamp()):
+                return preferences
+        except Exception:
+            pass
+
+        preferences = cls()
+        preferences.fromXML(filename)
+        preferences.writeCache(filename)
+
+        return preferences
+
+    def writeCache(self, filename):
+        """ Write the settings to the cache for the XML file they match.
+        """
+        cacheFilename = self.cacheFilename(filename)
+        tempFilename = '{}.{}.tmp'.format(cacheFilename, os.getpid())
+        try:
+            with open(tempFilename, 'wb') as cacheFile:
+                pickle.dump((self.fileStamp(filename), self.codeStamp(), self), cacheFile,
+                    pickle.HIGHEST_PROTOCOL)
+            os.replace(tempFilename, cacheFilename)
+        except Exception as exception:
+            sys.stderr.write('Unable to write the preferences cache "{}": {}\n'.format(cacheFilename, exception))
+            if (os.path.exists(tempFilename)):
+                os.remove(tempFilename)
+
+    @property
+    def dirtyParts(self):
+        """ Return the names of the parts that changed since the settings
+            were read or saved.
+        """
+        return [name for name in self.PARTS if (self.__partXML(name) != self.__savedParts.get(name))]
 
-        self.discSession.toXML(doc, parentElement)
+    @property
+    def isDirty(self):
+        return bool(self.dirtyParts)
+
+    def markClean(self, filename=None):
+        """ Remember the settings as saved, in the state of the file.
+        """
+        self.__savedParts = {name: self.__partXML(name) for name in self.PARTS}
+        self.__fileStamp = None
+        if (filename is not None and os.path.exists(filename)):
+            self.__fileStamp = self.fileStamp(filename)
 
-        xmlFile = open(filename, 'w')
-        doc.writexml(xmlFile, '', '\t', '\n')
-        xmlFile.close()
+    def __partXML(self, name):
+        doc = XMLDocument.Document('QtHEP')
+        getattr(self, name).toXML(doc, doc.documentElement)
 
+        text = io.StringIO()
+        doc.writexml(text)
         doc.unlink()
 
+        return text.getvalue()
+
     def buildFilename(self, filenameTemplate, title, presetTag, audioTag,
         episodeNumber, episodeTitle, chapterEpisodeTitle):
         """ Build the file name using the preset values.
@@ -1385,6 +1674,7 @@ if __name__ == '__main__':
     print ()
 
     print (preferences.executables)
+    print (preferences.transcoding)
     print (preferences.logging)
     print (preferences.options)
     print (preferences.newSource)
@@ -1437,3 +1727,32 @@ if __name__ == '__main__':
         print (preferences.buildFilename(testTemplate, 'Buffy the Vampire Slayer 1', 'Film', 'DPL2,AC3', '12', 'Prophecy Girl', 'chapter'))
 
     preferences.toXML('TestFiles/QtHEP.defaults.xml')
+
+    # Two instances sharing a preferences file keep each other's changes,
+    # on every save and not only the first one after the other instance saved.
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        sharedFilename = os.path.join(folder, 'QtHEP.preferences.xml')
+        Preferences().toXML(sharedFilename)
+
+        preferencesA = Preferences.read(sharedFilename)
+        preferencesB = Preferences.read(sharedFilename)
+
+        preferencesB.discSession.autosaveSeconds = 42
+        assert preferencesB.save(sharedFilename)
+
+        preferencesA.newSource.scanJobs = preferencesA.newSource.scanJobs + 1
+        assert preferencesA.save(sharedFilename)
+        assert preferencesA.discSession.autosaveSeconds == 42
+
+        preferencesA.logging.analysis = not preferencesA.logging.analysis
+        assert preferencesA.save(sharedFilename)
+
+        saved = Preferences()
+        saved.fromXML(sharedFilename)
+        assert saved.discSession.autosaveSeconds == 42
+        assert saved.newSource.scanJobs == preferencesA.newSource.scanJobs
+        assert saved.logging.analysis == preferencesA.logging.analysis
+        assert Preferences.read(sharedFilename).discSession.autosaveSeconds == 42
+
+        print ('Shared preferences file merged.')
@@ -39,6 +39,7 @@ from PyQt5Validators import (_DEFAULT_TITLE as VALIDATORS_DEFAULT_TITLE,
     QListWidget_NotEmpty_Validator)
 
 from Preferences import FilenameTemplates, Mixdown
+from ProcessPriority import ParseCpuList, ProcessPriority
 
 # from PyQt5 import uic
 from PyQt5.QtCore import Qt, QDir, QStandardPaths
@@ -107,6 +108,39 @@ class LogFile_Validator(QLineEditor_Abstract_Validator):
 
         return False
 
+class CpuList_Validator(QLineEditor_Abstract_Validator):
+    """ A validator for a QLineEdit field that contains a list of CPUs.
+
+        The field may be blank, which means all CPUs.
+    """
+
+    __DEFAULT_MESSAGE = 'The CPUs field is not a valid list of CPU numbers and ranges, e.g. 0-3,6.'
+
+    def __init__(self, widget, title=VALIDATORS_DEFAULT_TITLE, message=__DEFAULT_MESSAGE):
+        super().__init__(widget, title, message)
+
+    def isValid(self):
+        if (self._flags & self.FLAG_CLEAR_HIGHLIGHT_BEFORE_VALIDATING):
+            self.clearHighlight()
+
+        if ((self._flags & self.FLAG_DISABLED_WIDGET_ALWAYS_VALID)
+            and (not self._widget.isEnabled())):
+            return True
+
+        try:
+            ParseCpuList(self._widget.text())
+            return True
+        except ValueError:
+            pass
+
+        if (self._flags & self.FLAG_HIGHLIGHT_WIDGETS_WITH_ERRORS):
+            self.setHighlight()
+
+        if (self._flags & self.FLAG_SHOW_ERROR_MESSAGE):
+            QMessageBox.critical(QApplication.instance().mainWindow, self._errorTitle, self._errorMessage)
+
+        return False
+
 class PreferencesDialog(QDialog, Ui_DialogPreferences):
     """ The dialog used to edit the application preferences."""
 
@@ -238,6 +272,10 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
             self.lineEdit_DiscSessionAutomaticSessionsFolder, self.__preferences.discSession, 'autoDiscSessionsFolder'))
         self.__widgetDataConnectors.append(QLineEditDataConnector(
             self.lineEdit_DiscSessionAutomaticFilenamePrefix, self.__preferences.discSession, 'autoDiscSessionsPrefix'))
+        self.__widgetDataConnectors.append(QCheckBoxDataConnector(
+            self.checkBox_DiscSessionAutosave, self.__preferences.discSession, 'autosave'))
+        self.__widgetDataConnectors.append(QSpinBoxDataConnector(
+            self.spinBox_DiscSessionAutosaveSeconds, self.__preferences.discSession, 'autosaveSeconds'))
 
         # Load Session
         self.__widgetDataConnectors.append(QCheckBoxDataConnector(
@@ -246,6 +284,8 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
             self.checkBoxLoadSessionKeepSize, self.__preferences.discSession, 'keepSize'))
         self.__widgetDataConnectors.append(QCheckBoxDataConnector(
             self.checkBoxLoadSessionKeepDestination, self.__preferences.discSession, 'keepDestination'))
+        self.__widgetDataConnectors.append(QCheckBoxDataConnector(
+            self.checkBox_LoadSessionTitleDetailsOnDemand, self.__preferences.discSession, 'loadTitleDetailsOnDemand'))
 
         # New Source
         self.__widgetDataConnectors.append(QCheckBoxDataConnector(
@@ -258,6 +298,15 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
         self.__widgetDataConnectors.append(QLineEditDataConnector(
             self.lineEdit_DefaultDestination, self.__preferences.newSource, 'defaultDestination'))
 
+        self.__widgetDataConnectors.append(QCheckBoxDataConnector(
+            self.checkBox_ScanCache, self.__preferences.newSource, 'useScanCache'))
+        self.__widgetDataConnectors.append(QSpinBoxDataConnector(
+            self.spinBox_ScanCacheMaximumMB, self.__preferences.newSource, 'scanCacheMaximumMB'))
+        self.__widgetDataConnectors.append(QSpinBoxDataConnector(
+            self.spinBox_ScanJobs, self.__preferences.newSource, 'scanJobs'))
+        self.__widgetDataConnectors.append(QCheckBoxDataConnector(
+            self.checkBox_ReadIfoFiles, self.__preferences.newSource, 'readIfoFiles'))
+
         # Create the validators.
         # ======================================================================
 
@@ -340,6 +389,21 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
         self.__widgetDataConnectors.append(QLineEditDataConnector(
             self.lineEdit_VLC, self.__preferences.executables, 'VLC'))
 
+        # Transcoding
+        self.__widgetDataConnectors.append(QSpinBoxDataConnector(
+            self.spinBox_MaximumTranscodingJobs, self.__preferences.transcoding, 'maximumJobs'))
+        self.__widgetDataConnectors.append(QCheckBoxDataConnector(
+            self.checkBox_SkipUnchangedOutputs, self.__preferences.transcoding, 'skipUnchangedOutputs'))
+        self.__widgetDataConnectors.append(QSpinBoxDataConnector(
+            self.spinBox_TranscodingNiceLevel, self.__preferences.transcoding, 'niceLevel'))
+        UpdateComboBox(self.comboBox_TranscodingIOClass, ProcessPriority.IO_CLASSES)
+        self.__widgetDataConnectors.append(QComboBoxDataConnector(
+            self.comboBox_TranscodingIOClass, self.__preferences.transcoding, 'ioClass'))
+        self.__widgetDataConnectors.append(QCheckBoxDataConnector(
+            self.checkBox_TranscodingCPUAffinity, self.__preferences.transcoding, 'cpuAffinity'))
+        self.__widgetDataConnectors.append(QLineEditDataConnector(
+            self.lineEdit_TranscodingCPUList, self.__preferences.transcoding, 'cpuList'))
+
         # Logging
         self.__widgetDataConnectors.append(QCheckBoxDataConnector(
             self.checkBox_LogHandBrakeAnalysis, self.__preferences.logging, 'analysis'))
@@ -347,6 +411,8 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
             self.checkBox_LogHandBrakeTranscoding, self.__preferences.logging, 'commandsAndTimestamps'))
         self.__widgetDataConnectors.append(QLineEditDataConnector(
             self.lineEdit_LogFilename, self.__preferences.logging, 'filename'))
+        self.__widgetDataConnectors.append(QSpinBoxDataConnector(
+            self.spinBox_LogResultsMaximumParagraphs, self.__preferences.logging, 'resultsMaximumParagraphs'))
 
         # Options
         self.__widgetDataConnectors.append(QCheckBoxDataConnector(
@@ -367,6 +433,9 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
         self.Validator_VLC = QLineEdit_ExecutableExists_Validator(self.lineEdit_VLC,
             message = 'The VLC field is either blank or does not point to a valid executable.')
 
+        # Transcoding
+        self.Validator_TranscodingCPUList = CpuList_Validator(self.lineEdit_TranscodingCPUList)
+
         # Logging
         self.Validator_LogFilename = LogFile_Validator(self.lineEdit_LogFilename)
 
@@ -690,6 +759,10 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
 
             # See the above mixdown comments.
             preset.name = item.text()
+
+            # The settings may have been edited, so tokenise them again when
+            # they are next used.
+            preset.clearArguments()
             self.__preferences.presets.append(preset)
 
     def transferToWindow(self):
@@ -724,6 +797,10 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
         # New Source
         self.lineEdit_DefaultDestination.setEnabled(self.__preferences.newSource.useDefaultDestination)
         self.pushButton_BrowseDefaultDestination.setEnabled(self.__preferences.newSource.useDefaultDestination)
+        self.spinBox_ScanCacheMaximumMB.setEnabled(self.__preferences.newSource.useScanCache)
+
+        # Transcoding
+        self.lineEdit_TranscodingCPUList.setEnabled(self.__preferences.transcoding.cpuAffinity)
 
         # Logging
         self.setEnabledClearLog()
@@ -739,6 +816,7 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
         # Disc Session Load Session
         self.lineEdit_DiscSessionAutomaticSessionsFolder.setEnabled(self.__preferences.discSession.autoDiscSessions)
         self.lineEdit_DiscSessionAutomaticFilenamePrefix.setEnabled(self.__preferences.discSession.autoDiscSessions)
+        self.spinBox_DiscSessionAutosaveSeconds.setEnabled(self.__preferences.discSession.autosave)
 
         # Auto Audio Track(s)
         self.lineEdit_AutoAudioPreferredLanguage.setEnabled(self.__preferences.autoAudioTracks.autoSelectPreferredLanguage)
@@ -755,6 +833,7 @@ class PreferencesDialog(QDialog, Ui_DialogPreferences):
 
         notValid |= (not self.Validator_HandBrakeCLI.isValid())
         notValid |= (not self.Validator_VLC.isValid())
+        notValid |= (not self.Validator_TranscodingCPUList.isValid())
         notValid |= (not self.Validator_LogFilename.isValid())
         notValid |= (not self.Validator_ShortLastChapter.isValid())
         notValid |= (not self.Validator_FilenameTemplates.isValid())
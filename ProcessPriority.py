@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Run the transcoding processes at a lower priority so the GUI, and reading the
+# next disc, stay responsive.  On Linux the command is wrapped with:
+#
+#   nice -n N ionice -c C taskset -c CPUS HandBrakeCLI ...
+#
+# Each wrapper execs the next program so the process started by QProcess ends
+# up being HandBrakeCLI itself, with the priority, I/O class and CPU affinity
+# already set before it starts any threads.
+#
+# The CPUs are split between the worker slots of the queue so that jobs that
+# run at the same time don't share cores (and their caches).
+#
+# Nothing is wrapped on other platforms, or if a wrapper program is missing.
+# =============================================================================
+
+import os, shutil, sys
+
+def ParseCpuList(text):
+    """ Parse a CPU list like "0-3,6,8-11" and return a sorted list of CPU
+        numbers.  Raises ValueError if the list can't be parsed.
+    """
+    cpus = set()
+
+    for part in text.replace(' ', '').split(','):
+        if (not part):
+            continue
+
+        if ('-' in part):
+            first, last = part.split('-', 1)
+            first, last = int(first), int(last)
+            if (first > last):
+                raise ValueError('"{}" is not a valid CPU range'.format(part))
+            cpus.update(range(first, last + 1))
+        else:
+            cpus.add(int(part))
+
+    if (min(cpus, default=0) < 0):
+        raise ValueError('CPU numbers can not be negative')
+
+    return sorted(cpus)
+
+class ProcessPriority(object):
+    """ The nice level, I/O scheduling class and CPUs used for the transcoding
+        processes.
+    """
+
+    IO_CLASS_NONE = 'None'
+    IO_CLASS_BEST_EFFORT = 'Best effort'
+    IO_CLASS_IDLE = 'Idle'
+
+    IO_CLASSES = [IO_CLASS_NONE, IO_CLASS_BEST_EFFORT, IO_CLASS_IDLE]
+
+    # The ionice -c values.
+    __IONICE_CLASSES = {IO_CLASS_BEST_EFFORT: '2', IO_CLASS_IDLE: '3'}
+
+    def __init__(self, niceLevel=0, ioClass=IO_CLASS_NONE, cpus=None):
+        """ cpus is a list of CPU numbers, or None to use every CPU.
+        """
+        self.niceLevel = niceLevel
+        self.ioClass = ioClass
+        self.cpus = cpus
+
+        self.__missing = set()
+
+    def __str__(self):
+        return 'ProcessPriority: nice={}, I/O class={}, CPUs={}'.format(
+            self.niceLevel, self.ioClass, self.cpus)
+
+    @classmethod
+    def fromPreferences(cls, transcoding):
+        """ Return a ProcessPriority for the transcoding preferences.  An
+            invalid CPU list is reported and ignored.
+        """
+        cpus = None
+        if (transcoding.cpuAffinity):
+            try:
+                cpus = ParseCpuList(transcoding.cpuList) or None
+            except ValueError as exception:
+                sys.stderr.write('Ignoring the CPU list "{}": {}\n'.format(
+                    transcoding.cpuList, exception))
+
+            if (cpus is None and hasattr(os, 'sched_getaffinity')):
+                cpus = sorted(os.sched_getaffinity(0))
+
+        return cls(transcoding.niceLevel, transcoding.ioClass, cpus)
+
+    @property
+    def isSupported(self):
+        return sys.platform.startswith('linux')
+
+    def slotCpus(self, slot, slotCount):
+        """ Return the CPUs for a worker slot (0 to slotCount - 1).  The CPUs
+            are split as evenly as possible.  If there are more slots than CPUs
+            the slots share the CPUs round robin.
+        """
+        if (not self.cpus):
+            return None
+
+        slotCount = max(1, slotCount)
+        if (slotCount > len(self.cpus)):
+            return [self.cpus[slot % len(self.cpus)]]
+
+        first = (slot * len(self.cpus)) // slotCount
+        last = ((slot + 1) * len(self.cpus)) // slotCount
+
+        return self.cpus[first:last]
+
+    def wrap(self, program, arguments, slot=0, slotCount=1):
+        """ Return a tuple of the program and arguments that run program with
+            this priority.
+        """
+        if (not self.isSupported):
+            return (program, list(arguments))
+
+        wrappers = []
+
+        cpus = self.slotCpus(slot, slotCount)
+        if (cpus and self.__isAvailable('taskset')):
+            wrappers = ['taskset', '-c', ','.join([str(cpu) for cpu in cpus])] + wrappers
+
+        ioClass = self.__IONICE_CLASSES.get(self.ioClass)
+        if (ioClass is not None and self.__isAvailable('ionice')):
+            wrappers = ['ionice', '-c', ioClass] + wrappers
+
+        if (self.niceLevel and self.__isAvailable('nice')):
+            wrappers = ['nice', '-n', str(self.niceLevel)] + wrappers
+
+        if (not wrappers):
+            return (program, list(arguments))
+
+        return (wrappers[0], wrappers[1:] + [program] + list(arguments))
+
+    def __isAvailable(self, wrapper):
+        """ Return True if the wrapper program can be found.  A missing
+            program is only reported once.
+        """
+        if (shutil.which(wrapper) is not None):
+            return True
+
+        if (wrapper not in self.__missing):
+            self.__missing.add(wrapper)
+            sys.stderr.write('"{}" was not found, the transcoding jobs will run without it.\n'.format(wrapper))
+
+        return False
+
+if __name__ == '__main__':
+
+    print (ParseCpuList('0-3, 6,8-11'))
+
+    priority = ProcessPriority(10, ProcessPriority.IO_CLASS_IDLE, ParseCpuList('0-7'))
+    print (priority)
+    for slot in range(3):
+        print (slot, priority.slotCpus(slot, 3), priority.wrap('HandBrakeCLI', ['-i', 'in', '-o', 'out'], slot, 3))
@@ -17,61 +17,167 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 # =============================================================================
-# This is a helper class for QTextBrowser.  We can't use QTextBrowser.insertHtml()
-# because it insists on re-formating the html and stripping out some of the css
-# formatting every time it's called.  This makes indenting text in the browser
-# impossible.  This problem can be overcome using QTextBroser.setHtml() but that
-# means overwritting all of the contents of the widget every time something is
-# changed.  So, this class will accumulate the html for the widget and update
-# it all, every time it's changed.
+# This is a helper class for the "results" QTextBrowser.
+#
+# It used to accumulate the html of every paragraph and set all of it with
+# QTextBrowser.setHtml() each time a paragraph was added, because
+# QTextBrowser.insertHtml() strips the css classes that indent the text.  Every
+# new line parsed and laid out the whole history again, so a long queue got
+# slower and slower.
+#
+# Paragraphs are now appended at the end of the document with a QTextCursor.
+# Each css class has a cached QTextBlockFormat (margins) and QTextCharFormat
+# (color, size), so nothing is parsed.  Paragraphs added during one pass of the
+# event loop are appended together by a zero length timer.  The document keeps
+# at most Logging.resultsMaximumParagraphs paragraphs; older paragraphs are
+# dropped from the top and written to the log file if they weren't already.
 # =============================================================================
 
+import collections, html, sys
+
+sys.path.insert(0, '../Helpers')
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import (
+    QColor,
+    QTextBlockFormat,
+    QTextCharFormat,
+    QTextCursor
+    )
+
+from SingletonLog import SingletonLog
+
 class ResultsHtml(object):
-    """ Accumulate html for the "results" QTextBrowser.  Update the associated
-        QTextBrowser widget whenever the html is changed/updated.
+    """ Append paragraphs to the "results" QTextBrowser.  The text of a
+        paragraph may contain html character references (e.g. &nbsp;).
     """
 
-    PREFIX_HTML = """<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">
-<html><head><meta name="qrichtext" content="1" /><style type="text/css">
-p, li { white-space: pre-wrap; }
-.c0 {color:red; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px; font-size:12pt;}
-.c1 {color:blue; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;}
-.c2 {color:green; margin-top:0px; margin-bottom:0px; margin-left:20px; margin-right:0px; -qt-block-indent:0; text-indent:0px;}
-.c3 {color:black; margin-top:0px; margin-bottom:0px; margin-left:40px; margin-right:0px; -qt-block-indent:0; text-indent:0px;}
-</style></head><body style=" font-family:'Noto Sans'; font-size:9pt; font-weight:400; font-style:normal;">"""
+    FONT_FAMILY = 'Noto Sans'
+    FONT_POINT_SIZE = 9
 
-    SUFFIX_HTML = '</body></html>'
+    # css class: (color, left margin in pixels, font point size)
+    CSS_CLASSES = {
+        'c0': ('red', 0, 12),
+        'c1': ('blue', 0, None),
+        'c2': ('green', 20, None),
+        'c3': ('black', 40, None)
+    }
 
     def __init__(self, parent, textBrowser):
         super().__init__()
 
         self.__parent = parent
         self.__textBrowser = textBrowser
-        self.__html = ''
+
+        self.__paragraphs = collections.deque()     # (text, logged, block count) of the shown paragraphs
+        self.__blockCount = 0                       # blocks of the shown paragraphs
+        self.__pending = []                         # (text, cssClass, logged, isHtml) not shown yet
+
+        document = self.__textBrowser.document()
+        document.setUndoRedoEnabled(False)
+        font = document.defaultFont()
+        font.setFamily(self.FONT_FAMILY)
+        font.setPointSize(self.FONT_POINT_SIZE)
+        document.setDefaultFont(font)
+
+        self.__formats = {None: (QTextBlockFormat(), QTextCharFormat())}
+        for cssClass, (color, leftMargin, pointSize) in self.CSS_CLASSES.items():
+            blockFormat = QTextBlockFormat()
+            blockFormat.setLeftMargin(leftMargin)
+            charFormat = QTextCharFormat()
+            charFormat.setForeground(QColor(color))
+            if (pointSize is not None):
+                charFormat.setFontPointSize(pointSize)
+            self.__formats[cssClass] = (blockFormat, charFormat)
+
+        self.__timer = QTimer(self.__textBrowser)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(0)
+        self.__timer.timeout.connect(self.__update)
 
     @property
     def parent(self):
         return self.__parent
 
     def appendHtml(self, html):
-        self.__html += html
-        self.__update()
+        self.__append(html, None, False, True)
 
     def appendParagraph(self, text, cssClass=None, log=None):
         if (log):
             log.writeline(text)
 
-        if (cssClass):
-            self.__html += '<p class="{}">{}</p>'.format(cssClass, text)
-        else:
-            self.__html += '<p>{}</p>'.format(text)
-
-        self.__update()
+        self.__append(text, cssClass, bool(log), False)
 
     def clear(self):
-        self.__html = ''
-        self.__update()
+        self.__timer.stop()
+        self.__pending = []
+        self.__paragraphs.clear()
+        self.__blockCount = 0
+        self.__textBrowser.clear()
+
+    def __append(self, text, cssClass, logged, isHtml):
+        self.__pending.append((text, cssClass, logged, isHtml))
+        if (not self.__timer.isActive()):
+            self.__timer.start()
+
+    def __spill(self, paragraphs):
+        """ Write the paragraphs dropped from the top of the document to the
+            log file, unless they were logged when they were added.
+        """
+        if (not self.parent.preferences.logging.filename):
+            return
+
+        log = SingletonLog()
+        for text, logged, blockCount in paragraphs:
+            if (not logged):
+                log.writeline(text)
 
     def __update(self):
-        self.__textBrowser.setHtml(self.PREFIX_HTML+self.__html+self.SUFFIX_HTML)
-        self.__textBrowser.repaint()
+        """ Append the pending paragraphs to the document.
+        """
+        pending, self.__pending = self.__pending, []
+        if (not pending):
+            return
+
+        document = self.__textBrowser.document()
+        document.setMaximumBlockCount(self.parent.preferences.logging.resultsMaximumParagraphs)
+
+        scrollBar = self.__textBrowser.verticalScrollBar()
+        followEnd = (scrollBar.value() >= scrollBar.maximum())
+
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.End)
+        for text, cssClass, logged, isHtml in pending:
+            blockFormat, charFormat = self.__formats.get(cssClass, self.__formats[None])
+
+            blockCount = document.blockCount()
+            if (self.__paragraphs):
+                cursor.insertBlock(blockFormat, charFormat)
+            else:
+                # The first paragraph goes in the empty block of an empty document.
+                cursor.setBlockFormat(blockFormat)
+                cursor.setBlockCharFormat(charFormat)
+                blockCount -= 1
+
+            if (isHtml):
+                cursor.insertHtml(text)
+            else:
+                cursor.insertText(html.unescape(text), charFormat)
+
+            blockCount = document.blockCount() - blockCount
+            self.__paragraphs.append((text, logged, blockCount))
+            self.__blockCount += blockCount
+        cursor.endEditBlock()
+
+        # The document drops blocks from the top when it has too many, drop
+        # the same paragraphs here.
+        dropped = []
+        while (self.__blockCount > document.blockCount() and self.__paragraphs):
+            paragraph = self.__paragraphs.popleft()
+            dropped.append(paragraph)
+            self.__blockCount -= paragraph[2]
+        self.__spill(dropped)
+
+        if (followEnd):
+            scrollBar.setValue(scrollBar.maximum())
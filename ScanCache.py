@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# A cache of HandBrake scan results.  Scanning a disc takes anywhere from 30
+# seconds to several minutes, re-reading the scan from the cache takes no time
+# at all.
+#
+# The raw scan output is stored in one file per source, named after a
+# fingerprint of:
+#
+#   * The HandBrakeCLI program and the scan arguments.
+#   * The names, sizes and modification times of the disc structure files,
+#     the IFO/BUP files for a DVD or the .bdmv/.mpls/.clpi files for a
+#     Blu-ray.  The large video files are not needed, the structure files
+#     change if the disc changes.
+#
+# A source without any structure files (e.g. a single video file) is
+# fingerprinted with its own size and modification time.
+#
+# The least recently used scans are deleted when the cache grows larger than
+# its maximum size.
+# =============================================================================
+
+import hashlib, os, os.path, sys
+
+class ScanCache(object):
+    """ Store and find HandBrake scan results by source fingerprint.
+    """
+
+    FILENAME_SUFFIX = '.scan.txt'
+    ENCODING = 'ISO-8859-1'         # The same encoding used to decode the scan.
+
+    DVD_FOLDER = 'VIDEO_TS'
+    DVD_EXTENSIONS = ['.ifo', '.bup']
+    BLURAY_FOLDER = 'BDMV'
+    BLURAY_EXTENSIONS = ['.bdmv', '.mpls', '.clpi']
+
+    def __init__(self, folder, maximumBytes):
+        self.folder = folder
+        self.maximumBytes = maximumBytes
+
+    def __str__(self):
+        return 'ScanCache: "{}", {} bytes of {}'.format(self.folder, self.size,
+            self.maximumBytes)
+
+    @classmethod
+    def structureFiles(cls, source):
+        """ Return a sorted list of the disc structure files of a source.
+        """
+        filenames = []
+
+        for folder, extensions in [(cls.DVD_FOLDER, cls.DVD_EXTENSIONS),
+            (cls.BLURAY_FOLDER, cls.BLURAY_EXTENSIONS)]:
+
+            if (os.path.basename(os.path.normpath(source)).upper() == folder):
+                path = source
+            else:
+                path = os.path.join(source, folder)
+
+            if (not os.path.isdir(path)):
+                continue
+
+            for dirpath, dirnames, files in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(files):
+                    if (os.path.splitext(filename)[1].lower() in extensions):
+                        filenames.append(os.path.join(dirpath, filename))
+
+        return filenames
+
+    @classmethod
+    def fingerprint(cls, source, program, arguments):
+        """ Return the fingerprint of a source, or None if the source can't be
+            fingerprinted.
+        """
+        fingerprint = hashlib.sha1()
+
+        for value in [program] + list(arguments):
+            fingerprint.update(value.encode('utf-8'))
+            fingerprint.update(b'\0')
+
+        filenames = cls.structureFiles(source)
+        if (not filenames):
+            if (not os.path.isfile(source)):
+                return None
+            filenames = [source]
+
+        try:
+            for filename in filenames:
+                stat = os.stat(filename)
+                fingerprint.update('{}:{}:{}\0'.format(os.path.relpath(filename, source),
+                    stat.st_size, stat.st_mtime_ns).encode('utf-8'))
+        except OSError:
+            return None
+
+        return fingerprint.hexdigest()
+
+    @property
+    def size(self):
+        return sum([size for filename, size, atime in self.__entries()])
+
+    def clear(self):
+        """ Delete every cached scan.
+        """
+        for filename, size, atime in self.__entries():
+            self.__remove(filename)
+
+    def get(self, fingerprint):
+        """ Return the cached scan output for a fingerprint or None.
+        """
+        if (fingerprint is None):
+            return None
+
+        filename = self.__filename(fingerprint)
+        try:
+            with open(filename, 'r', encoding=self.ENCODING, newline='') as scanFile:
+                out = scanFile.read()
+        except OSError:
+            return None
+
+        # Mark the scan as recently used.
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+
+        return out
+
+    def put(self, fingerprint, out):
+        """ Store the scan output for a fingerprint, then delete the least
+            recently used scans until the cache fits.  Errors are reported,
+            a scan that can't be cached is simply scanned again next time.
+        """
+        if (fingerprint is None or self.maximumBytes <= 0):
+            return
+
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+
+            filename = self.__filename(fingerprint)
+            tempFilename = '{}.tmp'.format(filename)
+            with open(tempFilename, 'w', encoding=self.ENCODING, newline='') as scanFile:
+                scanFile.write(out)
+            os.replace(tempFilename, filename)
+        except OSError as exception:
+            sys.stderr.write('Unable to cache the scan in "{}": {}\n'.format(self.folder, exception))
+            return
+
+        self.evict()
+
+    def evict(self):
+        """ Delete the least recently used scans until the cache is no larger
+            than maximumBytes.
+        """
+        entries = sorted(self.__entries(), key=lambda entry: entry[2])
+        size = sum([entry[1] for entry in entries])
+
+        while (entries and size > self.maximumBytes):
+            filename, entrySize, atime = entries.pop(0)
+            self.__remove(filename)
+            size -= entrySize
+
+    def remove(self, fingerprint):
+        """ Forget the scan for a fingerprint, e.g. to force a rescan.
+        """
+        if (fingerprint is not None):
+            self.__remove(self.__filename(fingerprint))
+
+    def __entries(self):
+        """ Return a list of (filename, size, last used time) tuples.
+        """
+        entries = []
+
+        if (not os.path.isdir(self.folder)):
+            return entries
+
+        for entry in os.scandir(self.folder):
+            if (entry.is_file() and entry.name.endswith(self.FILENAME_SUFFIX)):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def __filename(self, fingerprint):
+        return os.path.join(self.folder, '{}{}'.format(fingerprint, self.FILENAME_SUFFIX))
+
+    def __remove(self, filename):
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Save the session in the background a few seconds after it was changed.
+#
+# Every key press, mouse click or wheel turn in the main window restarts a
+# single shot timer.  When the timer runs out the window takes a snapshot of
+# the session (an XMLDocument, see MyMainWindow.autosaveSnapshot) on the GUI
+# thread, which only takes a few milliseconds.  The snapshot is written on a
+# worker thread: to a temporary file first, which is flushed to the disk and
+# then renamed over the session file, so a crash leaves either the old or the
+# new session and never half of one.  A snapshot that hasn't changed since the
+# last save isn't written.
+#
+# Autosave doesn't validate the window, there are no dialogs.
+# =============================================================================
+
+import hashlib, io, os, sys, threading
+
+sys.path.insert(0, '../Helpers')
+
+from PyQt5.QtCore import (
+    pyqtSignal,
+    QEvent,
+    QObject,
+    QTimer
+    )
+from PyQt5.QtWidgets import QWidget
+
+class SessionAutosave(QObject):
+    """ Save snapshots of the session after the window was changed.
+        snapshot is a function returning a (filename, XMLDocument) tuple, or
+        None when there is nothing to save.
+    """
+
+    sessionSaved = pyqtSignal(str)
+    sessionSaveFailed = pyqtSignal(str, str)
+
+    ENCODING = 'utf-8'
+
+    # The user input that can change the session.
+    EDIT_EVENTS = [QEvent.KeyRelease, QEvent.MouseButtonRelease, QEvent.Wheel, QEvent.Drop]
+
+    def __init__(self, window, preferences, snapshot):
+        super().__init__(window)
+
+        self.window = window
+        self.preferences = preferences
+        self.snapshot = snapshot
+
+        self.__savedDigests = {}
+        self.__lock = threading.Lock()
+        self.__thread = None
+
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.__onTimeout)
+
+    @property
+    def enabled(self):
+        return self.preferences.discSession.autosave
+
+    @property
+    def isSaving(self):
+        return (self.__thread is not None and self.__thread.is_alive())
+
+    def cancel(self):
+        """ Forget a pending save.
+        """
+        self.__timer.stop()
+
+    def eventFilter(self, watched, event):
+        """ Schedule a save after user input in the window.  The filter is
+            installed on the application so it sees the input for every
+            widget.
+        """
+        if (event.type() in self.EDIT_EVENTS and isinstance(watched, QWidget)
+            and watched.window() is self.window):
+            self.schedule()
+
+        return False
+
+    def flush(self):
+        """ Save now, on this thread, e.g. when the window is closed.
+        """
+        self.__timer.stop()
+        if (not self.enabled):
+            return
+
+        if (self.__thread is not None):
+            self.__thread.join()
+
+        snapshot = self.snapshot()
+        if (snapshot is not None):
+            self.__write(*snapshot)
+
+    def schedule(self):
+        """ (Re)start the timer.  The session is saved once nothing has
+            changed for the autosave delay.
+        """
+        if (not self.enabled):
+            self.__timer.stop()
+            return
+
+        self.__timer.start(self.preferences.discSession.autosaveSeconds * 1000)
+
+    def __onTimeout(self):
+        # Wait for the last save to finish rather than running two at once.
+        if (self.isSaving):
+            self.__timer.start(250)
+            return
+
+        snapshot = self.snapshot()
+        if (snapshot is None):
+            return
+
+        self.__thread = threading.Thread(target=self.__write, args=snapshot,
+            name='SessionAutosave', daemon=True)
+        self.__thread.start()
+
+    def __write(self, filename, doc):
+        """ Write a snapshot to its session file, atomically.  Runs on the
+            worker thread.
+        """
+        try:
+            text = io.StringIO()
+            doc.writexml(text, '', '\t', '\n', encoding=self.ENCODING)
+            doc.unlink()
+            text = text.getvalue()
+
+            digest = hashlib.sha1(text.encode(self.ENCODING)).digest()
+            with self.__lock:
+                if (self.__savedDigests.get(filename) == digest and os.path.exists(filename)):
+                    return
+
+            folder = os.path.dirname(filename)
+            if (folder):
+                os.makedirs(folder, exist_ok=True)
+
+            tempFilename = '{}.{}.tmp'.format(filename, os.getpid())
+            with open(tempFilename, 'w', encoding=self.ENCODING) as xmlFile:
+                xmlFile.write(text)
+                xmlFile.flush()
+                os.fsync(xmlFile.fileno())
+            os.replace(tempFilename, filename)
+
+            with self.__lock:
+                self.__savedDigests[filename] = digest
+        except Exception as exception:
+            self.sessionSaveFailed.emit(filename, str(exception))
+            return
+
+        self.sessionSaved.emit(filename)
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Find the hash session of a disc before it is scanned.
+#
+# The hash session file name comes from the disc hash, which is only known
+# after HandBrake has scanned the disc.  This file maps a cheap fingerprint
+# of the disc, made from the disc structure files alone, to the disc hash.
+# A disc that has been scanned before is recognized in milliseconds and its
+# hash session can be loaded without scanning it again.
+#
+# The fingerprint is a SHA-1 of the names, sizes and contents of the IFO files
+# of a DVD (or the .bdmv and .mpls files of a Blu-ray).  These files are small
+# and describe the whole disc.  Unlike the scan cache fingerprint the
+# modification times aren't used, so a copy of a disc in another folder is
+# still recognized.
+#
+# The map is an SQLite database shared by every running instance, so a disc
+# recorded by one instance is found by the others.
+# =============================================================================
+
+import hashlib, os, os.path, sqlite3, sys
+
+from ScanCache import ScanCache
+
+class SessionFingerprints(object):
+    """ Read and write the map of disc fingerprints to disc hashes.
+    """
+    # The BUP files are copies of the IFO files, the .clpi files are large.
+    EXTENSIONS = ['.ifo', '.bdmv', '.mpls']
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            fingerprint TEXT PRIMARY KEY,
+            hash TEXT);
+        """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(self.SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+
+    def __str__(self):
+        return 'SessionFingerprints: "{}", {} disc(s)'.format(self.filename, len(self))
+
+    def close(self):
+        self.connection.close()
+
+    @classmethod
+    def fingerprint(cls, source):
+        """ Return the fingerprint of a disc source folder, or None if it
+            doesn't have any disc structure files.
+        """
+        fingerprint = hashlib.sha1()
+        count = 0
+
+        try:
+            for filename in ScanCache.structureFiles(source):
+                if (os.path.splitext(filename)[1].lower() not in cls.EXTENSIONS):
+                    continue
+
+                fingerprint.update('{}:{}\0'.format(os.path.basename(filename).upper(),
+                    os.path.getsize(filename)).encode('utf-8'))
+                with open(filename, 'rb') as structureFile:
+                    fingerprint.update(structureFile.read())
+                count += 1
+        except OSError:
+            return None
+
+        if (not count):
+            return None
+
+        return fingerprint.hexdigest()
+
+    def get(self, fingerprint):
+        """ Return the disc hash for a fingerprint, or None.
+        """
+        if (fingerprint is None):
+            return None
+
+        row = self.connection.execute('SELECT hash FROM fingerprints WHERE fingerprint = ?',
+            (fingerprint,)).fetchone()
+        if (row is None):
+            return None
+
+        return row[0]
+
+    def record(self, fingerprint, discHash):
+        """ Record the disc hash for a fingerprint.
+        """
+        if (not fingerprint or not discHash):
+            return
+
+        try:
+            with self.connection:
+                self.connection.execute('INSERT OR REPLACE INTO fingerprints VALUES (?, ?)',
+                    (fingerprint, discHash))
+        except sqlite3.Error as exception:
+            sys.stderr.write('Unable to write the session fingerprints "{}": {}\n'.format(
+                self.filename, exception))
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# A local SQLite index of the saved session files.
+#
+# The automatic disc session folder can hold thousands of "<hash>.state.xml"
+# files, often on a network share.  Listing the folder is slow, and the file
+# names say nothing about the disc.  The index keeps the disc title, volume
+# label, source, number of titles and save time of each session, so sessions
+# can be searched and the recently saved discs listed without touching the
+# folder.
+#
+# Every session saved or deleted by the main window is recorded here.  A
+# session saved by something else (another computer sharing the folder) is
+# picked up by sync(), which reads only the files whose size or modification
+# time has changed and drops the rows of files that no longer exist.  An index
+# that has never been built from the folder (PRAGMA user_version is 0) is
+# built the first time the main window uses it, even if the file was created
+# by a batch run.
+# =============================================================================
+
+import datetime, os, os.path, sqlite3, sys
+from collections import namedtuple
+
+sys.path.insert(0, '../DiscData')
+
+from Disc import Disc
+import XMLDocument
+
+SessionSummary = namedtuple('SessionSummary', ['filename', 'hash', 'discTitle',
+    'volumeLabel', 'source', 'titleCount', 'saved'])
+SessionSummary.__doc__ = """ A session as stored in the index.  saved is the
+    modification time of the file, as a "YYYY-MM-DD HH:MM:SS" string.
+"""
+
+def ReadSessionSummary(app, filename):
+    """ Read the index data from a session file.
+    """
+    disc = Disc(app)
+
+    doc = XMLDocument.Parse(filename)
+    for childNode in doc.documentElement.childNodes:
+        if (childNode.localName == disc.XMLNAME):
+            disc.fromXML(childNode, None)
+    doc.unlink()
+
+    return SessionSummary(filename, disc.titles.hash, disc.title,
+        disc.sourceLabel, disc.source, len(disc.titles), None)
+
+class SessionIndex(object):
+    """ Read and write the session index.
+    """
+
+    FILENAME_SUFFIX = '.state.xml'
+
+    # PRAGMA user_version of an index that has been built from the folder.
+    BUILT_VERSION = 1
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            filename TEXT PRIMARY KEY,
+            folder TEXT,
+            hash TEXT,
+            discTitle TEXT,
+            volumeLabel TEXT,
+            source TEXT,
+            titleCount INTEGER,
+            saved TEXT,
+            mtime INTEGER,
+            size INTEGER);
+        CREATE INDEX IF NOT EXISTS sessions_folder ON sessions (folder);
+        CREATE INDEX IF NOT EXISTS sessions_hash ON sessions (hash);
+        CREATE INDEX IF NOT EXISTS sessions_saved ON sessions (saved);
+        """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(self.SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def __str__(self):
+        return 'SessionIndex: "{}", {} session(s)'.format(self.filename, len(self))
+
+    @property
+    def isNew(self):
+        """ True until the index has been built from the session folder (see
+            markBuilt()).
+        """
+        return self.connection.execute('PRAGMA user_version').fetchone()[0] < self.BUILT_VERSION
+
+    @classmethod
+    def key(cls, filename):
+        return os.path.normcase(os.path.abspath(filename))
+
+    def close(self):
+        self.connection.close()
+
+    def find(self, text, limit=200):
+        """ Return the sessions whose disc title, volume label, source or
+            hash contain the text, most recently saved first.
+        """
+        pattern = '%{}%'.format(text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_'))
+
+        return self.__sessions(
+            'WHERE discTitle LIKE ?1 ESCAPE \'\\\' OR volumeLabel LIKE ?1 ESCAPE \'\\\' '
+            'OR source LIKE ?1 ESCAPE \'\\\' OR hash LIKE ?1 ESCAPE \'\\\' '
+            'ORDER BY saved DESC LIMIT ?2', (pattern, limit))
+
+    def findHash(self, discHash):
+        """ Return the sessions of a disc hash, most recently saved first.
+        """
+        return self.__sessions('WHERE hash = ? ORDER BY saved DESC', (discHash,))
+
+    def markBuilt(self):
+        """ Record that the index has been built from the session folder.
+        """
+        with self.connection:
+            self.connection.execute('PRAGMA user_version = {}'.format(self.BUILT_VERSION))
+
+    def recent(self, limit=20):
+        """ Return the most recently saved sessions.
+        """
+        return self.__sessions('ORDER BY saved DESC LIMIT ?', (limit,))
+
+    def record(self, summary):
+        """ Add or replace a session.  The save time, size and modification
+            time come from the file.
+        """
+        filename = self.key(summary.filename)
+        status = os.stat(filename)
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (filename, os.path.dirname(filename), summary.hash, summary.discTitle,
+                summary.volumeLabel, summary.source, summary.titleCount,
+                self.__savedTime(status), status.st_mtime_ns, status.st_size))
+
+    def remove(self, filename):
+        with self.connection:
+            self.connection.execute('DELETE FROM sessions WHERE filename = ?', (self.key(filename),))
+
+    def removeOrphans(self):
+        """ Remove the sessions whose files no longer exist.  Returns the
+            number removed.
+        """
+        orphans = [(filename,) for filename, in self.connection.execute('SELECT filename FROM sessions')
+            if (not os.path.exists(filename))]
+
+        with self.connection:
+            self.connection.executemany('DELETE FROM sessions WHERE filename = ?', orphans)
+
+        return len(orphans)
+
+    def sync(self, folder, readSummary, prefix=''):
+        """ Bring the index up to date with the session files in a folder.
+            readSummary(filename) returns the SessionSummary of a file; it
+            is only called for new and changed files.  Returns the number of
+            sessions (added or updated, removed).
+        """
+        folder = self.key(folder or os.curdir)
+
+        indexed = {}
+        for filename, mtime, size in self.connection.execute(
+            'SELECT filename, mtime, size FROM sessions WHERE folder = ?', (folder,)):
+            indexed[filename] = (mtime, size)
+
+        updated = 0
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if (not entry.name.startswith(prefix) or not entry.name.endswith(self.FILENAME_SUFFIX)
+                    or not entry.is_file()):
+                    continue
+
+                filename = self.key(entry.path)
+                status = entry.stat()
+                if (indexed.pop(filename, None) == (status.st_mtime_ns, status.st_size)):
+                    continue
+
+                try:
+                    self.record(readSummary(filename))
+                except Exception as exception:
+                    sys.stderr.write('Unable to index the session "{}": {}\n'.format(filename, exception))
+                    continue
+                updated += 1
+
+        with self.connection:
+            self.connection.executemany('DELETE FROM sessions WHERE filename = ?',
+                [(filename,) for filename in indexed.keys()])
+
+        self.markBuilt()
+
+        return (updated, len(indexed))
+
+    def __savedTime(self, status):
+        return datetime.datetime.fromtimestamp(status.st_mtime).isoformat(' ', 'seconds')
+
+    def __sessions(self, where, parameters):
+        return [SessionSummary(*row) for row in self.connection.execute(
+            'SELECT filename, hash, discTitle, volumeLabel, source, titleCount, saved '
+            'FROM sessions {}'.format(where), parameters)]
@@ -0,0 +1,604 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Scan a source with "HandBrakeCLI -t 0" without blocking the GUI.  The scan
+# is driven by the QProcess signals, there is no time limit, and it can be
+# canceled at any time.
+#
+# HandBrake writes the scan results to stderr and its progress to stdout as
+# lines like:
+#
+#   Scanning title 3 of 18, preview 5, 50.00 %
+#
+# The progress lines end with a carriage return and may be split across reads,
+# the same as the encoding progress lines (see HandBrakeProgress).
+#
+# ParallelSourceScanner scans a disc with many titles faster.  It scans title
+# 1 ("-t 1"), which also reports how many titles the disc has, then scans the
+# remaining titles with up to maximumJobs "-t N" processes at a time.  The
+# title blocks are merged into the title 1 output so Disc.parse() sees the same
+# text a "-t 0" scan produces.
+#
+# The scan output is decoded and split into title blocks as it arrives, so the
+# titles can be shown while the scan is still running.  A block ("+ title N:"
+# and the indented "+" lines after it) is complete when the next line that
+# isn't part of it arrives.
+# =============================================================================
+
+import re, sys, time
+
+from PyQt5.QtCore import (
+    QCoreApplication,
+    QObject,
+    QProcess,
+    pyqtSignal
+    )
+
+TITLE_RE = re.compile(r'\+ title (\d+):')
+TITLE_LINE_RE = re.compile(r'\s+\+ ')
+DURATION_RE = re.compile(r'\s+\+ duration: (\d+):(\d+):(\d+)')
+TITLE_COUNT_RE = re.compile(r'scan: (?:DVD|BD) has (\d+) title')
+
+class TitleBlockSplitter(object):
+    """ Split scan output into title blocks as it arrives.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """ Set all object members to their initial values.
+        """
+        self.__line = ''
+        self.__block = []
+
+    def feed(self, text):
+        """ Add decoded scan output.  Returns a list of the title blocks (as
+            strings) completed by the text.
+        """
+        blocks = []
+
+        lines = (self.__line + text).splitlines(True)
+        self.__line = ''
+        if (lines and not lines[-1].endswith(('\n', '\r'))):
+            self.__line = lines.pop()
+
+        for line in lines:
+            if (TITLE_RE.match(line)):
+                if (self.__block):
+                    blocks.append(''.join(self.__block))
+                self.__block = [line]
+            elif (self.__block and TITLE_LINE_RE.match(line)):
+                self.__block.append(line)
+            elif (self.__block):
+                blocks.append(''.join(self.__block))
+                self.__block = []
+
+        return blocks
+
+    def finish(self):
+        """ Return a list of the title blocks still being collected when the
+            scan output ends.
+        """
+        blocks = self.feed('\n') if (self.__line) else []
+        if (self.__block):
+            blocks.append(''.join(self.__block))
+
+        self.clear()
+        return blocks
+
+class ScanProgress(object):
+    """ The most recent scan progress reported by HandBrakeCLI.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __str__(self):
+        return 'ScanProgress: title {} of {}, preview {}, {:.2f} %'.format(
+            self.title, self.titleCount, self.preview, self.percent)
+
+    def clear(self):
+        """ Set all object members to their initial values.
+        """
+        self.title = 0
+        self.titleCount = 0
+        self.preview = 0
+        self.percent = 0.0
+
+    @property
+    def fraction(self):
+        """ Return the fraction (0.0 to 1.0) of the scan that is complete.
+        """
+        if (not self.titleCount):
+            return 0.0
+
+        return min(1.0, ((self.title - 1) + (self.percent / 100.0)) / self.titleCount)
+
+    @property
+    def hasProgress(self):
+        return (self.titleCount > 0)
+
+class SourceScanner(QObject):
+    """ Run a HandBrakeCLI scan asynchronously.
+
+        Exactly one of scanFinished, scanFailed or scanCanceled is emitted for
+        each scan, unless it is replaced by calling start() again.
+    """
+
+    scanProgress = pyqtSignal(object)           # ScanProgress
+    scanFinished = pyqtSignal(str)              # The scan output (stderr)
+    scanFailed = pyqtSignal(str, str)           # Error message, scan output
+    scanCanceled = pyqtSignal()
+    titleScanned = pyqtSignal(str)              # One title block
+
+    ENCODING = 'ISO-8859-1'
+
+    PROGRESS_RE = re.compile(rb'Scanning title (\d+) of (\d+)(?:, preview (\d+))?, (\d+(?:\.\d+)?) %')
+    LINE_END_RE = re.compile(rb'[\r\n]')
+
+    MAXIMUM_BUFFER = 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.process = None
+        self.progress = ScanProgress()
+        self.program = None
+        self.arguments = []
+
+        self.__canceled = False
+        self.__output = []
+        self.__splitter = TitleBlockSplitter()
+        self.__blocks = []
+        self.__stdoutBuffer = b''
+
+    @property
+    def isRunning(self):
+        return (self.process is not None)
+
+    def cancel(self):
+        """ Stop a running scan.  scanCanceled is emitted when the process has
+            ended.
+        """
+        if (self.process is None):
+            return
+
+        self.__canceled = True
+        self.process.kill()
+
+    def start(self, program, arguments):
+        """ Start a scan.  A scan that is already running is canceled first.
+        """
+        if (self.process is not None):
+            self.cancel()
+            self.__scanComplete()
+
+        self.program = program
+        self.arguments = list(arguments)
+
+        self.progress.clear()
+        self.__canceled = False
+        self.__output = []
+        self.__splitter.clear()
+        self.__blocks = []
+        self.__stdoutBuffer = b''
+
+        # The process is passed to the handlers so that signals from a
+        # canceled scan are ignored.
+        process = QProcess(self)
+        process.errorOccurred.connect(lambda error, process=process: self.__onErrorOccurred(process, error))
+        process.finished.connect(lambda exitCode, exitStatus, process=process: self.__onFinished(process, exitCode, exitStatus))
+        process.readyReadStandardError.connect(lambda process=process: self.__onReadyReadStandardError(process))
+        process.readyReadStandardOutput.connect(lambda process=process: self.__onReadyReadStandardOutput(process))
+        self.process = process
+
+        self.process.start(self.program, self.arguments)
+
+    def __scanComplete(self):
+        """ Release the process.  Returns the scan output.
+        """
+        process, self.process = self.process, None
+
+        # Collect anything that hasn't been read yet.
+        self.__readStandardError(process)
+        process.deleteLater()
+
+        # Don't know why but HandBrake returns the results on StandardError not StandardOutput (linux)
+        return ''.join(self.__output)
+
+    def __onErrorOccurred(self, process, error):
+        """ Called when the process fails to start, crashes or is killed.
+        """
+        if (process is not self.process):
+            return
+
+        if (error not in [QProcess.FailedToStart, QProcess.Crashed]):
+            return
+
+        errorString = self.process.errorString()
+        out = self.__scanComplete()
+
+        if (self.__canceled):
+            self.scanCanceled.emit()
+        elif (error == QProcess.FailedToStart):
+            self.scanFailed.emit('HandBrakeCLI did not start.\n{}'.format(errorString), out)
+        else:
+            self.scanFailed.emit('HandBrakeCLI crashed.\n{}'.format(errorString), out)
+
+    def __onFinished(self, process, exitCode, exitStatus):
+        if (process is not self.process or exitStatus != QProcess.NormalExit):
+            return          # A crash or kill is handled by __onErrorOccurred().
+
+        out = self.__scanComplete()
+
+        if (self.__canceled):
+            self.scanCanceled.emit()
+        elif (exitCode != 0):
+            self.scanFailed.emit('Exit code = {}'.format(exitCode), out)
+        else:
+            self.__blocks.extend(self.__splitter.finish())
+            self.__emitTitles()
+            self.scanFinished.emit(out)
+
+    def __onReadyReadStandardError(self, process):
+        if (process is self.process):
+            self.__readStandardError(process)
+            self.__emitTitles()
+
+    def __emitTitles(self):
+        blocks, self.__blocks = self.__blocks, []
+        for block in blocks:
+            self.titleScanned.emit(block)
+
+    def __readStandardError(self, process):
+        """ Decode and keep the new output.  ISO-8859-1 is a single byte
+            encoding so each read can be decoded on its own.
+        """
+        text = bytes(process.readAllStandardError()).decode(self.ENCODING)
+        self.__output.append(text)
+
+        self.__blocks.extend(self.__splitter.feed(text))
+
+    def __onReadyReadStandardOutput(self, process):
+        """ Parse the most recent complete progress line.
+        """
+        if (process is not self.process):
+            return
+
+        lines = self.LINE_END_RE.split(self.__stdoutBuffer + bytes(process.readAllStandardOutput()))
+        self.__stdoutBuffer = lines.pop()[-self.MAXIMUM_BUFFER:]
+
+        for line in reversed(lines):
+            match = self.PROGRESS_RE.search(line)
+            if (match is None):
+                continue
+
+            title, titleCount, preview, percent = match.groups()
+
+            self.progress.title = int(title)
+            self.progress.titleCount = int(titleCount)
+            self.progress.preview = int(preview or 0)
+            self.progress.percent = float(percent)
+
+            self.scanProgress.emit(self.progress)
+            return
+
+def MergeTitleScans(firstOut, titleOuts, minimumDuration=0):
+    """ Merge the output of a "-t 1" scan with the outputs of "-t N" scans
+        of the other titles and return the text a "-t 0" scan would produce.
+
+        The title blocks ("+ title N:" and the indented "+" lines after it)
+        are taken from each output and inserted, in title number order, where
+        the title 1 block was.  A "-t 0" scan skips titles shorter than
+        HandBrake's --min-duration, so those are dropped as well.
+    """
+    headLines, firstBlock, tailLines = SplitTitleBlock(firstOut)
+
+    blocks = []
+    for block in [firstBlock] + [SplitTitleBlock(titleOut)[1] for titleOut in titleOuts]:
+        if (block and TitleBlockDuration(block) >= minimumDuration):
+            blocks.append(block)
+
+    blocks.sort(key=TitleBlockNumber)
+
+    return ''.join(headLines + [line for block in blocks for line in block] + tailLines)
+
+def SplitTitleBlock(out):
+    """ Return a tuple of the lines before the title blocks, the title block
+        lines and the lines after them.  The lines keep their line ends.
+    """
+    lines = out.splitlines(True)
+
+    for first, line in enumerate(lines):
+        if (TITLE_RE.match(line)):
+            break
+    else:
+        return (lines, [], [])
+
+    last = first + 1
+    while (last < len(lines) and (TITLE_LINE_RE.match(lines[last]) or TITLE_RE.match(lines[last]))):
+        last += 1
+
+    return (lines[:first], lines[first:last], lines[last:])
+
+def TitleBlockDuration(block):
+    """ Return the duration of a title block in seconds, or 0.
+    """
+    for line in block:
+        match = DURATION_RE.match(line)
+        if (match is not None):
+            hours, minutes, seconds = match.groups()
+            return (int(hours) * 3600) + (int(minutes) * 60) + int(seconds)
+
+    return 0
+
+def TitleBlockNumber(block):
+    return int(TITLE_RE.match(block[0]).group(1))
+
+class ParallelSourceScanner(QObject):
+    """ Run a HandBrakeCLI scan asynchronously, scanning up to maximumJobs
+        titles at a time.  The signals and methods are the same as the
+        SourceScanner ones.
+
+        If maximumJobs is 1, the source isn't a disc, or the arguments don't
+        include "-t 0", a single "-t 0" scan is run.
+
+        titlesScanned is emitted with the title blocks scanned so far, in
+        title number order, each time another title is scanned.
+    """
+
+    scanProgress = pyqtSignal(object)           # ScanProgress
+    scanFinished = pyqtSignal(str)              # The scan output (stderr)
+    scanFailed = pyqtSignal(str, str)           # Error message, scan output
+    scanCanceled = pyqtSignal()
+    titlesScanned = pyqtSignal(str)             # The title blocks so far
+
+    MINIMUM_DURATION = 10           # HandBrakeCLI --min-duration default
+
+    def __init__(self, parent=None, maximumJobs=1):
+        super().__init__(parent)
+
+        self.maximumJobs = maximumJobs
+        self.program = None
+        self.arguments = []
+        self.progress = ScanProgress()
+
+        self.__firstOut = ''
+        self.__titleNumbers = []
+        self.__titleOuts = {}
+        self.__titleBlocks = {}
+        self.__workers = {}
+        self.__canceled = False
+        self.__failed = False
+        self.__failure = None
+
+    @property
+    def isRunning(self):
+        return bool(self.__workers)
+
+    def cancel(self):
+        """ Stop a running scan.  scanCanceled is emitted when every scan
+            process has ended.
+        """
+        if (not self.__workers):
+            return
+
+        self.__canceled = True
+        for worker in list(self.__workers.values()):
+            worker.cancel()
+
+    def start(self, program, arguments):
+        """ Start a scan.  A scan that is already running is stopped first.
+        """
+        self.__stopWorkers()
+
+        self.program = program
+        self.arguments = list(arguments)
+
+        self.progress.clear()
+        self.__firstOut = ''
+        self.__titleNumbers = []
+        self.__titleOuts = {}
+        self.__titleBlocks = {}
+        self.__canceled = False
+        self.__failed = False
+
+        if (self.maximumJobs > 1 and self.__titleArgumentIndex() is not None):
+            self.__startWorker(1)
+        else:
+            self.__startWorker(0)
+
+    def __onWorkerCanceled(self, worker, title):
+        if (self.__removeWorker(worker, title)):
+            self.__complete()
+
+    def __onWorkerFailed(self, worker, title, message, out):
+        if (not self.__removeWorker(worker, title)):
+            return
+
+        if (not self.__failed and not self.__canceled):
+            self.__failed = True
+            self.__failure = (message, out)
+            self.cancel()
+
+        self.__complete()
+
+    def __onWorkerFinished(self, worker, title, out):
+        if (not self.__removeWorker(worker, title)):
+            return
+
+        if (self.__canceled or self.__failed):
+            self.__complete()
+            return
+
+        if (title == 0):
+            self.scanFinished.emit(out)
+            return
+
+        if (title == 1):
+            self.__firstOut = out
+            match = TITLE_COUNT_RE.search(out)
+            titleCount = int(match.group(1)) if (match is not None) else 1
+            self.__titleNumbers = list(range(2, titleCount + 1))
+            self.progress.titleCount = titleCount
+        else:
+            self.__titleOuts[title] = out
+
+        self.progress.title = 1 + len(self.__titleOuts)
+        self.progress.percent = 100.0
+        self.scanProgress.emit(self.progress)
+
+        while (self.__titleNumbers and len(self.__workers) < self.maximumJobs):
+            self.__startWorker(self.__titleNumbers.pop(0))
+
+        if (not self.__workers):
+            self.scanFinished.emit(MergeTitleScans(self.__firstOut,
+                [self.__titleOuts[title] for title in sorted(self.__titleOuts)],
+                self.MINIMUM_DURATION))
+
+    def __onWorkerTitleScanned(self, worker, title, block):
+        """ Pass the titles on as they are scanned.  The short titles a "-t 0"
+            scan would have skipped are dropped.
+        """
+        if (worker is not self.__workers.get(title) or self.__canceled or self.__failed):
+            return
+
+        lines = block.splitlines(True)
+        if (title != 0 and TitleBlockDuration(lines) < self.MINIMUM_DURATION):
+            return
+
+        self.__titleBlocks[TitleBlockNumber(lines)] = block
+        self.titlesScanned.emit(''.join([self.__titleBlocks[number]
+            for number in sorted(self.__titleBlocks)]))
+
+    def __onWorkerProgress(self, worker, title, progress):
+        """ Pass the "-t 0" and "-t 1" progress on.  The progress of the
+            other titles is reported as each one finishes.
+        """
+        if (title in [0, 1] and worker is self.__workers.get(title)):
+            self.progress.title = progress.title
+            self.progress.titleCount = progress.titleCount
+            self.progress.preview = progress.preview
+            self.progress.percent = progress.percent
+            self.scanProgress.emit(self.progress)
+
+    def __complete(self):
+        """ Emit scanFailed or scanCanceled once the last worker has ended.
+        """
+        if (self.__workers):
+            return
+
+        if (self.__failed):
+            message, out = self.__failure
+            self.scanFailed.emit(message, out)
+        else:
+            self.scanCanceled.emit()
+
+    def __removeWorker(self, worker, title):
+        """ Forget a worker that has ended.  Returns False if the worker
+            belongs to a scan that was replaced.
+        """
+        if (self.__workers.get(title) is not worker):
+            return False
+
+        del self.__workers[title]
+        worker.deleteLater()
+        return True
+
+    def __startWorker(self, title):
+        arguments = list(self.arguments)
+        index = self.__titleArgumentIndex()
+        if (index is not None):
+            arguments[index] = str(title)
+
+        worker = SourceScanner(self)
+        worker.scanProgress.connect(lambda progress, worker=worker, title=title: self.__onWorkerProgress(worker, title, progress))
+        worker.scanFinished.connect(lambda out, worker=worker, title=title: self.__onWorkerFinished(worker, title, out))
+        worker.scanFailed.connect(lambda message, out, worker=worker, title=title: self.__onWorkerFailed(worker, title, message, out))
+        worker.scanCanceled.connect(lambda worker=worker, title=title: self.__onWorkerCanceled(worker, title))
+        worker.titleScanned.connect(lambda block, worker=worker, title=title: self.__onWorkerTitleScanned(worker, title, block))
+        self.__workers[title] = worker
+
+        worker.start(self.program, arguments)
+
+    def __stopWorkers(self):
+        """ Stop the workers of a scan that is being replaced.  Their signals
+            are ignored once they are removed from __workers.
+        """
+        workers, self.__workers = self.__workers, {}
+        for worker in workers.values():
+            worker.cancel()
+            worker.deleteLater()
+
+    def __titleArgumentIndex(self):
+        """ Return the index of the "0" after "-t" in the arguments, or None.
+        """
+        for index in range(len(self.arguments) - 1):
+            if (self.arguments[index] == '-t' and self.arguments[index + 1] == '0'):
+                return index + 1
+
+        return None
+
+if __name__ == '__main__':
+
+    # Benchmark a serial "-t 0" scan against parallel scans of the same
+    # source, e.g. "python3 SourceScanner.py /media/dvd 4".
+
+    if (len(sys.argv) < 2):
+        sys.exit('Usage: SourceScanner.py source [maximum jobs [HandBrakeCLI]]')
+
+    source = sys.argv[1]
+    maximumJobs = int(sys.argv[2]) if (len(sys.argv) > 2) else 4
+    program = sys.argv[3] if (len(sys.argv) > 3) else 'HandBrakeCLI'
+
+    app = QCoreApplication(sys.argv)
+
+    def scan(jobs):
+        scanner = ParallelSourceScanner(None, jobs)
+        result = {}
+
+        def onFinished(out):
+            result['out'] = out
+            app.quit()
+
+        def onFailed(message, out):
+            result['error'] = message
+            app.quit()
+
+        scanner.scanFinished.connect(onFinished)
+        scanner.scanFailed.connect(onFailed)
+
+        started = time.perf_counter()
+        scanner.start(program, ['-t', '0', '-i', source])
+        app.exec_()
+
+        if ('error' in result):
+            sys.exit('{} job(s): {}'.format(jobs, result['error']))
+
+        return (time.perf_counter() - started, result['out'])
+
+    serialTime, serialOut = scan(1)
+    print ('serial      : {:8.2f} s'.format(serialTime))
+
+    for jobs in sorted(set([2, maximumJobs])):
+        parallelTime, parallelOut = scan(jobs)
+        same = (SplitTitleBlock(serialOut)[1] == SplitTitleBlock(parallelOut)[1])
+        print ('{:2} jobs     : {:8.2f} s, {:.2f}x, same titles: {}'.format(jobs, parallelTime,
+            serialTime / parallelTime if parallelTime else 0.0, same))
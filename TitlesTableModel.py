@@ -0,0 +1,331 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# The model behind the disc titles table.
+#
+# The table used to be a QTableWidget with a QWidget, a layout and a QCheckBox
+# in every row, plus an item and a data connector for each cell.  A Blu-ray
+# folder with hundreds of playlists took seconds to fill.  TitlesTableModel
+# reads the titles directly: the view only asks for the rows it draws, the
+# select column is a checkable column, and the title name is edited in place.
+# Changes are written straight to the titles, so there is nothing to transfer
+# from the table.
+#
+# VisibleTitlesProxyModel hides the titles that aren't visible (short titles)
+# instead of hiding rows in the view.  Row numbers used by the main window are
+# rows of the proxy model.
+#
+# TitleSelectionIndex keeps the selected titles, so the main window can ask
+# whether any title is selected, and which selected, visible title comes
+# first, on every checkbox click without looking at every title.  A click
+# updates the index for one title.  The index is rebuilt when the titles, their
+# order or their visibility change, which already touches every row.
+# =============================================================================
+
+from PyQt5.QtCore import (
+    pyqtSignal,
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel
+    )
+
+class TitleSelectionIndex(object):
+    """ The selected titles, and the selected, visible titles, of a list of
+        titles.  Titles are identified by their title number.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.__selected)
+
+    def clear(self):
+        self.__titles = []
+        self.__rows = {}                    # title number: row
+        self.__selected = set()             # title numbers
+        self.__selectedVisible = set()      # title numbers
+        self.__firstRow = None              # row of the first selected, visible title
+        self.__firstRowValid = True
+
+    @property
+    def firstSelectedVisibleTitle(self):
+        """ The selected, visible title with the lowest row, or None.
+        """
+        if (not self.__firstRowValid):
+            # Only needed after the first title was unselected or hidden.
+            self.__firstRow = min((self.__rows[titleNumber] for titleNumber in self.__selectedVisible),
+                default=None)
+            self.__firstRowValid = True
+
+        if (self.__firstRow is None):
+            return None
+
+        return self.__titles[self.__firstRow]
+
+    @property
+    def hasSelectedTitle(self):
+        return bool(self.__selected)
+
+    @property
+    def selectedTitles(self):
+        """ The selected titles, in no particular order.
+        """
+        return [self.__titles[self.__rows[titleNumber]] for titleNumber in self.__selected]
+
+    def rebuild(self, titles):
+        """ Index a list of titles, in row order.
+        """
+        self.clear()
+
+        self.__titles = titles
+        for row, title in enumerate(titles):
+            self.__rows[title.titleNumber] = row
+            self.update(title)
+
+    def row(self, title):
+        """ Return the row of the title, or -1.
+        """
+        return self.__rows.get(title.titleNumber, -1)
+
+    def update(self, title):
+        """ Update the index after the title was selected/unselected or
+            shown/hidden.
+        """
+        titleNumber = title.titleNumber
+        row = self.__rows.get(titleNumber)
+        if (row is None):
+            return
+
+        if (title.selected):
+            self.__selected.add(titleNumber)
+        else:
+            self.__selected.discard(titleNumber)
+
+        if (title.selected and title.visible):
+            self.__selectedVisible.add(titleNumber)
+            if (self.__firstRowValid and (self.__firstRow is None or row < self.__firstRow)):
+                self.__firstRow = row
+        elif (titleNumber in self.__selectedVisible):
+            self.__selectedVisible.discard(titleNumber)
+            if (row == self.__firstRow):
+                self.__firstRowValid = False
+
+class TitlesTableModel(QAbstractTableModel):
+    """ A table model over the titles of a disc, in title order.  The title
+        of a row is returned for Qt.UserRole.
+    """
+
+    # The user checked or unchecked a title.
+    titleChecked = pyqtSignal(object)
+    # The user changed the name of a title.
+    titleRenamed = pyqtSignal(object)
+
+    SELECT_COLUMN = 0
+    TITLE_NUMBER_COLUMN = 1
+    DURATION_COLUMN = 2
+    ASPECT_COLUMN = 3
+    TITLE_NAME_COLUMN = 4
+
+    HEADER_LABELS = ['Select', 'Title #', 'Duration', 'Aspect', 'Title Name']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.__titles = []
+        self.__editable = True
+        self.__selectionIndex = TitleSelectionIndex()
+
+    @property
+    def editable(self):
+        return self.__editable
+
+    @property
+    def firstSelectedVisibleTitle(self):
+        return self.__selectionIndex.firstSelectedVisibleTitle
+
+    @property
+    def hasSelectedTitle(self):
+        return self.__selectionIndex.hasSelectedTitle
+
+    @property
+    def titles(self):
+        return self.__titles
+
+    def clearSelections(self):
+        """ Unselect all the titles.
+        """
+        for title in self.__selectionIndex.selectedTitles:
+            title.selected = False
+            self.__selectionIndex.update(title)
+
+        self.__emitColumnChanged(self.SELECT_COLUMN)
+
+    def columnCount(self, parent=QModelIndex()):
+        if (parent.isValid()):
+            return 0
+
+        return len(self.HEADER_LABELS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if (not index.isValid()):
+            return None
+
+        title = self.__titles[index.row()]
+        column = index.column()
+
+        if (role == Qt.UserRole):
+            return title
+
+        if (column == self.SELECT_COLUMN):
+            if (role == Qt.CheckStateRole):
+                return Qt.Checked if (title.selected) else Qt.Unchecked
+            return None
+
+        if (role in (Qt.DisplayRole, Qt.EditRole)):
+            if (column == self.TITLE_NUMBER_COLUMN):
+                return title.titleNumber
+            if (column == self.DURATION_COLUMN):
+                return str(title.duration)
+            if (column == self.ASPECT_COLUMN):
+                return str(title.displayAspectRatio)
+            if (column == self.TITLE_NAME_COLUMN):
+                return title.title
+
+        if (role == Qt.TextAlignmentRole and column != self.TITLE_NAME_COLUMN):
+            return Qt.AlignCenter
+
+        return None
+
+    def flags(self, index):
+        if (not index.isValid()):
+            return Qt.NoItemFlags
+
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if (self.__editable):
+            if (index.column() == self.SELECT_COLUMN):
+                flags |= Qt.ItemIsUserCheckable
+            elif (index.column() == self.TITLE_NAME_COLUMN):
+                flags |= Qt.ItemIsEditable
+
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if (orientation == Qt.Horizontal and role == Qt.DisplayRole):
+            return self.HEADER_LABELS[section]
+
+        return super().headerData(section, orientation, role)
+
+    def refresh(self):
+        """ Redraw every row, e.g. after titles were selected, renamed or
+            hidden by the program.
+        """
+        self.__selectionIndex.rebuild(self.__titles)
+
+        if (self.__titles):
+            self.dataChanged.emit(self.index(0, 0),
+                self.index(len(self.__titles) - 1, len(self.HEADER_LABELS) - 1))
+
+    def row(self, title):
+        """ Return the row of the title, or -1.
+        """
+        return self.__selectionIndex.row(title)
+
+    def rowCount(self, parent=QModelIndex()):
+        if (parent.isValid()):
+            return 0
+
+        return len(self.__titles)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if (not index.isValid()):
+            return False
+
+        title = self.__titles[index.row()]
+
+        if (index.column() == self.SELECT_COLUMN and role == Qt.CheckStateRole):
+            title.selected = (value == Qt.Checked)
+            self.__selectionIndex.update(title)
+            self.dataChanged.emit(index, index)
+            self.titleChecked.emit(title)
+            return True
+
+        if (index.column() == self.TITLE_NAME_COLUMN and role == Qt.EditRole):
+            title.title = str(value)
+            self.dataChanged.emit(index, index)
+            self.titleRenamed.emit(title)
+            return True
+
+        return False
+
+    def setEditable(self, editable):
+        """ Allow/prevent checking and renaming titles, e.g. while transcoding.
+        """
+        self.__editable = editable
+        for column in (self.SELECT_COLUMN, self.TITLE_NAME_COLUMN):
+            self.__emitColumnChanged(column)
+
+    def setTitles(self, titles):
+        """ Show the titles of a Titles object, in title order.
+        """
+        self.beginResetModel()
+        self.__titles = [titles.titlesByOrderNumber[key]
+            for key in sorted(titles.titlesByOrderNumber.keys())]
+        self.__selectionIndex.rebuild(self.__titles)
+        self.endResetModel()
+
+    def title(self, row):
+        return self.__titles[row]
+
+    def __emitColumnChanged(self, column):
+        if (self.__titles):
+            self.dataChanged.emit(self.index(0, column),
+                self.index(len(self.__titles) - 1, column))
+
+class VisibleTitlesProxyModel(QSortFilterProxyModel):
+    """ Show only the visible titles of a TitlesTableModel.
+    """
+
+    def filterAcceptsRow(self, sourceRow, sourceParent):
+        return self.sourceModel().title(sourceRow).visible
+
+    def refresh(self):
+        """ Filter the titles again after their visibility changed.
+        """
+        self.sourceModel().refresh()
+        self.invalidateFilter()
+
+    def row(self, title):
+        """ Return the row of the title, or -1 if the title is hidden.
+        """
+        sourceRow = self.sourceModel().row(title)
+        if (sourceRow < 0):
+            return -1
+
+        return self.mapFromSource(self.sourceModel().index(sourceRow, 0)).row()
+
+    def title(self, row):
+        return self.data(self.index(row, 0), Qt.UserRole)
+
+    @property
+    def titles(self):
+        """ The visible titles, in title order.
+        """
+        return [self.title(row) for row in range(self.rowCount())]
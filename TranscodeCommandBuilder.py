@@ -0,0 +1,520 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Build the HandBrakeCLI commands for a disc.  The builder only needs the
+# preferences and the disc data, not the widgets, so the same commands are
+# built by the main window and by the headless batch mode.
+#
+# The commands are lists of arguments, not strings, so titles and paths with
+# quotes or spaces are passed to HandBrakeCLI exactly as they are.
+#
+# Every command gets a fingerprint of everything that affects the output: the
+# program, the command line, the chapter names, the preset and the source
+# files.  See OutputIndex.
+#
+# The builder can share a TranscodeCommandCache with other builders, e.g. so
+# Preview and Run for an unchanged disc build the commands, and write the
+# chapters files, only once.  The commands are cached per title (and episode)
+# and keyed on a tuple of every setting the command is built from.  A title
+# whose settings haven't changed gets its command, and its chapters file, from
+# the cache.
+# =============================================================================
+
+import hashlib, os, os.path, sys, tempfile
+
+sys.path.insert(0, '../Helpers')
+sys.path.insert(0, '../DiscData')
+
+from ChapterRanges import ChapterRanges
+from Chapters import Chapters
+from PyHelpers import TemporaryFilesList
+from Titles import Titles
+from TranscodeQueue import TranscodeCommand
+
+class TranscodeCommandCache(object):
+    """ The commands built for each title and episode, keyed on the settings
+        they were built from.
+
+        The cache owns the chapters files of the cached commands.  A file is
+        retired when the command for its title is rebuilt, and only deleted by
+        purge() or clear() because a running job may still be using it.
+    """
+
+    def __init__(self):
+        self.__commands = {}            # Key -> TranscodeCommand
+        self.__keys = {}                # (title number, episode number, chapter range) -> key
+        self.__retiredChaptersFilenames = TemporaryFilesList()
+
+    def __len__(self):
+        return len(self.__commands)
+
+    def clear(self):
+        """ Empty the cache and delete every chapters file.
+        """
+        for command in self.__commands.values():
+            if (command.chaptersFilename is not None):
+                self.__retiredChaptersFilenames.append(command.chaptersFilename)
+
+        self.__commands = {}
+        self.__keys = {}
+        self.purge()
+
+    def get(self, key):
+        """ Return the cached command for a key or None.  A command whose
+            chapters file has gone is not returned.
+        """
+        command = self.__commands.get(key)
+        if (command is None):
+            return None
+
+        if (command.chaptersFilename is not None and not os.path.exists(command.chaptersFilename)):
+            del self.__commands[key]
+            return None
+
+        return command
+
+    def purge(self):
+        """ Delete the chapters files of the retired commands.  Only call this
+            when no transcoding job is using them.
+        """
+        self.__retiredChaptersFilenames.unlink()
+        self.__retiredChaptersFilenames = TemporaryFilesList()
+
+    def put(self, slot, key, command):
+        """ Cache the command for a title slot (title number, episode number,
+            chapter range).  The command previously built for the slot is
+            retired.
+        """
+        oldKey = self.__keys.get(slot)
+        if (oldKey is not None and oldKey != key):
+            oldCommand = self.__commands.pop(oldKey, None)
+            if (oldCommand is not None and oldCommand.chaptersFilename is not None):
+                self.__retiredChaptersFilenames.append(oldCommand.chaptersFilename)
+
+        self.__keys[slot] = key
+        self.__commands[key] = command
+
+class TranscodeCommandBuilder(object):
+    """ Build the transcoding commands for the selected titles of a disc.
+    """
+
+    def __init__(self, preferences, disc, cache=None):
+        self.preferences = preferences
+        self.disc = disc
+        self.cache = cache
+
+        self.__sourceFingerprint = None
+        self.__discKey = None
+        self.__discAudioTags = None
+        self.__preset = None
+
+    @property
+    def discKey(self):
+        """ Return a tuple of the preferences and disc settings used to build
+            every command.  Calculated once per builder.
+        """
+        if (self.__discKey is None):
+            self.__discKey = (
+                self.preferences.executables.handBrakeCLI,
+                str(self.preferences.options),
+                str(self.preferences.filenameTemplates),
+                str(self.preferences.filenameReplacement),
+                str(self.preset),
+                tuple(str(mixdown) for mixdown in self.preferences.mixdowns),
+                self.disc.source,
+                self.disc.destination,
+                self.disc.title,
+                self.disc.preset,
+                self.disc.filenameTemplate,
+                self.disc.episodeNumberPrecision,
+                self.disc.nodvdnav,
+                self.audioTrackStatesKey(self.disc.audioTrackStates),
+                self.subtitleTrackStatesKey(self.disc.subtitleTrackStates),
+                self.customCropKey(self.disc.customCrop),
+                self.sourceFingerprint
+                )
+
+        return self.__discKey
+
+    @property
+    def discAudioTags(self):
+        """ Return the mixdown tags of the disc audio tracks.  Calculated once
+            per builder.
+        """
+        if (self.__discAudioTags is None):
+            self.__discAudioTags = self.disc.audioTrackStates.getMixdownTags(self.preferences.mixdowns)
+
+        return self.__discAudioTags
+
+    @property
+    def preset(self):
+        """ Return the disc preset.  Looked up once per builder.
+        """
+        if (self.__preset is None):
+            self.__preset = self.preferences.presets.getByName(self.disc.preset)
+
+        return self.__preset
+
+    @classmethod
+    def audioTrackStatesKey(cls, audioTrackStates):
+        return tuple([(audioTrackState.track, audioTrackState.primaryMixdown,
+            audioTrackState.secondaryMixdown) for audioTrackState in audioTrackStates])
+
+    @classmethod
+    def customCropKey(cls, customCrop):
+        return (customCrop.isCustom, customCrop.isDefault, customCrop.top,
+            customCrop.bottom, customCrop.left, customCrop.right)
+
+    @classmethod
+    def subtitleTrackStatesKey(cls, subtitleTrackStates):
+        return tuple([(subtitleTrackState.track, subtitleTrackState.forced,
+            subtitleTrackState.burn, subtitleTrackState.default)
+            for subtitleTrackState in subtitleTrackStates])
+
+    def titleKey(self, title):
+        """ Return a tuple of the title settings used to build its commands.
+        """
+        return (
+            title.titleNumber,
+            title.title,
+            title.audioTrackStates.isCustom,
+            self.audioTrackStatesKey(title.audioTrackStates),
+            title.subtitleTrackStates.isCustom,
+            self.subtitleTrackStatesKey(title.subtitleTrackStates),
+            self.customCropKey(title.customCrop),
+            title.chapters.processChoice,
+            title.chapters.firstChapterNumber,
+            tuple([(chapter.chapterNumber, chapter.title) for chapter in title.chapters]),
+            title.chapterRanges.processChoice,
+            title.chapterRanges.firstChapter,
+            title.chapterRanges.lastChapter,
+            tuple([(chapterRange.title, chapterRange.firstChapter, chapterRange.lastChapter)
+                for chapterRange in title.chapterRanges])
+            )
+
+    @property
+    def sourceFingerprint(self):
+        """ Return a fingerprint of the source.  For a disc folder it is the
+            names, sizes and modification times of the files in the VIDEO_TS
+            folder.  For a file (e.g. an image) it is the file size and
+            modification time.
+
+            The fingerprint is only calculated once per builder.
+        """
+        if (self.__sourceFingerprint is None):
+            source = self.disc.source
+            videoTS = os.path.join(source, 'VIDEO_TS')
+            if (os.path.isdir(videoTS)):
+                source = videoTS
+
+            entries = []
+            if (os.path.isdir(source)):
+                for entry in sorted(os.scandir(source), key=lambda entry: entry.name):
+                    if (entry.is_file()):
+                        stat = entry.stat()
+                        entries.append('{}:{}:{}'.format(entry.name, stat.st_size, int(stat.st_mtime)))
+            elif (os.path.exists(source)):
+                stat = os.stat(source)
+                entries.append('{}:{}'.format(stat.st_size, int(stat.st_mtime)))
+
+            self.__sourceFingerprint = hashlib.sha1('\n'.join(entries).encode('utf-8')).hexdigest()
+
+        return self.__sourceFingerprint
+
+    def makeFingerprint(self, arguments, chaptersFilename):
+        """ Return the fingerprint for a command.
+
+            The chapters file has a new temporary name every time the commands
+            are built so its contents are used instead of its name.
+        """
+        fingerprint = hashlib.sha1()
+
+        commandLine = '\0'.join(arguments)
+        if (chaptersFilename is not None):
+            with open(chaptersFilename, 'rb') as chaptersFile:
+                chaptersHash = hashlib.sha1(chaptersFile.read()).hexdigest()
+            commandLine = commandLine.replace(chaptersFilename, chaptersHash)
+
+        preset = self.preset
+
+        for value in [self.preferences.executables.handBrakeCLI, commandLine,
+            preset.name, preset.settings, self.disc.source, self.sourceFingerprint]:
+            fingerprint.update(value.encode('utf-8'))
+            fingerprint.update(b'\0')
+
+        return fingerprint.hexdigest()
+
+    def selectedTitles(self):
+        """ Return a list of the visible, selected titles.
+        """
+        return self.disc.titles.matchingTitles(
+            Titles.FLAG_SELECTED | Titles.FLAG_VISIBLE).matchingTitles
+
+    def makeCommandLineForTitle(self, title, episodeNumber, chapterRangeEpisode=None):
+        """ Returns a tuple of the list of arguments, the output file name (with
+            path) and the filename of the chapter titles (may be None).
+
+            The output file name is used to check if the file exists.
+        """
+
+        preset = self.preset
+
+        # Build the file name
+        # ===================
+        audioTags = []
+        if (title.audioTrackStates.isCustom):
+            audioTags = title.audioTrackStates.getMixdownTags(self.preferences.mixdowns)
+        else:
+            audioTags = self.discAudioTags
+
+        chapterRangeEpisodeTitle = ''
+        if (chapterRangeEpisode is not None):
+            chapterRangeEpisodeTitle = chapterRangeEpisode.title
+
+        filename = self.preferences.filenameTemplates.buildFilename(
+            self.disc.filenameTemplate,
+            self.disc.title,
+            preset.tag,
+            audioTags,
+            '{0:0{1}d}'.format(episodeNumber, self.disc.episodeNumberPrecision),
+            title.title,
+            chapterRangeEpisodeTitle
+            )
+
+        # Assemble the commands
+        # =====================
+        commands = []
+        outputFilename = os.path.join(self.disc.destination, filename)
+
+        commands.extend(['-i', self.disc.source])
+        commands.extend(['-o', outputFilename])
+
+        commands.extend(['-t', '{0:d}'.format(title.titleNumber)])
+
+        # Build the audio commands
+        # ------------------------
+        trackMixdowns = []
+
+        tracks = []
+        encoders = []
+        mixdowns = []
+        sampleRates = []
+        bitrates = []
+        dynamicRangeCompressions = []
+        gains = []
+
+        trackNames = []
+
+        if (title.audioTrackStates.isCustom):
+            for audioTrackState in title.audioTrackStates:
+                if (not audioTrackState.track):
+                    continue
+
+                mixdown = self.preferences.mixdowns.getByName(audioTrackState.primaryMixdown)
+                if (mixdown is not None):
+                    trackMixdowns.append((audioTrackState.track, mixdown))
+
+                mixdown = self.preferences.mixdowns.getByName(audioTrackState.secondaryMixdown)
+                if (mixdown is not None):
+                    trackMixdowns.append((audioTrackState.track, mixdown))
+        else:
+            for audioTrackState in self.disc.audioTrackStates:
+                if (not audioTrackState.track):
+                    continue
+
+                mixdown = self.preferences.mixdowns.getByName(audioTrackState.primaryMixdown)
+                if (mixdown is not None):
+                    trackMixdowns.append((audioTrackState.track, mixdown))
+
+                mixdown = self.preferences.mixdowns.getByName(audioTrackState.secondaryMixdown)
+                if (mixdown is not None):
+                    trackMixdowns.append((audioTrackState.track, mixdown))
+
+        for track, mixdown in trackMixdowns:
+            tracks.append(str(track))
+            encoders.append(mixdown.encoder)
+            mixdowns.append(mixdown.mixdown)
+            sampleRates.append(mixdown.sampleRate)
+            bitrates.append(mixdown.bitrate)
+            dynamicRangeCompressions.append(mixdown.dynamicRangeCompression)
+            gains.append(mixdown.gain)
+
+
+        if (len(tracks) > 0):
+            commands.extend(['-a', ','.join(tracks)])
+            commands.extend(['-E', ','.join(encoders)])
+            commands.extend(['-6', ','.join(mixdowns)])
+            commands.extend(['-R', ','.join(sampleRates)])
+            commands.extend(['-B', ','.join(bitrates)])
+            commands.extend(['-D', ','.join(dynamicRangeCompressions)])
+            commands.extend(['--gain', ','.join(gains)])
+
+        # Build the subititle commands
+        # ----------------------------
+        tracks = []
+        forced = []
+        burn = None
+        default = None
+
+        if (title.subtitleTrackStates.isCustom):
+            subtitleTrackStates = title.subtitleTrackStates
+        else:
+            subtitleTrackStates = self.disc.subtitleTrackStates
+
+        index = 0
+        for subtitleTrackState in subtitleTrackStates:
+            found = False
+            if (subtitleTrackState.track):         # a.k.a. user selected
+                tracks.append(subtitleTrackState.track)
+                found = True
+
+            if (found == True):
+                index += 1
+                if (subtitleTrackState.forced):
+                    forced.append(str(index))
+                if (subtitleTrackState.burn):
+                    burn = str(index)
+                if (subtitleTrackState.default):
+                    default = str(index)
+
+        if (len(tracks) > 0):
+            commands.extend(['-s', ','.join(tracks)])
+
+            if (len(forced) > 0):
+                commands.append('--subtitle-forced={}'.format(','.join(forced)))
+            if (burn is not None):
+                commands.append('--subtitle-burned={}'.format(burn))
+            if (default is not None):
+                commands.append('--subtitle-default={}'.format(default))
+
+        # nodvdnav processing
+        # ----------------------
+
+        if (self.disc.nodvdnav):
+            commands.append('--no-dvdnav')
+
+        # custom cropping processing
+        # --------------------------
+        cropping = None
+
+        # Custom cropping can be done at the title level or at the application level.
+        if (title.customCrop.isCustom):
+            cropping = title.customCrop
+        elif (title.customCrop.isDefault and self.disc.customCrop.isCustom):
+            cropping = self.disc.customCrop
+
+        if (cropping is not None):
+            commands.extend(['--crop', '{}:{}:{}:{}'.format(
+                cropping.top, cropping.bottom,
+                cropping.left, cropping.right)])
+
+        # Chapter processing
+        # ------------------
+        chaptersFilename = None
+        if (title.chapters.processChoice == Chapters.PROCESS_MARKERS):
+            commands.append('-m')
+        elif (title.chapters.processChoice == Chapters.PROCESS_NAMES):
+            chaptersFile, chaptersFilename = tempfile.mkstemp(suffix='.chapters.csv', prefix='wxHEP_')
+
+            for chapter in title.chapters:
+                if (self.preferences.options.numberChapterNames):
+                    line = '{},{}: {}\r\n'.format(chapter.chapterNumber,
+                        chapter.chapterNumber + title.chapters.firstChapterNumber - 1,
+                        chapter.title)
+                else:
+                    line = '{},{}\r\n'.format(chapter.chapterNumber, chapter.title)
+
+                os.write(chaptersFile, line.encode(encoding='utf-8'))
+
+            os.close(chaptersFile)
+            commands.append('--markers={}'.format(chaptersFilename))
+
+        if (title.chapterRanges.processChoice == ChapterRanges.PROCESS_RANGE):
+            if (title.chapterRanges.firstChapter == title.chapterRanges.lastChapter):
+                commands.extend(['-c', '{}'.format(title.chapterRanges.firstChapter)])
+            else:
+                commands.extend(['-c', '{}-{}'.format(title.chapterRanges.firstChapter, title.chapterRanges.lastChapter)])
+        elif (title.chapterRanges.processChoice == title.chapterRanges.PROCESS_EPISODES and chapterRangeEpisode is not None):
+            commands.extend(['-c', '{}-{}'.format(chapterRangeEpisode.firstChapter, chapterRangeEpisode.lastChapter)])
+
+        # Last but not least, the preset settings
+        # ---------------------------------------
+        commands.extend(preset.arguments)
+
+        return (commands, outputFilename, chaptersFilename)
+
+    def makeCommand(self, title, episodeNumber, chapterRangeIndex=None, chapterRangeEpisode=None):
+        """ Return the TranscodeCommand for a title (or one episode of a title)
+            and True if its chapters file is new, i.e. not owned by the cache.
+        """
+        if (self.cache is not None):
+            slot = (title.titleNumber, episodeNumber, chapterRangeIndex)
+            key = (self.discKey, self.titleKey(title), episodeNumber, chapterRangeIndex)
+
+            command = self.cache.get(key)
+            if (command is not None):
+                return (command, False)
+
+        arguments, outputFilename, chaptersFilename = self.makeCommandLineForTitle(
+            title, episodeNumber, chapterRangeEpisode)
+        command = TranscodeCommand(arguments, outputFilename, chaptersFilename,
+            self.makeFingerprint(arguments, chaptersFilename))
+
+        if (self.cache is None):
+            return (command, True)
+
+        self.cache.put(slot, key, command)
+        return (command, False)
+
+    def makeCommandLines(self, titles):
+        """ Returns a tupple:
+
+            * A list of TranscodeCommand tuples (arguments, output file name
+              and chapters file name) for the selected, visible titles.  The
+              list will be empty if nothing is found.
+            * A list chapter filenames that are created for titles with custom
+              chapters names.  The list will be empty is nothing is found.
+              The list is used to delete the files after all transcoding is
+              complete.  If the builder has a cache the cache owns the
+              chapters files and the list is always empty.
+
+            Each command has a fingerprint.  Use OutputIndex.partition() to
+            find the commands whose output already exists and is up to date.
+        """
+        commands = []
+        chaptersFilenames = TemporaryFilesList()
+        episodeNumber = self.disc.firstEpisodeNumber
+
+        for title in titles:
+            if (title.chapterRanges.processChoice == ChapterRanges.PROCESS_EPISODES):
+                for chapterRangeIndex, chapterRange in enumerate(title.chapterRanges):
+                    command, newFile = self.makeCommand(title, episodeNumber,
+                        chapterRangeIndex, chapterRange)
+                    commands.append(command)
+                    if (newFile and command.chaptersFilename is not None):
+                        chaptersFilenames.append(command.chaptersFilename)
+                    episodeNumber += 1
+            else:
+                command, newFile = self.makeCommand(title, episodeNumber)
+                commands.append(command)
+                if (newFile and command.chaptersFilename is not None):
+                    chaptersFilenames.append(command.chaptersFilename)
+                episodeNumber += 1
+
+        return (commands, chaptersFilenames)
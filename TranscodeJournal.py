@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# An on-disk record of a transcoding queue.  The journal is rewritten every
+# time a job changes state so that a crash, power failure or accidental close
+# doesn't lose the queue.  The file is written to a temporary file first and
+# then renamed over the journal, so the journal is always either the old
+# version or the new version, never half of each.
+#
+# The journal is deleted when the queue finishes normally.  If it exists at
+# startup the previous queue did not finish and can be resumed.
+#
+# Several instances may share a journal file.  The process that runs the queue
+# owns the journal: it holds an exclusive lock on "<journal>.lock" (see
+# acquire()) until the queue finishes or the process ends.  A journal whose
+# owner is still running is not resumed or removed by anyone else.  The lock
+# goes away with the process, so the journal of a crashed queue can be
+# resumed.  Without fcntl (Windows) the journal isn't locked.
+# =============================================================================
+
+import datetime, os, os.path, shlex, sys, xml.dom, xml.dom.minidom as minidom
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+sys.path.insert(0, '../Helpers')
+
+import XMLHelpers
+
+from TranscodeQueue import TranscodeJob
+
+class TranscodeJournal(object):
+    """ Read and write the transcoding queue journal file.
+    """
+    XMLNAME = 'TranscodeJournal'
+    JOB_XMLNAME = 'Job'
+
+    DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+    def __init__(self, filename):
+        self.filename = filename
+
+        self.__lockFile = None
+
+    @property
+    def exists(self):
+        return os.path.exists(self.filename)
+
+    @property
+    def lockFilename(self):
+        return '{}.lock'.format(self.filename)
+
+    def acquire(self):
+        """ Take ownership of the journal.  Returns False if another running
+            process owns it, or the lock file can't be opened.
+        """
+        if (self.__lockFile is not None or fcntl is None):
+            return True
+
+        try:
+            lockFile = open(self.lockFilename, 'a')
+        except OSError:
+            return False
+
+        try:
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lockFile.close()
+            return False
+
+        self.__lockFile = lockFile
+        return True
+
+    def release(self):
+        """ Give up ownership of the journal.  The lock file is left for the
+            next owner; removing it would let two processes lock different
+            files.
+        """
+        if (self.__lockFile is None):
+            return
+
+        fcntl.flock(self.__lockFile.fileno(), fcntl.LOCK_UN)
+        self.__lockFile.close()
+        self.__lockFile = None
+
+    @classmethod
+    def datetimeFromString(cls, text):
+        if (not text):
+            return None
+
+        return datetime.datetime.strptime(text, cls.DATETIME_FORMAT)
+
+    @classmethod
+    def datetimeToString(cls, value):
+        if (value is None):
+            return ''
+
+        return value.strftime(cls.DATETIME_FORMAT)
+
+    @classmethod
+    def isOutputComplete(cls, job):
+        """ Return True if the job finished and its output file is still there.
+            A job that was running when the journal was last written may have
+            left a partial output file behind so only finished jobs count.
+        """
+        return (job.state == TranscodeJob.STATE_DONE and job.outputFilename
+            and os.path.exists(job.outputFilename)
+            and os.path.getsize(job.outputFilename) > 0)
+
+    def read(self):
+        """ Read the journal.  Returns a list of TranscodeJob objects, with the
+            state and times they had when the journal was last written.
+        """
+        jobs = []
+
+        doc = minidom.parse(self.filename)
+        if (doc.documentElement.nodeName != self.XMLNAME):
+            raise RuntimeError(('Can''t read file "{}" because the "{}" '
+            'element is missing or misplaced!').format(self.filename, self.XMLNAME))
+
+        program = XMLHelpers.GetXMLAttribute(doc.documentElement, 'Program', '')
+
+        for childNode in doc.documentElement.childNodes:
+            if (childNode.localName != self.JOB_XMLNAME):
+                continue
+
+            job = TranscodeJob(
+                XMLHelpers.GetXMLAttributeAsInt(childNode, 'JobNumber', len(jobs) + 1),
+                XMLHelpers.GetXMLAttribute(childNode, 'Program', program),
+                shlex.split(XMLHelpers.GetXMLAttribute(childNode, 'Command', '')),
+                XMLHelpers.GetXMLAttribute(childNode, 'OutputFilename', '') or None,
+                XMLHelpers.GetXMLAttribute(childNode, 'ChaptersFilename', '') or None,
+                XMLHelpers.GetXMLAttribute(childNode, 'Description', ''),
+                XMLHelpers.GetXMLAttribute(childNode, 'Fingerprint', ''))
+
+            job.state = XMLHelpers.GetXMLAttribute(childNode, 'State', TranscodeJob.STATE_PENDING)
+            job.startTime = self.datetimeFromString(XMLHelpers.GetXMLAttribute(childNode, 'StartTime', ''))
+            job.stopTime = self.datetimeFromString(XMLHelpers.GetXMLAttribute(childNode, 'StopTime', ''))
+            job.pausedTime = datetime.timedelta(seconds=float(
+                XMLHelpers.GetXMLAttribute(childNode, 'PausedSeconds', '0') or '0'))
+
+            exitCode = XMLHelpers.GetXMLAttribute(childNode, 'ExitCode', '')
+            if (exitCode):
+                job.exitCode = int(exitCode)
+
+            jobs.append(job)
+
+        doc.unlink()
+
+        return jobs
+
+    def readForResume(self):
+        """ Read the journal and reset every job that has to be run again to
+            pending.
+
+            * Jobs that finished, and whose output still exists, are left done.
+            * Jobs stopped by the user are left stopped.
+            * Everything else is run again.  A job that needs a chapters file
+              that no longer exists can't be run again and is marked failed.
+        """
+        jobs = self.read()
+
+        for job in jobs:
+            if (job.state == TranscodeJob.STATE_STOPPED):
+                continue
+            if (self.isOutputComplete(job)):
+                continue
+
+            job.clear()
+
+            if (job.chaptersFilename and not os.path.exists(job.chaptersFilename)):
+                job.state = TranscodeJob.STATE_FAILED
+                job.errorString = 'The chapters file "{}" is missing.'.format(job.chaptersFilename)
+
+        return jobs
+
+    def remove(self):
+        """ Delete the journal.
+        """
+        if (self.exists):
+            os.remove(self.filename)
+
+    def write(self, queue):
+        """ Write the queue to the journal, atomically.
+        """
+        dom = minidom.getDOMImplementation()
+        doc = dom.createDocument(None, self.XMLNAME, None)
+        parentElement = doc.documentElement
+
+        parentElement.setAttribute('MaximumJobs', str(queue.maximumJobs))
+        parentElement.setAttribute('StartTime', self.datetimeToString(queue.startTime))
+
+        for job in queue.jobs:
+            element = doc.createElement(self.JOB_XMLNAME)
+            parentElement.appendChild(element)
+
+            element.setAttribute('JobNumber', str(job.jobNumber))
+            element.setAttribute('State', job.state)
+            element.setAttribute('Program', job.program)
+            element.setAttribute('Command', job.command)
+            element.setAttribute('OutputFilename', job.outputFilename or '')
+            element.setAttribute('ChaptersFilename', job.chaptersFilename or '')
+            element.setAttribute('Description', job.description)
+            element.setAttribute('Fingerprint', job.fingerprint)
+            element.setAttribute('StartTime', self.datetimeToString(job.startTime))
+            element.setAttribute('StopTime', self.datetimeToString(job.stopTime))
+            element.setAttribute('PausedSeconds', str(job.totalPausedTime().total_seconds()))
+            if (job.exitCode is not None):
+                element.setAttribute('ExitCode', str(job.exitCode))
+
+        tempFilename = '{}.{}.tmp'.format(self.filename, os.getpid())
+        with open(tempFilename, 'w', encoding='utf-8') as xmlFile:
+            doc.writexml(xmlFile, '', '\t', '\n', encoding='utf-8')
+            xmlFile.flush()
+            os.fsync(xmlFile.fileno())
+        os.replace(tempFilename, self.filename)
+
+        doc.unlink()
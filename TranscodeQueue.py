@@ -0,0 +1,640 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# A queue of HandBrakeCLI transcoding jobs.  Up to "maximumJobs" QProcess
+# objects are run at the same time.  When a job finishes the next pending job
+# is started, until the queue is empty.
+#
+# The queue knows nothing about the widgets.  It reports what it's doing
+# through the jobStarted, jobProgress, jobFinished and queueFinished signals.
+#
+# Jobs can be added while the queue is running, e.g. the next disc.  They are
+# started as soon as a worker is free.
+#
+# If the queue has a journal it is rewritten every time a job changes state,
+# and deleted and released when the queue finishes.  If the queue has an output index every
+# job that finishes successfully is recorded in it.
+#
+# Running jobs can be paused and resumed with SIGSTOP and SIGCONT, one at a
+# time or the whole queue.  A paused job keeps its worker slot.  The time a job
+# (or the queue) is paused is left out of its elapsed time, and so out of the
+# ETA.
+#
+# Each running job has a worker slot, 0 to maximumJobs - 1.  If the queue has
+# a ProcessPriority the slot picks the CPUs the job runs on.
+# =============================================================================
+
+import datetime, os, shlex, signal, sys
+
+from collections import (
+    deque,
+    namedtuple
+    )
+
+from PyQt5.QtCore import (
+    QObject,
+    QProcess,
+    pyqtSignal
+    )
+
+from HandBrakeProgress import HandBrakeProgressParser
+
+TranscodeCommand = namedtuple('TranscodeCommand', ['arguments', 'outputFilename',
+    'chaptersFilename', 'fingerprint'])
+
+def ArgumentsToString(arguments):
+    """ Return a list of arguments as a single string, quoted so that
+        shlex.split() returns the same list.  Used to display, log and journal
+        commands, never to run them.
+    """
+    return ' '.join([shlex.quote(argument) for argument in arguments])
+
+class TranscodeJob(object):
+    """ A single HandBrakeCLI transcoding command and its run time state.
+
+        The arguments are a list that is passed to the process as is, no
+        shell or command line parsing is involved.
+    """
+
+    STATE_PENDING = 'Pending'
+    STATE_RUNNING = 'Running'
+    STATE_PAUSED = 'Paused'
+    STATE_DONE = 'Done'
+    STATE_FAILED = 'Failed'
+    STATE_STOPPED = 'Stopped'
+
+    def __init__(self, jobNumber, program, arguments, outputFilename=None,
+        chaptersFilename=None, description='', fingerprint=''):
+        self.jobNumber = jobNumber
+        self.program = program
+        self.arguments = list(arguments)
+        self.outputFilename = outputFilename
+        self.chaptersFilename = chaptersFilename
+        self.description = description
+        self.fingerprint = fingerprint
+
+        self.clear()
+
+    def __str__(self):
+        return 'TranscodeJob: #{} {}, "{}"'.format(self.jobNumber, self.state,
+            self.commandLine)
+
+    def clear(self):
+        """ Set all of the run time members to their initial values.
+        """
+        self.state = self.STATE_PENDING
+        self.startTime = None
+        self.stopTime = None
+        self.pauseTime = None
+        self.pausedTime = datetime.timedelta()
+        self.exitCode = None
+        self.error = None
+        self.errorString = ''
+        self.process = None
+        self.slot = None
+        self.progressParser = HandBrakeProgressParser()
+
+    @property
+    def command(self):
+        """ Return the arguments as a string.
+        """
+        return ArgumentsToString(self.arguments)
+
+    @property
+    def commandLine(self):
+        """ Return the full command line, including the program, as a string.
+        """
+        return ArgumentsToString([self.program] + self.arguments)
+
+    @property
+    def elapsed(self):
+        """ Return the time the job has been running, not counting the time it
+            was paused, as a timedelta.  Returns None if the job hasn't
+            started.
+        """
+        if (self.startTime is None):
+            return None
+
+        stopTime = self.stopTime
+        if (stopTime is None):
+            stopTime = datetime.datetime.now()
+
+        return stopTime - self.startTime - self.totalPausedTime(stopTime)
+
+    @property
+    def fraction(self):
+        """ Return the fraction (0.0 to 1.0) of the job that is complete.
+        """
+        if (self.state == self.STATE_DONE):
+            return 1.0
+
+        return self.progress.fraction
+
+    @property
+    def progress(self):
+        return self.progressParser.progress
+
+    @property
+    def remaining(self):
+        """ Return an estimate of the time left for a running job as a
+            timedelta.  Returns None if there isn't enough information yet.
+
+            HandBrake's ETA only covers the current task so it is only used for
+            the last task.  Otherwise the elapsed time is extrapolated.
+        """
+        if (not self.isStarted or not self.progress.hasProgress):
+            return None
+
+        if (self.progress.task == self.progress.taskCount and self.progress.eta is not None):
+            return self.progress.eta
+
+        fraction = self.fraction
+        if (fraction <= 0.0):
+            return None
+
+        return self.elapsed * ((1.0 - fraction) / fraction)
+
+    @property
+    def isActive(self):
+        """ Return True if the job is pending, running or paused.
+        """
+        return (self.state in [self.STATE_PENDING, self.STATE_RUNNING, self.STATE_PAUSED])
+
+    @property
+    def isPaused(self):
+        return (self.state == self.STATE_PAUSED)
+
+    @property
+    def isRunning(self):
+        return (self.state == self.STATE_RUNNING)
+
+    @property
+    def isStarted(self):
+        """ Return True if the job has a process, i.e. it is running or paused.
+        """
+        return (self.state in [self.STATE_RUNNING, self.STATE_PAUSED])
+
+    def totalPausedTime(self, now=None):
+        """ Return the total time the job has been paused as a timedelta,
+            including the current pause.
+        """
+        if (self.pauseTime is None):
+            return self.pausedTime
+
+        if (now is None):
+            now = datetime.datetime.now()
+
+        return self.pausedTime + (now - self.pauseTime)
+
+class TranscodeQueue(QObject):
+    """ Run a list of transcoding jobs, several at a time.
+    """
+
+    jobStarted = pyqtSignal(object)
+    jobProgress = pyqtSignal(object)
+    jobPausedChanged = pyqtSignal(object)
+    jobFinished = pyqtSignal(object)
+    queueFinished = pyqtSignal()
+
+    def __init__(self, jobs, maximumJobs=1, journal=None, outputIndex=None,
+        priority=None, parent=None):
+        """ Only the jobs that are pending are run.  Jobs in any other state,
+            e.g. done jobs from a resumed journal, are kept for the totals.
+        """
+        super().__init__(parent)
+
+        self.maximumJobs = max(1, maximumJobs)
+        self.jobs = list(jobs)
+        self.journal = journal
+        self.outputIndex = outputIndex
+        self.priority = priority
+
+        self.__pendingJobs = deque([job for job in self.jobs
+            if (job.state == TranscodeJob.STATE_PENDING)])
+        self.__runningJobs = []
+
+        self.startTime = None
+        self.stopTime = None
+
+        self.isPaused = False
+        self.pauseTime = None
+        self.pausedTime = datetime.timedelta()
+
+    @classmethod
+    def newJobs(cls, program, commands, firstJobNumber=1, description=''):
+        """ Return a list of new TranscodeJob objects for a list of
+            TranscodeCommand tuples.
+        """
+        return [TranscodeJob(jobNumber, program, command.arguments,
+            command.outputFilename, command.chaptersFilename, description,
+            command.fingerprint)
+            for jobNumber, command in enumerate(commands, firstJobNumber)]
+
+    def addJobs(self, jobs):
+        """ Add more jobs to a running queue.  Pending jobs are started as soon
+            as there is a free worker.
+        """
+        for job in jobs:
+            self.jobs.append(job)
+            if (job.state == TranscodeJob.STATE_PENDING):
+                self.__pendingJobs.append(job)
+
+        self.__writeJournal()
+        self.__startJobs()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    @property
+    def canPause(self):
+        """ Return True if processes can be paused on this platform.
+        """
+        return hasattr(signal, 'SIGSTOP')
+
+    @property
+    def elapsed(self):
+        """ Return the wall clock time since the queue started, not counting
+            the time the queue was paused, as a timedelta.
+        """
+        if (self.startTime is None):
+            return None
+
+        stopTime = self.stopTime
+        if (stopTime is None):
+            stopTime = datetime.datetime.now()
+
+        pausedTime = self.pausedTime
+        if (self.pauseTime is not None):
+            pausedTime += stopTime - self.pauseTime
+
+        return stopTime - self.startTime - pausedTime
+
+    @property
+    def eta(self):
+        """ Return an estimate of the time left until the whole queue is
+            finished as a timedelta.  Returns None if there isn't enough
+            information yet.
+
+            Pending jobs are assumed to take as long as the average finished
+            job or, before any job has finished, the average estimated length
+            of the running jobs.  The remaining work is shared across the
+            workers, but the queue can't finish before its slowest running job.
+        """
+        if (self.isFinished):
+            return datetime.timedelta()
+
+        runningRemaining = [job.remaining for job in self.__runningJobs]
+        if (None in runningRemaining):
+            return None
+
+        durations = [job.elapsed for job in self.jobs if (job.state == TranscodeJob.STATE_DONE)]
+        if (not durations):
+            durations = [job.elapsed + job.remaining for job in self.__runningJobs]
+        if (not durations):
+            return None
+
+        averageDuration = sum(durations, datetime.timedelta()) / len(durations)
+
+        work = sum(runningRemaining, datetime.timedelta()) + (averageDuration * len(self.__pendingJobs))
+        eta = work / min(self.maximumJobs, len(self.__runningJobs) + len(self.__pendingJobs))
+
+        if (runningRemaining):
+            eta = max(eta, max(runningRemaining))
+
+        return eta
+
+    @property
+    def fraction(self):
+        """ Return the fraction (0.0 to 1.0) of the queue that is complete.
+            Stopped and failed jobs count as complete, they won't be run.
+        """
+        if (not self.jobs):
+            return 1.0
+
+        complete = 0.0
+        for job in self.jobs:
+            if (job.isActive):
+                complete += job.fraction
+            else:
+                complete += 1.0
+
+        return complete / len(self.jobs)
+
+    @property
+    def isFinished(self):
+        return (not self.__pendingJobs and not self.__runningJobs)
+
+    @property
+    def runningJobs(self):
+        return list(self.__runningJobs)
+
+    @property
+    def totalJobTime(self):
+        """ Return the sum of the elapsed times of all of the jobs that have
+            run.  With more than one job running at a time this will be larger
+            than the queue elapsed time.
+        """
+        total = datetime.timedelta()
+        for job in self.jobs:
+            if (job.elapsed is not None):
+                total += job.elapsed
+
+        return total
+
+    def countJobs(self, state):
+        """ Return the number of jobs in a given state.
+        """
+        return len([job for job in self.jobs if (job.state == state)])
+
+    def pause(self):
+        """ Pause the whole queue.  Every running job is paused and no new jobs
+            are started until the queue is resumed.
+        """
+        if (self.isPaused or not self.canPause):
+            return
+
+        self.isPaused = True
+        self.pauseTime = datetime.datetime.now()
+
+        for job in self.runningJobs:
+            self.pauseJob(job)
+
+    def pauseJob(self, job):
+        """ Pause a single running job.  The job keeps its worker slot.
+            Returns True if the job was paused.
+        """
+        if (not job.isRunning or not self.canPause):
+            return False
+
+        if (not self.__signalJob(job, signal.SIGSTOP)):
+            return False
+
+        job.state = TranscodeJob.STATE_PAUSED
+        job.pauseTime = datetime.datetime.now()
+
+        self.__writeJournal()
+        self.jobPausedChanged.emit(job)
+
+        return True
+
+    def resume(self):
+        """ Resume the whole queue.  Every paused job, including jobs that
+            were paused one at a time, is resumed and pending jobs are started
+            again.
+        """
+        if (self.isPaused):
+            self.isPaused = False
+            self.pausedTime += datetime.datetime.now() - self.pauseTime
+            self.pauseTime = None
+
+        for job in self.runningJobs:
+            self.resumeJob(job)
+
+        self.__startJobs()
+
+    def resumeJob(self, job):
+        """ Resume a single paused job.  Returns True if the job was resumed.
+        """
+        if (not job.isPaused):
+            return False
+
+        if (not self.__signalJob(job, signal.SIGCONT)):
+            return False
+
+        job.state = TranscodeJob.STATE_RUNNING
+        job.pausedTime = job.totalPausedTime()
+        job.pauseTime = None
+
+        self.__writeJournal()
+        self.jobPausedChanged.emit(job)
+
+        return True
+
+    def start(self):
+        """ Start running jobs.  Up to maximumJobs are started immediately.
+        """
+        self.startTime = datetime.datetime.now()
+        self.stopTime = None
+
+        self.__writeJournal()
+
+        if (self.isFinished):
+            self.__queueComplete()
+            return
+
+        self.__startJobs()
+
+    def stop(self):
+        """ Stop everything.  Pending jobs are marked as stopped, running jobs
+            are killed.
+        """
+        while (self.__pendingJobs):
+            self.stopJob(self.__pendingJobs[0])
+
+        for job in self.runningJobs:
+            self.stopJob(job)
+
+    def stopJob(self, job):
+        """ Stop a single job.  A pending job is removed from the queue, a
+            running job is killed.  The other jobs are not affected.
+        """
+        if (job.state == TranscodeJob.STATE_PENDING):
+            self.__pendingJobs.remove(job)
+            job.state = TranscodeJob.STATE_STOPPED
+            self.__writeJournal()
+            self.jobFinished.emit(job)
+
+            if (self.isFinished):
+                self.__queueComplete()
+            return
+
+        if (job.isStarted):
+            job.state = TranscodeJob.STATE_STOPPED
+            job.process.kill()          # SIGKILL works on a paused (SIGSTOP) process too.
+            # __jobComplete() is called by __onJobErrorOccurred() which is triggered by kill()
+
+    def __startJobs(self):
+        """ Start pending jobs until the running job limit is reached.  Nothing
+            is started while the queue is paused.
+        """
+        if (self.isPaused):
+            return
+
+        while (self.__pendingJobs and len(self.__runningJobs) < self.maximumJobs):
+            self.__startJob(self.__pendingJobs.popleft())
+
+    def __startJob(self, job):
+        """ Create a new process for the job, connect the signals and start it.
+        """
+        job.process = QProcess(self)
+        job.process.errorOccurred.connect(lambda error, job=job: self.__onJobErrorOccurred(job, error))
+        job.process.finished.connect(lambda exitCode, exitStatus, job=job: self.__onJobFinished(job, exitCode, exitStatus))
+        job.process.readyReadStandardError.connect(lambda job=job: self.__onJobReadyReadStandardError(job))
+        job.process.readyReadStandardOutput.connect(lambda job=job: self.__onJobReadyReadStandardOutput(job))
+
+        usedSlots = [runningJob.slot for runningJob in self.__runningJobs]
+        job.slot = min([slot for slot in range(len(usedSlots) + 1) if (slot not in usedSlots)])
+
+        job.state = TranscodeJob.STATE_RUNNING
+        job.startTime = datetime.datetime.now()
+        self.__runningJobs.append(job)
+
+        program, arguments = job.program, job.arguments
+        if (self.priority is not None):
+            program, arguments = self.priority.wrap(program, arguments,
+                job.slot, self.maximumJobs)
+
+        self.__writeJournal()
+        self.jobStarted.emit(job)
+        job.process.start(program, arguments)
+
+    def __jobComplete(self, job):
+        """ Called when a job process has ended, for whatever reason.
+
+            * Record the stop time and final state.
+            * Tell everyone the job has finished.
+            * Start the next pending job(s), or finish the queue.
+        """
+        if (job not in self.__runningJobs):
+            return                  # Already handled, errorOccurred and finished can both be emitted.
+
+        self.__runningJobs.remove(job)
+        job.stopTime = datetime.datetime.now()
+
+        if (job.pauseTime is not None):
+            job.pausedTime = job.totalPausedTime(job.stopTime)
+            job.pauseTime = None
+
+        if (job.isStarted):
+            if (job.exitCode == 0):
+                job.state = TranscodeJob.STATE_DONE
+                self.__recordOutput(job)
+            else:
+                job.state = TranscodeJob.STATE_FAILED
+
+        job.process.deleteLater()
+        job.process = None
+
+        self.__writeJournal()
+        self.jobFinished.emit(job)
+
+        if (self.isFinished):
+            self.__queueComplete()
+            return
+
+        self.__startJobs()
+
+    def __queueComplete(self):
+        self.stopTime = datetime.datetime.now()
+
+        if (self.journal is not None):
+            self.journal.remove()
+            self.journal.release()
+
+        self.queueFinished.emit()
+
+    def __recordOutput(self, job):
+        """ Record a finished job in the output index.  Like the journal, an
+            index that can't be written must not stop the transcoding.
+        """
+        if (self.outputIndex is None or not job.fingerprint or not job.outputFilename):
+            return
+
+        try:
+            self.outputIndex.record(job.outputFilename, job.fingerprint)
+        except OSError as exception:
+            sys.stderr.write('Unable to write the output index "{}": {}\n'.format(
+                self.outputIndex.filename, exception))
+
+    def __signalJob(self, job, signalNumber):
+        """ Send a signal to a job process.  Returns False if the process has
+            already gone.
+        """
+        if (job.process is None):
+            return False
+
+        processId = int(job.process.processId())
+        if (not processId):
+            return False
+
+        try:
+            os.kill(processId, signalNumber)
+        except OSError as exception:
+            sys.stderr.write('Unable to signal job {} (process {}): {}\n'.format(
+                job.jobNumber, processId, exception))
+            return False
+
+        return True
+
+    def __writeJournal(self):
+        """ Record the state of the queue.  A journal that can't be written
+            must not stop the transcoding, so errors are only reported.
+        """
+        if (self.journal is None):
+            return
+
+        try:
+            self.journal.write(self)
+        except OSError as exception:
+            sys.stderr.write('Unable to write the transcoding journal "{}": {}\n'.format(
+                self.journal.filename, exception))
+
+    def __onJobErrorOccurred(self, job, error):
+        """ Called when a process crashes, fails to start or is killed.
+
+            Read/write errors and time outs don't end the process, the job
+            keeps running.
+        """
+        if (job.process is None):
+            return
+
+        job.error = error
+        job.errorString = job.process.errorString()
+
+        if (error in [QProcess.FailedToStart, QProcess.Crashed]):
+            self.__jobComplete(job)
+
+    def __onJobFinished(self, job, exitCode, exitStatus):
+        """ Called when a process completes without crashing or being killed.
+        """
+        if (job.process is None):
+            return
+
+        job.exitCode = exitCode
+
+        if (exitStatus == QProcess.NormalExit):
+            self.__jobComplete(job)
+
+    def __onJobReadyReadStandardError(self, job):
+        """ Echo the output from the HandBrakeCLI to the console stderr.
+        """
+        sys.stderr.buffer.write(job.process.readAllStandardError())
+        sys.stderr.flush()
+
+    def __onJobReadyReadStandardOutput(self, job):
+        """ Echo the output from the HandBrakeCLI to the console stdout and
+            update the job progress.
+        """
+        data = job.process.readAllStandardOutput()
+
+        sys.stdout.buffer.write(data)
+        sys.stdout.flush()
+
+        if (job.progressParser.feed(data)):
+            self.jobProgress.emit(job)
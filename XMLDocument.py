@@ -0,0 +1,349 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2017 David Price
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# =============================================================================
+# Read and write the session and preferences files with ElementTree.
+#
+# The fromXML() and toXML() methods of the data classes (here and in
+# DiscData) use the small part of the minidom API shown below.  The classes in
+# this file provide that API on top of ElementTree elements, so the same
+# methods work unchanged with either one:
+#
+#   doc.documentElement, doc.createElement(), doc.createTextNode(),
+#   doc.writexml(), doc.unlink()
+#   element.setAttribute(), getAttribute(), hasAttribute(), attributes,
+#   appendChild(), childNodes, firstChild, localName, nodeName, tagName
+#
+# ElementTree elements are a fraction of the size of minidom nodes, the file
+# is parsed by the expat C parser straight into them, and writexml() streams
+# the file out in pieces instead of building it in memory.  The files are
+# written in the same format as minidom (tab indents, one element per line),
+# so older versions still read them.
+#
+#   python3 XMLDocument.py [TITLES] [CHAPTERS]
+#
+# compares minidom with this file on a large synthetic session.
+# =============================================================================
+
+import os, time, tracemalloc, xml.dom, xml.dom.minidom as minidom
+import xml.etree.ElementTree as ElementTree
+
+class Text(object):
+    """ The text inside an element, as a minidom text node.
+    """
+    __slots__ = ['data']
+
+    nodeType = xml.dom.Node.TEXT_NODE
+    localName = None
+    childNodes = []
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def nodeName(self):
+        return '#text'
+
+    @property
+    def nodeValue(self):
+        return self.data
+
+    @property
+    def firstChild(self):
+        return None
+
+class Attribute(object):
+    """ An attribute, as returned by element.attributes[name].
+    """
+    __slots__ = ['name', 'value']
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    @property
+    def nodeValue(self):
+        return self.value
+
+class Attributes(object):
+    """ The attributes of an element, as a minidom NamedNodeMap.
+    """
+    __slots__ = ['element']
+
+    def __init__(self, element):
+        self.element = element
+
+    def __contains__(self, name):
+        return name in self.element.attrib
+
+    def __getitem__(self, name):
+        return Attribute(name, self.element.attrib[name])
+
+    def __len__(self):
+        return len(self.element.attrib)
+
+    @property
+    def length(self):
+        return len(self)
+
+    def get(self, name, default=None):
+        if (name not in self.element.attrib):
+            return default
+
+        return self[name]
+
+    def item(self, index):
+        names = list(self.element.attrib.keys())
+        if (index < 0 or index >= len(names)):
+            return None
+
+        return self[names[index]]
+
+    def items(self):
+        return list(self.element.attrib.items())
+
+    def keys(self):
+        return list(self.element.attrib.keys())
+
+    def values(self):
+        return [self[name] for name in self.element.attrib.keys()]
+
+class Element(ElementTree.Element):
+    """ An ElementTree element with the minidom element methods.
+    """
+    nodeType = xml.dom.Node.ELEMENT_NODE
+
+    @property
+    def attributes(self):
+        return Attributes(self)
+
+    @property
+    def childNodes(self):
+        """ The child elements, with the text between them as Text nodes.
+            Whitespace text (the indents) is skipped.
+        """
+        nodes = []
+        if (self.text and self.text.strip()):
+            nodes.append(Text(self.text))
+
+        for child in self:
+            nodes.append(child)
+            if (child.tail and child.tail.strip()):
+                nodes.append(Text(child.tail))
+
+        return nodes
+
+    @property
+    def firstChild(self):
+        nodes = self.childNodes
+        if (nodes):
+            return nodes[0]
+
+        return None
+
+    @property
+    def localName(self):
+        return self.tag
+
+    @property
+    def nodeName(self):
+        return self.tag
+
+    @property
+    def tagName(self):
+        return self.tag
+
+    def appendChild(self, node):
+        """ Append an element or a text node.
+        """
+        if (isinstance(node, Text)):
+            if (len(self)):
+                self[-1].tail = (self[-1].tail or '') + node.data
+            else:
+                self.text = (self.text or '') + node.data
+        else:
+            self.append(node)
+
+        return node
+
+    def getAttribute(self, name):
+        return self.get(name, '')
+
+    def getElementsByTagName(self, name):
+        return [element for element in self.iter(name) if element is not self]
+
+    def hasAttribute(self, name):
+        return name in self.attrib
+
+    def removeAttribute(self, name):
+        self.attrib.pop(name, None)
+
+    def setAttribute(self, name, value):
+        self.set(name, value)
+
+class Document(object):
+    """ A document holding one root element, created with a name by
+        Document(name) or read from a file by Parse().
+    """
+
+    def __init__(self, rootName=None, rootElement=None):
+        if (rootElement is None):
+            rootElement = Element(rootName)
+
+        self.documentElement = rootElement
+
+    def createElement(self, name):
+        return Element(name)
+
+    def createTextNode(self, data):
+        return Text(data)
+
+    def unlink(self):
+        """ Nothing to do, ElementTree elements don't have parent links.
+        """
+        self.documentElement = None
+
+    def writexml(self, writer, indent='', addindent='', newl='', encoding=None):
+        """ Write the document to an open text file, a piece at a time, in
+            the same layout as minidom's writexml().
+        """
+        if (addindent or newl):
+            ElementTree.indent(self.documentElement, addindent)
+
+        if (encoding is None):
+            writer.write('<?xml version="1.0" ?>{}'.format(newl))
+        else:
+            writer.write('<?xml version="1.0" encoding="{}"?>{}'.format(encoding, newl))
+        ElementTree.ElementTree(self.documentElement).write(writer, encoding='unicode',
+            xml_declaration=False, short_empty_elements=True)
+        writer.write(newl)
+
+    def write(self, filename, encoding='utf-8'):
+        """ Write the document to a file, with tab indents.
+        """
+        with open(filename, 'w', encoding=encoding) as xmlFile:
+            self.writexml(xmlFile, '', '\t', '\n', encoding=encoding)
+
+def Parse(filename):
+    """ Read an XML file into a Document.
+    """
+    parser = ElementTree.XMLParser(target=ElementTree.TreeBuilder(element_factory=Element))
+    tree = ElementTree.parse(filename, parser)
+
+    return Document(rootElement=tree.getroot())
+
+def _BuildSession(doc, titleCount, chapterCount):
+    """ Build a session like the ones Disc.toXML() writes, through the DOM
+        API alone.
+    """
+    discElement = doc.createElement('Disc')
+    doc.documentElement.appendChild(discElement)
+    discElement.setAttribute('Source', '/mnt/video/SYNTHETIC/VIDEO_TS')
+    discElement.setAttribute('Destination', '/mnt/video/out')
+
+    titlesElement = doc.createElement('Titles')
+    discElement.appendChild(titlesElement)
+    for titleNumber in range(1, titleCount + 1):
+        titleElement = doc.createElement('Title')
+        titlesElement.appendChild(titleElement)
+        titleElement.setAttribute('TitleNumber', str(titleNumber))
+        titleElement.setAttribute('Duration', '00:42:{:02d}'.format(titleNumber % 60))
+        titleElement.setAttribute('Selected', 'True' if (titleNumber % 2) else 'False')
+
+        for trackNumber in range(1, 4):
+            trackElement = doc.createElement('AudioTrack')
+            titleElement.appendChild(trackElement)
+            trackElement.setAttribute('TrackNumber', str(trackNumber))
+            trackElement.setAttribute('Description', 'English (AC3) (5.1 ch) & "Commentary"')
+
+        chaptersElement = doc.createElement('Chapters')
+        titleElement.appendChild(chaptersElement)
+        for chapterNumber in range(1, chapterCount + 1):
+            chapterElement = doc.createElement('Chapter')
+            chaptersElement.appendChild(chapterElement)
+            chapterElement.setAttribute('ChapterNumber', str(chapterNumber))
+            chapterElement.setAttribute('Duration', '00:05:00')
+            chapterElement.setAttribute('Title', 'Chapter <{}>'.format(chapterNumber))
+
+def _WalkSession(element):
+    """ Read every attribute of every element, as fromXML() does.
+    """
+    count = 0
+    for childNode in element.childNodes:
+        if (childNode.localName is None):
+            continue
+
+        for name in ['TitleNumber', 'ChapterNumber', 'TrackNumber', 'Duration', 'Title', 'Description']:
+            if (childNode.hasAttribute(name)):
+                childNode.getAttribute(name)
+        count += 1 + _WalkSession(childNode)
+
+    return count
+
+def _Benchmark(name, newDocument, writeDocument, parse, filename, titleCount, chapterCount):
+    tracemalloc.start()
+    startTime = time.perf_counter()
+
+    doc = newDocument()
+    _BuildSession(doc, titleCount, chapterCount)
+    writeDocument(doc, filename)
+    doc.unlink()
+
+    writeTime = time.perf_counter() - startTime
+    writePeak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    startTime = time.perf_counter()
+
+    doc = parse(filename)
+    count = _WalkSession(doc.documentElement)
+    doc.unlink()
+
+    readTime = time.perf_counter() - startTime
+    readPeak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print('{:<12} write {:7.3f} s {:8.1f} MB   read {:7.3f} s {:8.1f} MB   {} elements, {:.1f} MB file'.format(
+        name, writeTime, writePeak / 1048576, readTime, readPeak / 1048576, count,
+        os.path.getsize(filename) / 1048576))
+
+if __name__ == '__main__':
+    import sys, tempfile
+
+    titleCount = int(sys.argv[1]) if (len(sys.argv) > 1) else 500
+    chapterCount = int(sys.argv[2]) if (len(sys.argv) > 2) else 40
+
+    def minidomWrite(doc, filename):
+        with open(filename, 'w', encoding='utf-8') as xmlFile:
+            doc.writexml(xmlFile, '', '\t', '\n')
+
+    print('{} titles, {} chapters each'.format(titleCount, chapterCount))
+
+    with tempfile.TemporaryDirectory() as folder:
+        minidomFilename = os.path.join(folder, 'minidom.state.xml')
+        elementTreeFilename = os.path.join(folder, 'elementtree.state.xml')
+
+        _Benchmark('minidom', lambda: minidom.getDOMImplementation().createDocument(None, 'HEP', None),
+            minidomWrite, minidom.parse, minidomFilename, titleCount, chapterCount)
+        _Benchmark('ElementTree', lambda: Document('HEP'),
+            lambda doc, filename: doc.write(filename), Parse, elementTreeFilename, titleCount, chapterCount)
+
+        # Each one reads the other's file the same way.
+        assert (_WalkSession(Parse(minidomFilename).documentElement) ==
+            _WalkSession(minidom.parse(elementTreeFilename).documentElement))
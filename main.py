@@ -25,6 +25,7 @@ sys.path.insert(0, '../DiscData')
 # from PyQt5.QtWidgets import QMainWindow, QApplication, QMessageBox, QTreeWidgetItem
 # from PyQt5.QtCore import QProcess
 from PyQt5.QtCore import (
+    QCoreApplication,
     QSettings,
     QStandardPaths
 )
@@ -36,41 +37,73 @@ from PyQt5.QtWidgets import (
 
 from  AppInit import __DEVELOPEMENT__
 
+from BatchTranscode import BatchTranscode
+from LibraryScanner import (
+    LibraryScanner,
+    ListLibrary
+    )
 from MyMainWindow import MyMainWindow
+from OutputIndex import OutputIndex
 from Disc import (Disc,
     DiscFilenameTemplatesSingleton,
     DiscPresetsSingleton)
 from Preferences import Preferences
 from AudioTrackStates import DiscMixdownsSingleton
 from Preferences import Preferences
+from ScanCache import ScanCache
+from SessionFingerprints import SessionFingerprints
+from SessionIndex import SessionIndex
 from SingletonLog import SingletonLog
 from Titles import TitleVisibleSingleton
 
-class MyApplication(QApplication):
+def InitializeApplication(app):
+    """ Load the preferences and set up the data shared by the GUI and the
+        batch applications.
+    """
+    app.setOrganizationName('QtHEP')
+    app.setApplicationName('QtHEP')
+    QStandardPaths.setTestModeEnabled(__DEVELOPEMENT__)
+
+    preferencesPath = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if (not os.path.exists(preferencesPath)):
+        os.makedirs(preferencesPath)
+    app.preferencesFilename = os.path.join(preferencesPath, '{}.preferences.xml'.format(app.applicationName()))
+    app.journalFilename = os.path.join(preferencesPath, '{}.journal.xml'.format(app.applicationName()))
+    app.batchJournalFilename = os.path.join(preferencesPath, '{}.batch.journal.xml'.format(app.applicationName()))
+    app.libraryFilename = os.path.join(preferencesPath, '{}.library.sqlite'.format(app.applicationName()))
+    app.sessionFingerprints = SessionFingerprints(os.path.join(preferencesPath, '{}.fingerprints.sqlite'.format(app.applicationName())))
+    app.sessionIndex = SessionIndex(os.path.join(preferencesPath, '{}.sessions.sqlite'.format(app.applicationName())))
+    app.outputIndex = OutputIndex(os.path.join(preferencesPath, '{}.outputs.sqlite'.format(app.applicationName())))
+
+    if (os.path.exists(app.preferencesFilename)):
+        app.preferences = Preferences.read(app.preferencesFilename)
+        app.preferences.logging.initializeLog()
+    else:
+        app.preferences = Preferences()
+        app.preferences.toXML(app.preferencesFilename)
+
+    app.scanCache = ScanCache(os.path.join(preferencesPath, '{}.scancache'.format(app.applicationName())),
+        app.preferences.newSource.scanCacheMaximumMB * 1024 * 1024)
+
+    DiscFilenameTemplatesSingleton().set(app.preferences.filenameTemplates)
+    DiscMixdownsSingleton().set(app.preferences.mixdowns.getMixdowns())
+    DiscPresetsSingleton().set(app.preferences.presets.getNames())
+
+class BatchApplication(QCoreApplication):
+    """ The application used to transcode saved sessions without a display.
+    """
     def __init__(self, arguments):
         super().__init__(arguments)
 
-        self.mainWindow = None
-
-        self.setOrganizationName('QtHEP')
-        self.setApplicationName('QtHEP')
-        QStandardPaths.setTestModeEnabled(__DEVELOPEMENT__)
+        InitializeApplication(self)
 
-        preferencesPath = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
-        if (not os.path.exists(preferencesPath)):
-            os.makedirs(preferencesPath)
-        self.preferencesFilename = os.path.join(preferencesPath, '{}.preferences.xml'.format(self.applicationName()))
+class MyApplication(QApplication):
+    def __init__(self, arguments):
+        super().__init__(arguments)
 
-        self.preferences = Preferences()
-        if (os.path.exists(self.preferencesFilename)):
-            self.preferences.fromXML(self.preferencesFilename)
-            self.preferences.logging.initializeLog()
-        else:
-            self.preferences.toXML(self.preferencesFilename)
+        self.mainWindow = None
 
-        DiscFilenameTemplatesSingleton().set(self.preferences.filenameTemplates)
-        DiscMixdownsSingleton().set(self.preferences.mixdowns.getMixdowns())
-        DiscPresetsSingleton().set(self.preferences.presets.getNames())
+        InitializeApplication(self)
 
         self.disc = Disc(self)
 
@@ -98,10 +131,47 @@ class MyApplication(QApplication):
         # 	self.logFilename = os.path.join(self.standardPaths.GetDocumentsDir(), "{}.log".format(APP_NAME))
 
     def savePreferences(self):
-        """ Save the preferences to a file.
+        """ Save the preferences to a file, if they changed.
         """
-        self.preferences.toXML(self.preferencesFilename)
-        self.mainWindow.statusBar.showMessage('Preferences saved to "{}".'.format(self.preferencesFilename), 15000)
+        if (self.preferences.save(self.preferencesFilename)):
+            self.mainWindow.statusBar.showMessage('Preferences saved to "{}".'.format(self.preferencesFilename), 15000)
+
+def batchMain(sessionFilenames):
+    """ Transcode the saved sessions without a GUI.  Returns the process exit
+        code.
+    """
+    app = BatchApplication(sys.argv)
+
+    batch = BatchTranscode(app, sessionFilenames)
+    if (not batch.start()):
+        return batch.exitCode
+
+    app.exec_()
+
+    return batch.exitCode
+
+def libraryMain(folders, maximumJobs, rescan):
+    """ Scan the discs in the library folders without a GUI.  Returns the
+        process exit code.
+    """
+    app = BatchApplication(sys.argv)
+
+    library = LibraryScanner(app, folders, maximumJobs or app.preferences.newSource.scanJobs, rescan)
+    if (not library.start()):
+        return library.exitCode
+
+    app.exec_()
+
+    return library.exitCode
+
+def libraryListMain(minimumMinutes):
+    """ Print the titles in the library index.
+    """
+    app = BatchApplication(sys.argv)
+
+    ListLibrary(app.libraryFilename, minimumMinutes)
+
+    return 0
 
 def main(useDefaultGeometry, useDefaultWindowState):
     app = MyApplication(sys.argv)
@@ -119,6 +189,7 @@ def main(useDefaultGeometry, useDefaultWindowState):
             app.mainWindow.restoreState(windowState)
 
     app.mainWindow.show()
+    app.mainWindow.offerToResumeTranscoding()
     app.exec_()
 
 if (__name__ == '__main__'):
@@ -126,7 +197,26 @@ if (__name__ == '__main__'):
 
     parser.add_argument('-dg', '--dg', action='store_true', help="Use the default geometry.")
     parser.add_argument('-ds', '--ds', action='store_true', help="Use the default window state.")
+    parser.add_argument('--batch', nargs='+', metavar='SESSION',
+        help="Transcode the selected titles of one or more saved session files without a GUI.")
+    parser.add_argument('--library', nargs='+', metavar='FOLDER',
+        help="Scan every disc in and below the folders into the library index without a GUI.")
+    parser.add_argument('--library-jobs', type=int, default=0, metavar='N',
+        help="The number of discs scanned at the same time.  The default is the parallel title scans preference.")
+    parser.add_argument('--library-rescan', action='store_true',
+        help="Scan the discs again even if they haven't changed.")
+    parser.add_argument('--library-list', nargs='?', type=float, const=0, metavar='MINUTES',
+        help="List the titles in the library index that are at least MINUTES long.")
 
     args = parser.parse_args()
 
+    if (args.batch):
+        sys.exit(batchMain(args.batch))
+
+    if (args.library):
+        sys.exit(libraryMain(args.library, args.library_jobs, args.library_rescan))
+
+    if (args.library_list is not None):
+        sys.exit(libraryListMain(args.library_list))
+
     main(args.dg, args.ds)
@@ -751,20 +751,18 @@ class Ui_MainWindow(object):
         spacerItem6 = QtWidgets.QSpacerItem(21, 25, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.verticalLayout_6.addItem(spacerItem6)
         self.horizontalLayout_4.addWidget(self.frame_DiscTitle_List)
-        self.tableWidget_Disc_Titles = QtWidgets.QTableWidget(self.frame_12)
+        self.tableView_Disc_Titles = QtWidgets.QTableView(self.frame_12)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         sizePolicy.setHorizontalStretch(1)
         sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.tableWidget_Disc_Titles.sizePolicy().hasHeightForWidth())
-        self.tableWidget_Disc_Titles.setSizePolicy(sizePolicy)
-        self.tableWidget_Disc_Titles.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked|QtWidgets.QAbstractItemView.EditKeyPressed|QtWidgets.QAbstractItemView.SelectedClicked)
-        self.tableWidget_Disc_Titles.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.tableWidget_Disc_Titles.setColumnCount(5)
-        self.tableWidget_Disc_Titles.setObjectName("tableWidget_Disc_Titles")
-        self.tableWidget_Disc_Titles.setRowCount(0)
-        self.tableWidget_Disc_Titles.horizontalHeader().setDefaultSectionSize(20)
-        self.tableWidget_Disc_Titles.verticalHeader().setVisible(False)
-        self.horizontalLayout_4.addWidget(self.tableWidget_Disc_Titles)
+        sizePolicy.setHeightForWidth(self.tableView_Disc_Titles.sizePolicy().hasHeightForWidth())
+        self.tableView_Disc_Titles.setSizePolicy(sizePolicy)
+        self.tableView_Disc_Titles.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked|QtWidgets.QAbstractItemView.EditKeyPressed|QtWidgets.QAbstractItemView.SelectedClicked)
+        self.tableView_Disc_Titles.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableView_Disc_Titles.setObjectName("tableView_Disc_Titles")
+        self.tableView_Disc_Titles.horizontalHeader().setDefaultSectionSize(20)
+        self.tableView_Disc_Titles.verticalHeader().setVisible(False)
+        self.horizontalLayout_4.addWidget(self.tableView_Disc_Titles)
         self.tabWidget_DiscTitle = QtWidgets.QTabWidget(self.splitter)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -1451,6 +1449,17 @@ class Ui_MainWindow(object):
         self.textBrowser_MakeItSo_Results.setOpenLinks(False)
         self.textBrowser_MakeItSo_Results.setObjectName("textBrowser_MakeItSo_Results")
         self.gridLayout_17.addWidget(self.textBrowser_MakeItSo_Results, 0, 0, 1, 1)
+        self.tableWidget_MakeItSo_Jobs = QtWidgets.QTableWidget(self.tab_MakeItSo)
+        self.tableWidget_MakeItSo_Jobs.setMaximumSize(QtCore.QSize(16777215, 150))
+        self.tableWidget_MakeItSo_Jobs.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tableWidget_MakeItSo_Jobs.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.tableWidget_MakeItSo_Jobs.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableWidget_MakeItSo_Jobs.setWordWrap(False)
+        self.tableWidget_MakeItSo_Jobs.setColumnCount(7)
+        self.tableWidget_MakeItSo_Jobs.setObjectName("tableWidget_MakeItSo_Jobs")
+        self.tableWidget_MakeItSo_Jobs.setRowCount(0)
+        self.tableWidget_MakeItSo_Jobs.verticalHeader().setVisible(False)
+        self.gridLayout_17.addWidget(self.tableWidget_MakeItSo_Jobs, 1, 0, 1, 1)
         self.stackedWidget_MakeItSo = QtWidgets.QStackedWidget(self.tab_MakeItSo)
         self.stackedWidget_MakeItSo.setMaximumSize(QtCore.QSize(16777215, 45))
         self.stackedWidget_MakeItSo.setFrameShape(QtWidgets.QFrame.StyledPanel)
@@ -1494,6 +1503,14 @@ class Ui_MainWindow(object):
         self.horizontalLayout_11.setContentsMargins(11, 11, 11, 11)
         self.horizontalLayout_11.setSpacing(6)
         self.horizontalLayout_11.setObjectName("horizontalLayout_11")
+        self.pushButton_MakeItSo_AddToQueue = QtWidgets.QPushButton(self.page_Running)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_MakeItSo_AddToQueue.sizePolicy().hasHeightForWidth())
+        self.pushButton_MakeItSo_AddToQueue.setSizePolicy(sizePolicy)
+        self.pushButton_MakeItSo_AddToQueue.setObjectName("pushButton_MakeItSo_AddToQueue")
+        self.horizontalLayout_11.addWidget(self.pushButton_MakeItSo_AddToQueue)
         self.pushButton_MakeItSo_Stop = QtWidgets.QPushButton(self.page_Running)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -1505,14 +1522,46 @@ class Ui_MainWindow(object):
         self.pushButton_MakeItSo_Stop.setIcon(icon18)
         self.pushButton_MakeItSo_Stop.setObjectName("pushButton_MakeItSo_Stop")
         self.horizontalLayout_11.addWidget(self.pushButton_MakeItSo_Stop)
-        self.progressBar_MakeItSo_EyeCandy = QtWidgets.QProgressBar(self.page_Running)
-        self.progressBar_MakeItSo_EyeCandy.setMaximum(0)
-        self.progressBar_MakeItSo_EyeCandy.setProperty("value", 0)
-        self.progressBar_MakeItSo_EyeCandy.setTextVisible(False)
-        self.progressBar_MakeItSo_EyeCandy.setObjectName("progressBar_MakeItSo_EyeCandy")
-        self.horizontalLayout_11.addWidget(self.progressBar_MakeItSo_EyeCandy)
+        self.pushButton_MakeItSo_StopJob = QtWidgets.QPushButton(self.page_Running)
+        self.pushButton_MakeItSo_StopJob.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_MakeItSo_StopJob.sizePolicy().hasHeightForWidth())
+        self.pushButton_MakeItSo_StopJob.setSizePolicy(sizePolicy)
+        self.pushButton_MakeItSo_StopJob.setIcon(icon18)
+        self.pushButton_MakeItSo_StopJob.setObjectName("pushButton_MakeItSo_StopJob")
+        self.horizontalLayout_11.addWidget(self.pushButton_MakeItSo_StopJob)
+        self.pushButton_MakeItSo_Pause = QtWidgets.QPushButton(self.page_Running)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_MakeItSo_Pause.sizePolicy().hasHeightForWidth())
+        self.pushButton_MakeItSo_Pause.setSizePolicy(sizePolicy)
+        self.pushButton_MakeItSo_Pause.setObjectName("pushButton_MakeItSo_Pause")
+        self.horizontalLayout_11.addWidget(self.pushButton_MakeItSo_Pause)
+        self.pushButton_MakeItSo_PauseJob = QtWidgets.QPushButton(self.page_Running)
+        self.pushButton_MakeItSo_PauseJob.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_MakeItSo_PauseJob.sizePolicy().hasHeightForWidth())
+        self.pushButton_MakeItSo_PauseJob.setSizePolicy(sizePolicy)
+        self.pushButton_MakeItSo_PauseJob.setObjectName("pushButton_MakeItSo_PauseJob")
+        self.horizontalLayout_11.addWidget(self.pushButton_MakeItSo_PauseJob)
+        self.progressBar_MakeItSo_Progress = QtWidgets.QProgressBar(self.page_Running)
+        self.progressBar_MakeItSo_Progress.setMaximum(1000)
+        self.progressBar_MakeItSo_Progress.setProperty("value", 0)
+        self.progressBar_MakeItSo_Progress.setTextVisible(True)
+        self.progressBar_MakeItSo_Progress.setObjectName("progressBar_MakeItSo_Progress")
+        self.horizontalLayout_11.addWidget(self.progressBar_MakeItSo_Progress)
+        self.label_MakeItSo_ETA = QtWidgets.QLabel(self.page_Running)
+        self.label_MakeItSo_ETA.setMinimumSize(QtCore.QSize(200, 0))
+        self.label_MakeItSo_ETA.setText("")
+        self.label_MakeItSo_ETA.setObjectName("label_MakeItSo_ETA")
+        self.horizontalLayout_11.addWidget(self.label_MakeItSo_ETA)
         self.stackedWidget_MakeItSo.addWidget(self.page_Running)
-        self.gridLayout_17.addWidget(self.stackedWidget_MakeItSo, 1, 0, 1, 1)
+        self.gridLayout_17.addWidget(self.stackedWidget_MakeItSo, 2, 0, 1, 1)
         self.tabWidget.addTab(self.tab_MakeItSo, "")
         self.gridLayout_4.addWidget(self.tabWidget, 0, 0, 1, 1)
         MainWindow.setCentralWidget(self.centralWidget)
@@ -1535,6 +1584,8 @@ class Ui_MainWindow(object):
         MainWindow.setStatusBar(self.statusBar)
         self.actionBrowse_for_Video = QtWidgets.QAction(MainWindow)
         self.actionBrowse_for_Video.setObjectName("actionBrowse_for_Video")
+        self.actionRescan_Video = QtWidgets.QAction(MainWindow)
+        self.actionRescan_Video.setObjectName("actionRescan_Video")
         self.actionBrowse_for_Destination = QtWidgets.QAction(MainWindow)
         self.actionBrowse_for_Destination.setObjectName("actionBrowse_for_Destination")
         self.actionSave_Session = QtWidgets.QAction(MainWindow)
@@ -1561,17 +1612,28 @@ class Ui_MainWindow(object):
         self.action_RecentFileList_RemoveMissingFiles.setObjectName("action_RecentFileList_RemoveMissingFiles")
         self.action_RecentFileList_Clear = QtWidgets.QAction(MainWindow)
         self.action_RecentFileList_Clear.setObjectName("action_RecentFileList_Clear")
+        self.action_ScanCache_Clear = QtWidgets.QAction(MainWindow)
+        self.action_ScanCache_Clear.setObjectName("action_ScanCache_Clear")
         self.action_LogFile_Clear = QtWidgets.QAction(MainWindow)
         self.action_LogFile_Clear.setObjectName("action_LogFile_Clear")
         self.action_LogFile_Open = QtWidgets.QAction(MainWindow)
         self.action_LogFile_Open.setObjectName("action_LogFile_Open")
         self.actionOpen_Hash_Session = QtWidgets.QAction(MainWindow)
         self.actionOpen_Hash_Session.setObjectName("actionOpen_Hash_Session")
+        self.actionFind_Session = QtWidgets.QAction(MainWindow)
+        self.actionFind_Session.setObjectName("actionFind_Session")
+        self.actionRecent_Disc_Sessions = QtWidgets.QAction(MainWindow)
+        self.actionRecent_Disc_Sessions.setObjectName("actionRecent_Disc_Sessions")
+        self.action_SessionIndex_Update = QtWidgets.QAction(MainWindow)
+        self.action_SessionIndex_Update.setObjectName("action_SessionIndex_Update")
+        self.action_OutputIndex_RemoveMissing = QtWidgets.QAction(MainWindow)
+        self.action_OutputIndex_RemoveMissing.setObjectName("action_OutputIndex_RemoveMissing")
         self.actionAbout = QtWidgets.QAction(MainWindow)
         self.actionAbout.setObjectName("actionAbout")
         self.actionAbout_Qt = QtWidgets.QAction(MainWindow)
         self.actionAbout_Qt.setObjectName("actionAbout_Qt")
         self.menuFile.addAction(self.actionBrowse_for_Video)
+        self.menuFile.addAction(self.actionRescan_Video)
         self.menuFile.addAction(self.actionBrowse_for_Destination)
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionSave_Session)
@@ -1583,6 +1645,8 @@ class Ui_MainWindow(object):
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionOpen_Session)
         self.menuFile.addAction(self.actionOpen_Hash_Session)
+        self.menuFile.addAction(self.actionFind_Session)
+        self.menuFile.addAction(self.actionRecent_Disc_Sessions)
         self.menuFile.addAction(self.menuOpen_Recent.menuAction())
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionPreferences)
@@ -1593,6 +1657,10 @@ class Ui_MainWindow(object):
         self.menuTools.addSeparator()
         self.menuTools.addAction(self.action_RecentFileList_RemoveMissingFiles)
         self.menuTools.addAction(self.action_RecentFileList_Clear)
+        self.menuTools.addSeparator()
+        self.menuTools.addAction(self.action_ScanCache_Clear)
+        self.menuTools.addAction(self.action_SessionIndex_Update)
+        self.menuTools.addAction(self.action_OutputIndex_RemoveMissing)
         self.menuHelp.addAction(self.actionAbout)
         self.menuHelp.addAction(self.actionAbout_Qt)
         self.menuBar.addAction(self.menuFile.menuAction())
@@ -1795,8 +1863,17 @@ class Ui_MainWindow(object):
         self.pushButton_MakeItSo_Preview.setText(_translate("MainWindow", "Preview"))
         self.pushButton_MakeItSo_Clear.setToolTip(_translate("MainWindow", "Clear the results of the preview or previous Run."))
         self.pushButton_MakeItSo_Clear.setText(_translate("MainWindow", "Clear"))
+        self.pushButton_MakeItSo_AddToQueue.setToolTip(_translate("MainWindow", "Add the selected titles of the current disc to the running transcoding queue."))
+        self.pushButton_MakeItSo_AddToQueue.setText(_translate("MainWindow", "Add to Queue"))
         self.pushButton_MakeItSo_Stop.setToolTip(_translate("MainWindow", "Stop transcoding."))
         self.pushButton_MakeItSo_Stop.setText(_translate("MainWindow", " Cancel"))
+        self.pushButton_MakeItSo_StopJob.setToolTip(_translate("MainWindow", "Stop the transcoding job selected in the jobs table."))
+        self.pushButton_MakeItSo_StopJob.setText(_translate("MainWindow", " Stop Job"))
+        self.pushButton_MakeItSo_Pause.setToolTip(_translate("MainWindow", "Pause or resume the whole transcoding queue."))
+        self.pushButton_MakeItSo_Pause.setText(_translate("MainWindow", "Pause"))
+        self.pushButton_MakeItSo_PauseJob.setToolTip(_translate("MainWindow", "Pause or resume the transcoding job selected in the jobs table."))
+        self.pushButton_MakeItSo_PauseJob.setText(_translate("MainWindow", "Pause Job"))
+        self.progressBar_MakeItSo_Progress.setToolTip(_translate("MainWindow", "Progress of the whole transcoding queue."))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_MakeItSo), _translate("MainWindow", "Make It So"))
         self.menuFile.setTitle(_translate("MainWindow", "File"))
         self.menuOpen_Recent.setTitle(_translate("MainWindow", "Open Recent"))
@@ -1804,6 +1881,8 @@ class Ui_MainWindow(object):
         self.menuHelp.setTitle(_translate("MainWindow", "Help"))
         self.actionBrowse_for_Video.setText(_translate("MainWindow", "Browse for Video"))
         self.actionBrowse_for_Video.setShortcut(_translate("MainWindow", "Ctrl+B"))
+        self.actionRescan_Video.setText(_translate("MainWindow", "Rescan Video"))
+        self.actionRescan_Video.setToolTip(_translate("MainWindow", "Read the video again with HandBrake, ignoring the scan cache"))
         self.actionBrowse_for_Destination.setText(_translate("MainWindow", "Browse for Destination"))
         self.actionSave_Session.setText(_translate("MainWindow", "Save Session"))
         self.actionSave_Session.setShortcut(_translate("MainWindow", "Ctrl+S"))
@@ -1821,9 +1900,19 @@ class Ui_MainWindow(object):
         self.actionfile_2.setText(_translate("MainWindow", "file 2"))
         self.action_RecentFileList_RemoveMissingFiles.setText(_translate("MainWindow", "Remove missing files from recent file list"))
         self.action_RecentFileList_Clear.setText(_translate("MainWindow", "Clear the recent file list"))
+        self.action_ScanCache_Clear.setText(_translate("MainWindow", "Clear the scan cache"))
         self.action_LogFile_Clear.setText(_translate("MainWindow", "Clear log file"))
         self.action_LogFile_Open.setText(_translate("MainWindow", "Open log file"))
         self.actionOpen_Hash_Session.setText(_translate("MainWindow", "Open Hash Session"))
+        self.actionFind_Session.setText(_translate("MainWindow", "Find Session..."))
+        self.actionFind_Session.setToolTip(_translate("MainWindow", "Find a saved session by disc title, volume label or source"))
+        self.actionFind_Session.setShortcut(_translate("MainWindow", "Ctrl+F"))
+        self.actionRecent_Disc_Sessions.setText(_translate("MainWindow", "Recent Disc Sessions..."))
+        self.actionRecent_Disc_Sessions.setToolTip(_translate("MainWindow", "Open one of the most recently saved sessions"))
+        self.action_SessionIndex_Update.setText(_translate("MainWindow", "Update the session index"))
+        self.action_SessionIndex_Update.setToolTip(_translate("MainWindow", "Index the new and changed files in the automatic session folder and remove the sessions that no longer exist"))
+        self.action_OutputIndex_RemoveMissing.setText(_translate("MainWindow", "Remove missing outputs from the output index"))
+        self.action_OutputIndex_RemoveMissing.setToolTip(_translate("MainWindow", "Forget the transcoded outputs that were deleted, so they aren't looked for again"))
         self.actionAbout.setText(_translate("MainWindow", "About"))
         self.actionAbout_Qt.setText(_translate("MainWindow", "About Qt"))
 
@@ -68,6 +68,55 @@ class Ui_DialogPreferences(object):
         self.pushButton_BrowseVLC = QtWidgets.QPushButton(self.groupBox_Executables)
         self.pushButton_BrowseVLC.setObjectName("pushButton_BrowseVLC")
         self.gridLayout_2.addWidget(self.pushButton_BrowseVLC, 1, 2, 1, 1)
+        self.label_MaximumTranscodingJobs = QtWidgets.QLabel(self.groupBox_Executables)
+        self.label_MaximumTranscodingJobs.setObjectName("label_MaximumTranscodingJobs")
+        self.gridLayout_2.addWidget(self.label_MaximumTranscodingJobs, 2, 0, 1, 1)
+        self.spinBox_MaximumTranscodingJobs = QtWidgets.QSpinBox(self.groupBox_Executables)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.spinBox_MaximumTranscodingJobs.sizePolicy().hasHeightForWidth())
+        self.spinBox_MaximumTranscodingJobs.setSizePolicy(sizePolicy)
+        self.spinBox_MaximumTranscodingJobs.setMinimum(1)
+        self.spinBox_MaximumTranscodingJobs.setMaximum(64)
+        self.spinBox_MaximumTranscodingJobs.setProperty("value", 1)
+        self.spinBox_MaximumTranscodingJobs.setObjectName("spinBox_MaximumTranscodingJobs")
+        self.gridLayout_2.addWidget(self.spinBox_MaximumTranscodingJobs, 2, 1, 1, 1)
+        self.checkBox_SkipUnchangedOutputs = QtWidgets.QCheckBox(self.groupBox_Executables)
+        self.checkBox_SkipUnchangedOutputs.setObjectName("checkBox_SkipUnchangedOutputs")
+        self.gridLayout_2.addWidget(self.checkBox_SkipUnchangedOutputs, 3, 0, 1, 3)
+        self.label_TranscodingNiceLevel = QtWidgets.QLabel(self.groupBox_Executables)
+        self.label_TranscodingNiceLevel.setObjectName("label_TranscodingNiceLevel")
+        self.gridLayout_2.addWidget(self.label_TranscodingNiceLevel, 4, 0, 1, 1)
+        self.spinBox_TranscodingNiceLevel = QtWidgets.QSpinBox(self.groupBox_Executables)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.spinBox_TranscodingNiceLevel.sizePolicy().hasHeightForWidth())
+        self.spinBox_TranscodingNiceLevel.setSizePolicy(sizePolicy)
+        self.spinBox_TranscodingNiceLevel.setMaximum(19)
+        self.spinBox_TranscodingNiceLevel.setProperty("value", 10)
+        self.spinBox_TranscodingNiceLevel.setObjectName("spinBox_TranscodingNiceLevel")
+        self.gridLayout_2.addWidget(self.spinBox_TranscodingNiceLevel, 4, 1, 1, 1)
+        self.label_TranscodingIOClass = QtWidgets.QLabel(self.groupBox_Executables)
+        self.label_TranscodingIOClass.setObjectName("label_TranscodingIOClass")
+        self.gridLayout_2.addWidget(self.label_TranscodingIOClass, 5, 0, 1, 1)
+        self.comboBox_TranscodingIOClass = QtWidgets.QComboBox(self.groupBox_Executables)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.comboBox_TranscodingIOClass.sizePolicy().hasHeightForWidth())
+        self.comboBox_TranscodingIOClass.setSizePolicy(sizePolicy)
+        self.comboBox_TranscodingIOClass.setMinimumSize(QtCore.QSize(125, 0))
+        self.comboBox_TranscodingIOClass.setObjectName("comboBox_TranscodingIOClass")
+        self.gridLayout_2.addWidget(self.comboBox_TranscodingIOClass, 5, 1, 1, 1)
+        self.checkBox_TranscodingCPUAffinity = QtWidgets.QCheckBox(self.groupBox_Executables)
+        self.checkBox_TranscodingCPUAffinity.setObjectName("checkBox_TranscodingCPUAffinity")
+        self.gridLayout_2.addWidget(self.checkBox_TranscodingCPUAffinity, 6, 0, 1, 1)
+        self.lineEdit_TranscodingCPUList = QtWidgets.QLineEdit(self.groupBox_Executables)
+        self.lineEdit_TranscodingCPUList.setEnabled(False)
+        self.lineEdit_TranscodingCPUList.setObjectName("lineEdit_TranscodingCPUList")
+        self.gridLayout_2.addWidget(self.lineEdit_TranscodingCPUList, 6, 1, 1, 2)
         self.verticalLayout_11.addWidget(self.groupBox_Executables)
         self.groupBox_Logging = QtWidgets.QGroupBox(self.tab_General)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
@@ -126,6 +175,26 @@ class Ui_DialogPreferences(object):
         self.pushButton_ClearLogFile.setObjectName("pushButton_ClearLogFile")
         self.horizontalLayout_2.addWidget(self.pushButton_ClearLogFile)
         self.gridLayout_3.addLayout(self.horizontalLayout_2, 2, 0, 1, 1)
+        self.horizontalLayout_LogResults = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_LogResults.setObjectName("horizontalLayout_LogResults")
+        self.label_LogResultsMaximumParagraphs = QtWidgets.QLabel(self.groupBox_Logging)
+        self.label_LogResultsMaximumParagraphs.setObjectName("label_LogResultsMaximumParagraphs")
+        self.horizontalLayout_LogResults.addWidget(self.label_LogResultsMaximumParagraphs)
+        self.spinBox_LogResultsMaximumParagraphs = QtWidgets.QSpinBox(self.groupBox_Logging)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.spinBox_LogResultsMaximumParagraphs.sizePolicy().hasHeightForWidth())
+        self.spinBox_LogResultsMaximumParagraphs.setSizePolicy(sizePolicy)
+        self.spinBox_LogResultsMaximumParagraphs.setMinimum(100)
+        self.spinBox_LogResultsMaximumParagraphs.setMaximum(100000)
+        self.spinBox_LogResultsMaximumParagraphs.setSingleStep(100)
+        self.spinBox_LogResultsMaximumParagraphs.setProperty("value", 5000)
+        self.spinBox_LogResultsMaximumParagraphs.setObjectName("spinBox_LogResultsMaximumParagraphs")
+        self.horizontalLayout_LogResults.addWidget(self.spinBox_LogResultsMaximumParagraphs)
+        spacerItem_LogResults = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_LogResults.addItem(spacerItem_LogResults)
+        self.gridLayout_3.addLayout(self.horizontalLayout_LogResults, 3, 0, 1, 1)
         self.verticalLayout_11.addWidget(self.groupBox_Logging)
         self.groupBox_Options = QtWidgets.QGroupBox(self.tab_General)
         self.groupBox_Options.setObjectName("groupBox_Options")
@@ -572,6 +641,26 @@ class Ui_DialogPreferences(object):
         self.lineEdit_DiscSessionAutomaticFilenamePrefix.setClearButtonEnabled(True)
         self.lineEdit_DiscSessionAutomaticFilenamePrefix.setObjectName("lineEdit_DiscSessionAutomaticFilenamePrefix")
         self.gridLayout_13.addWidget(self.lineEdit_DiscSessionAutomaticFilenamePrefix, 2, 1, 1, 1)
+        self.horizontalLayout_DiscSessionAutosave = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_DiscSessionAutosave.setObjectName("horizontalLayout_DiscSessionAutosave")
+        self.checkBox_DiscSessionAutosave = QtWidgets.QCheckBox(self.groupBox_DiscSessionAutomaticSessions)
+        self.checkBox_DiscSessionAutosave.setChecked(True)
+        self.checkBox_DiscSessionAutosave.setObjectName("checkBox_DiscSessionAutosave")
+        self.horizontalLayout_DiscSessionAutosave.addWidget(self.checkBox_DiscSessionAutosave)
+        self.spinBox_DiscSessionAutosaveSeconds = QtWidgets.QSpinBox(self.groupBox_DiscSessionAutomaticSessions)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.spinBox_DiscSessionAutosaveSeconds.sizePolicy().hasHeightForWidth())
+        self.spinBox_DiscSessionAutosaveSeconds.setSizePolicy(sizePolicy)
+        self.spinBox_DiscSessionAutosaveSeconds.setMinimum(1)
+        self.spinBox_DiscSessionAutosaveSeconds.setMaximum(300)
+        self.spinBox_DiscSessionAutosaveSeconds.setProperty("value", 5)
+        self.spinBox_DiscSessionAutosaveSeconds.setObjectName("spinBox_DiscSessionAutosaveSeconds")
+        self.horizontalLayout_DiscSessionAutosave.addWidget(self.spinBox_DiscSessionAutosaveSeconds)
+        spacerItem_DiscSessionAutosave = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_DiscSessionAutosave.addItem(spacerItem_DiscSessionAutosave)
+        self.gridLayout_13.addLayout(self.horizontalLayout_DiscSessionAutosave, 3, 0, 1, 2)
         self.gridLayout_14.addWidget(self.groupBox_DiscSessionAutomaticSessions, 0, 0, 1, 1)
         self.groupBoxDiscSessionLoadSession = QtWidgets.QGroupBox(self.tab_DiscSession)
         self.groupBoxDiscSessionLoadSession.setObjectName("groupBoxDiscSessionLoadSession")
@@ -587,6 +676,10 @@ class Ui_DialogPreferences(object):
         self.checkBoxLoadSessionKeepDestination = QtWidgets.QCheckBox(self.groupBoxDiscSessionLoadSession)
         self.checkBoxLoadSessionKeepDestination.setObjectName("checkBoxLoadSessionKeepDestination")
         self.verticalLayout_10.addWidget(self.checkBoxLoadSessionKeepDestination)
+        self.checkBox_LoadSessionTitleDetailsOnDemand = QtWidgets.QCheckBox(self.groupBoxDiscSessionLoadSession)
+        self.checkBox_LoadSessionTitleDetailsOnDemand.setChecked(True)
+        self.checkBox_LoadSessionTitleDetailsOnDemand.setObjectName("checkBox_LoadSessionTitleDetailsOnDemand")
+        self.verticalLayout_10.addWidget(self.checkBox_LoadSessionTitleDetailsOnDemand)
         self.gridLayout_14.addWidget(self.groupBoxDiscSessionLoadSession, 1, 0, 1, 1)
         self.groupBox_NewSource = QtWidgets.QGroupBox(self.tab_DiscSession)
         self.groupBox_NewSource.setObjectName("groupBox_NewSource")
@@ -614,6 +707,39 @@ class Ui_DialogPreferences(object):
         self.pushButton_BrowseDefaultDestination.setSizePolicy(sizePolicy)
         self.pushButton_BrowseDefaultDestination.setObjectName("pushButton_BrowseDefaultDestination")
         self.gridLayout_5.addWidget(self.pushButton_BrowseDefaultDestination, 2, 2, 1, 1)
+        self.checkBox_ScanCache = QtWidgets.QCheckBox(self.groupBox_NewSource)
+        self.checkBox_ScanCache.setObjectName("checkBox_ScanCache")
+        self.gridLayout_5.addWidget(self.checkBox_ScanCache, 3, 0, 1, 1)
+        self.spinBox_ScanCacheMaximumMB = QtWidgets.QSpinBox(self.groupBox_NewSource)
+        self.spinBox_ScanCacheMaximumMB.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.spinBox_ScanCacheMaximumMB.sizePolicy().hasHeightForWidth())
+        self.spinBox_ScanCacheMaximumMB.setSizePolicy(sizePolicy)
+        self.spinBox_ScanCacheMaximumMB.setMinimum(1)
+        self.spinBox_ScanCacheMaximumMB.setMaximum(4096)
+        self.spinBox_ScanCacheMaximumMB.setProperty("value", 64)
+        self.spinBox_ScanCacheMaximumMB.setObjectName("spinBox_ScanCacheMaximumMB")
+        self.gridLayout_5.addWidget(self.spinBox_ScanCacheMaximumMB, 3, 1, 1, 1)
+        self.label_ScanJobs = QtWidgets.QLabel(self.groupBox_NewSource)
+        self.label_ScanJobs.setObjectName("label_ScanJobs")
+        self.gridLayout_5.addWidget(self.label_ScanJobs, 4, 0, 1, 1)
+        self.spinBox_ScanJobs = QtWidgets.QSpinBox(self.groupBox_NewSource)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.spinBox_ScanJobs.sizePolicy().hasHeightForWidth())
+        self.spinBox_ScanJobs.setSizePolicy(sizePolicy)
+        self.spinBox_ScanJobs.setMinimum(1)
+        self.spinBox_ScanJobs.setMaximum(16)
+        self.spinBox_ScanJobs.setProperty("value", 1)
+        self.spinBox_ScanJobs.setObjectName("spinBox_ScanJobs")
+        self.gridLayout_5.addWidget(self.spinBox_ScanJobs, 4, 1, 1, 1)
+        self.checkBox_ReadIfoFiles = QtWidgets.QCheckBox(self.groupBox_NewSource)
+        self.checkBox_ReadIfoFiles.setChecked(True)
+        self.checkBox_ReadIfoFiles.setObjectName("checkBox_ReadIfoFiles")
+        self.gridLayout_5.addWidget(self.checkBox_ReadIfoFiles, 5, 0, 1, 3)
         self.gridLayout_14.addWidget(self.groupBox_NewSource, 2, 0, 1, 1)
         spacerItem13 = QtWidgets.QSpacerItem(20, 42, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.gridLayout_14.addItem(spacerItem13, 3, 0, 1, 1)
@@ -874,7 +1000,12 @@ class Ui_DialogPreferences(object):
         self.gridLayout.addWidget(self.tabWidget, 0, 0, 1, 1)
         self.label_HandBrakeCLI.setBuddy(self.lineEdit_HandBrakeCLI)
         self.label_VLC.setBuddy(self.lineEdit_VLC)
+        self.label_MaximumTranscodingJobs.setBuddy(self.spinBox_MaximumTranscodingJobs)
+        self.label_TranscodingNiceLevel.setBuddy(self.spinBox_TranscodingNiceLevel)
+        self.label_ScanJobs.setBuddy(self.spinBox_ScanJobs)
+        self.label_TranscodingIOClass.setBuddy(self.comboBox_TranscodingIOClass)
         self.label_LogFile.setBuddy(self.lineEdit_LogFilename)
+        self.label_LogResultsMaximumParagraphs.setBuddy(self.spinBox_LogResultsMaximumParagraphs)
         self.label_FilenameCharacterToReplace.setBuddy(self.lineEdit_FilenameCharactersToReplace)
         self.label_PresetsTag.setBuddy(self.lineEdit_PresetTag)
         self.label_DiscSessionAutomaticSessionFolder.setBuddy(self.lineEdit_DiscSessionAutomaticSessionsFolder)
@@ -886,6 +1017,9 @@ class Ui_DialogPreferences(object):
         self.tabWidget.setCurrentIndex(0)
         self.buttonBox.accepted.connect(DialogPreferences.accept)
         self.buttonBox.rejected.connect(DialogPreferences.reject)
+        self.checkBox_TranscodingCPUAffinity.toggled['bool'].connect(self.lineEdit_TranscodingCPUList.setEnabled)
+        self.checkBox_ScanCache.toggled['bool'].connect(self.spinBox_ScanCacheMaximumMB.setEnabled)
+        self.checkBox_DiscSessionAutosave.toggled['bool'].connect(self.spinBox_DiscSessionAutosaveSeconds.setEnabled)
         self.checkBox_SetShortLastChapter.toggled['bool'].connect(self.lineEdit_ShortLastChapter.setEnabled)
         self.checkBox_FilenameCharacterReplace.toggled['bool'].connect(self.lineEdit_FilenameCharacterReplaceWith.setEnabled)
         self.checkBox_FilenameCharacterReplace.toggled['bool'].connect(self.lineEdit_FilenameCharactersToReplace.setEnabled)
@@ -908,12 +1042,27 @@ class Ui_DialogPreferences(object):
         self.lineEdit_VLC.setPlaceholderText(_translate("DialogPreferences", "Path to VLC"))
         self.pushButton_BrowseVLC.setToolTip(_translate("DialogPreferences", "Find the location of the VLC executable."))
         self.pushButton_BrowseVLC.setText(_translate("DialogPreferences", "Browse"))
+        self.label_MaximumTranscodingJobs.setText(_translate("DialogPreferences", "Concurrent jobs"))
+        self.spinBox_MaximumTranscodingJobs.setToolTip(_translate("DialogPreferences", "The maximum number of HandBrakeCLI transcoding jobs run at the same time."))
+        self.checkBox_SkipUnchangedOutputs.setToolTip(_translate("DialogPreferences", "Don\'t transcode a title again if its output file was made with the same source, preset and settings and hasn\'t changed since."))
+        self.checkBox_SkipUnchangedOutputs.setText(_translate("DialogPreferences", "Skip titles whose output is unchanged."))
+        self.label_TranscodingNiceLevel.setText(_translate("DialogPreferences", "Priority (nice)"))
+        self.spinBox_TranscodingNiceLevel.setToolTip(_translate("DialogPreferences", "The nice level of the HandBrakeCLI jobs.  0 is normal priority, 19 is the lowest.  Linux only."))
+        self.label_TranscodingIOClass.setText(_translate("DialogPreferences", "I/O class"))
+        self.comboBox_TranscodingIOClass.setToolTip(_translate("DialogPreferences", "The I/O scheduling class (ionice) of the HandBrakeCLI jobs.  Idle jobs only read and write the disk when nothing else is using it.  Linux only."))
+        self.checkBox_TranscodingCPUAffinity.setToolTip(_translate("DialogPreferences", "Run the HandBrakeCLI jobs on these CPUs only.  The CPUs are split between the concurrent jobs.  Linux only."))
+        self.checkBox_TranscodingCPUAffinity.setText(_translate("DialogPreferences", "CPUs"))
+        self.lineEdit_TranscodingCPUList.setToolTip(_translate("DialogPreferences", "A list of CPU numbers and ranges, e.g. 0-3,6.  Leave blank to use every CPU."))
+        self.lineEdit_TranscodingCPUList.setPlaceholderText(_translate("DialogPreferences", "All CPUs"))
         self.groupBox_Logging.setTitle(_translate("DialogPreferences", "Logging"))
         self.checkBox_LogHandBrakeAnalysis.setText(_translate("DialogPreferences", "Log HandBrake analysis of source."))
         self.checkBox_LogHandBrakeTranscoding.setText(_translate("DialogPreferences", "Log transcoding commands and timestamps."))
         self.label_LogFile.setText(_translate("DialogPreferences", "Log File"))
         self.pushButton_BrowseLogFile.setText(_translate("DialogPreferences", "Browse"))
         self.pushButton_ClearLogFile.setText(_translate("DialogPreferences", "Clear Log"))
+        self.label_LogResultsMaximumParagraphs.setText(_translate("DialogPreferences", "Results window keeps the last"))
+        self.spinBox_LogResultsMaximumParagraphs.setToolTip(_translate("DialogPreferences", "Older lines are removed from the results window.  They are written to the log file, if there is one."))
+        self.spinBox_LogResultsMaximumParagraphs.setSuffix(_translate("DialogPreferences", " lines"))
         self.groupBox_Options.setTitle(_translate("DialogPreferences", "Options"))
         self.checkBox_ChapterNameNumbers.setText(_translate("DialogPreferences", "Add numbers to chapter names."))
         self.checkBox_MP4StreamWarning.setText(_translate("DialogPreferences", "Warn if  .MP4 files have multiple audio streams."))
@@ -986,15 +1135,30 @@ class Ui_DialogPreferences(object):
         self.label_DiscSessionAutomaticSessionFolder.setText(_translate("DialogPreferences", "Automatic sessions folder"))
         self.pushButton_BrowseAutomaticSessionFolder.setText(_translate("DialogPreferences", "Browse"))
         self.label_DiscSessionAutomaticFilenamePrefix.setText(_translate("DialogPreferences", "Automatic file name prefix"))
+        self.checkBox_DiscSessionAutosave.setToolTip(_translate("DialogPreferences", "Save the session in the background after it is changed, to the automatic disc session file or to the temporary session file."))
+        self.checkBox_DiscSessionAutosave.setText(_translate("DialogPreferences", "Save the session automatically"))
+        self.spinBox_DiscSessionAutosaveSeconds.setToolTip(_translate("DialogPreferences", "The session is saved once nothing has changed for this long."))
+        self.spinBox_DiscSessionAutosaveSeconds.setPrefix(_translate("DialogPreferences", "after "))
+        self.spinBox_DiscSessionAutosaveSeconds.setSuffix(_translate("DialogPreferences", " seconds"))
         self.groupBoxDiscSessionLoadSession.setTitle(_translate("DialogPreferences", "Load Session"))
         self.checkBox_LoadSessionKeepPosition.setText(_translate("DialogPreferences", "On session load, keep the main window position."))
         self.checkBoxLoadSessionKeepSize.setText(_translate("DialogPreferences", "On session load, keep the main window size."))
         self.checkBoxLoadSessionKeepDestination.setText(_translate("DialogPreferences", "On session load, keep the destination. "))
+        self.checkBox_LoadSessionTitleDetailsOnDemand.setToolTip(_translate("DialogPreferences", "Read the chapters, tracks and cropping of a title when the title is first shown or used, so large sessions open quickly."))
+        self.checkBox_LoadSessionTitleDetailsOnDemand.setText(_translate("DialogPreferences", "On session load, read the title details when they are needed."))
         self.groupBox_NewSource.setTitle(_translate("DialogPreferences", "New Source"))
         self.checkBox_SelectFirstMask.setText(_translate("DialogPreferences", "Select the first file name mask."))
         self.checkBox_SelectFirstPreset.setText(_translate("DialogPreferences", "Select the first processing preset."))
         self.checkBox_DefaultDestination.setText(_translate("DialogPreferences", "Set default destination"))
         self.pushButton_BrowseDefaultDestination.setText(_translate("DialogPreferences", "Browse"))
+        self.checkBox_ScanCache.setToolTip(_translate("DialogPreferences", "Keep the HandBrakeCLI scan of each source.  A source that hasn't changed is read from the cache instead of being scanned again."))
+        self.checkBox_ScanCache.setText(_translate("DialogPreferences", "Cache source scans, up to"))
+        self.spinBox_ScanCacheMaximumMB.setToolTip(_translate("DialogPreferences", "The least recently used scans are deleted when the cache is larger than this."))
+        self.spinBox_ScanCacheMaximumMB.setSuffix(_translate("DialogPreferences", " MB"))
+        self.label_ScanJobs.setText(_translate("DialogPreferences", "Parallel title scans"))
+        self.checkBox_ReadIfoFiles.setToolTip(_translate("DialogPreferences", "Read the titles and chapters of a DVD from its IFO files while HandBrakeCLI scans it.  The titles can be selected at once."))
+        self.checkBox_ReadIfoFiles.setText(_translate("DialogPreferences", "Show the DVD titles from the IFO files while the source is scanned"))
+        self.spinBox_ScanJobs.setToolTip(_translate("DialogPreferences", "The number of titles HandBrakeCLI scans at the same time.  1 scans the titles one after another."))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_DiscSession), _translate("DialogPreferences", "Disc Session"))
         self.groupBox_AutoTitles.setTitle(_translate("DialogPreferences", "Titles"))
         self.checkBox_AutoSelectLongestTitle.setText(_translate("DialogPreferences", "On new source, automatically select the longest title."))